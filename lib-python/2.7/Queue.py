@@ -242,3 +242,13 @@ class LifoQueue(Queue):
 
     def _get(self):
         return self.queue.pop()
+
+# PyPy extension: the interp-level queue of the thread module, if
+# available.  It has the same public methods as Queue, but neither the
+# _put()/_get() hooks of the subclasses nor the mutex, queue, not_empty...
+# attributes, so Queue itself cannot be replaced by it.  Note that Queue
+# already uses the interp-level Condition objects of threading.
+try:
+    from thread import Queue as NativeQueue
+except ImportError:
+    NativeQueue = Queue
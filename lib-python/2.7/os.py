@@ -273,26 +273,56 @@ def walk(top, topdown=True, onerror=None, followlinks=False):
     # minor reason when (say) a thousand readable directories are still
     # left to visit.  That logic is copied here.
     try:
-        # Note that listdir and error are globals in this module due
-        # to earlier import-*.
-        names = listdir(top)
+        # Note that listdir, scandir and error are globals in this module
+        # due to earlier import-*.
+        if _scandir is not None:
+            entries = list(_scandir(top))
+        else:
+            names = listdir(top)
     except error, err:
         if onerror is not None:
             onerror(err)
         return
 
+    # PyPy: with scandir(), the file type usually comes for free with the
+    # directory entry instead of needing a stat() call per name
     dirs, nondirs = [], []
-    for name in names:
-        if isdir(join(top, name)):
-            dirs.append(name)
-        else:
-            nondirs.append(name)
+    symlinks = {}
+    if _scandir is not None:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except error:
+                is_dir = False
+            if is_dir:
+                dirs.append(entry.name)
+                if not followlinks:
+                    try:
+                        symlinks[entry.name] = entry.is_symlink()
+                    except error:
+                        pass
+            else:
+                nondirs.append(entry.name)
+    else:
+        for name in names:
+            if isdir(join(top, name)):
+                dirs.append(name)
+            else:
+                nondirs.append(name)
 
     if topdown:
         yield top, dirs, nondirs
     for name in dirs:
         new_path = join(top, name)
-        if followlinks or not islink(new_path):
+        if followlinks:
+            is_link = False
+        else:
+            # 'dirs' may have been modified by the caller: check the
+            # names we didn't get from scandir()
+            is_link = symlinks.get(name)
+            if is_link is None:
+                is_link = islink(new_path)
+        if not is_link:
             for x in walk(new_path, topdown, onerror, followlinks):
                 yield x
     if not topdown:
@@ -300,6 +330,11 @@ def walk(top, topdown=True, onerror=None, followlinks=False):
 
 __all__.append("walk")
 
+try:
+    _scandir = scandir
+except NameError:
+    _scandir = None
+
 # Make sure os.environ exists, at least
 try:
     environ
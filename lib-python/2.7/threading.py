@@ -36,6 +36,10 @@ _start_new_thread = thread.start_new_thread
 _allocate_lock = thread.allocate_lock
 _get_ident = thread.get_ident
 ThreadError = thread.error
+# PyPy patch: use the interp-level RLock and Condition, if available
+_LockType = thread.LockType
+_NativeRLock = getattr(thread, 'RLock', None)
+_NativeCondition = getattr(thread, 'Condition', None)
 del thread
 
 
@@ -120,6 +124,8 @@ def RLock(*args, **kwargs):
     acquired it.
 
     """
+    if _NativeRLock is not None and not args and not kwargs:
+        return _NativeRLock()
     return _RLock(*args, **kwargs)
 
 class _RLock(_Verbose):
@@ -238,6 +244,12 @@ class _RLock(_Verbose):
     def _is_owned(self):
         return self.__owner == _get_ident()
 
+if _NativeRLock is not None:
+    # PyPy patch: a subclass of _RLock, so that isinstance() checks keep
+    # working; the interp-level methods override all the ones of _RLock
+    class _NativeRLock(_NativeRLock, _RLock):
+        pass
+
 
 def Condition(*args, **kwargs):
     """Factory function that returns a new condition variable object.
@@ -250,6 +262,11 @@ def Condition(*args, **kwargs):
     is created and used as the underlying lock.
 
     """
+    if _NativeCondition is not None and len(args) <= 1 and not kwargs:
+        lock = args[0] if args else None
+        if (lock is None or type(lock) is _LockType or
+                type(lock) is _NativeRLock):
+            return _NativeCondition(lock)
     return _Condition(*args, **kwargs)
 
 class _Condition(_Verbose):
@@ -404,6 +421,11 @@ class _Condition(_Verbose):
 
     notify_all = notifyAll
 
+if _NativeCondition is not None:
+    # PyPy patch: a subclass of _Condition, like _NativeRLock above
+    class _NativeCondition(_NativeCondition, _Condition):
+        pass
+
 
 def Semaphore(*args, **kwargs):
     """A factory function that returns a new semaphore.
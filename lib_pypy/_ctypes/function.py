@@ -30,6 +30,14 @@ VALID_PARAMFLAGS = (
 
 WIN64 = sys.platform == 'win32' and sys.maxint == 2 ** 63 - 1
 
+# for arguments declared as one of these primitive types, a Python object
+# of the listed types can be given directly to the _ffi call, which does
+# the same truncation as c_int(value).value would
+DIRECT_ARG_TYPES = {'f': (float,), 'd': (float,)}
+for _code in 'bBhHiIlLqQ':
+    DIRECT_ARG_TYPES[_code] = (int, long)
+del _code
+
 
 def get_com_error(errcode, riid, pIunk):
     "Win32 specific: build a COM Error exception"
@@ -82,12 +90,14 @@ class CFuncPtr(_CData):
     _com_index = None
     _com_iid = None
     _is_fastpath = False
+    _direct_types = None
 
     def _getargtypes(self):
         return self._argtypes_
 
     def _setargtypes(self, argtypes):
         self._ptr = None
+        self._direct_types = None
         if argtypes is None:
             self._argtypes_ = ()
         else:
@@ -484,6 +494,28 @@ class CFuncPtr(_CData):
 
         return cobj, cobj._to_ffi_param(), type(cobj)
 
+    def _get_direct_types(self, argtypes):
+        """Precompute, for each entry of argtypes, the tuple of Python
+        types that can be passed to the _ffi call without building a
+        ctypes instance first; or None if from_param() must be used.
+        Cached as long as argtypes is self._argtypes_."""
+        if argtypes is self._argtypes_ and self._direct_types is not None:
+            return self._direct_types
+        direct_types = []
+        for argtype in argtypes:
+            direct = None
+            # argtype.from_param is looked up like a call would do it,
+            # to exclude a from_param() defined on a base class too
+            if (isinstance(argtype, SimpleType) and
+                    self._is_primitive(argtype) and
+                    getattr(argtype.from_param, 'im_func', None) is
+                        SimpleType.from_param.im_func):
+                direct = DIRECT_ARG_TYPES.get(argtype._type_)
+            direct_types.append(direct)
+        if argtypes is self._argtypes_:
+            self._direct_types = direct_types
+        return direct_types
+
     def _convert_args_for_callback(self, argtypes, args):
         assert len(argtypes) == len(args)
         newargs = []
@@ -570,9 +602,18 @@ class CFuncPtr(_CData):
                     raise ValueError("paramflag %d not yet implemented" % flag)
         else:
             errcheckargs = args
+            direct_types = self._get_direct_types(argtypes)
             for i, argtype in enumerate(argtypes):
+                arg = args[i]
+                direct = direct_types[i]
+                if direct is not None and type(arg) in direct:
+                    # fast path: no c_int(arg) or similar instance needed
+                    keepalives.append(None)
+                    newargs.append(arg)
+                    newargtypes.append(argtype)
+                    continue
                 try:
-                    keepalive, newarg, newargtype = self._conv_param(argtype, args[i])
+                    keepalive, newarg, newargtype = self._conv_param(argtype, arg)
                 except (UnicodeError, TypeError, ValueError) as e:
                     raise ArgumentError(str(e))
                 keepalives.append(keepalive)
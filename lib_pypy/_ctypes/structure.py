@@ -121,9 +121,13 @@ class Field(object):
             return obj._buffer.__getattr__(self.name)
         else:
             fieldtype = self.ctype
-            offset = self.num
-            suba = obj._subarray(fieldtype, self.name)
-            return fieldtype._CData_output(suba, obj, offset)
+            # the length-1 array type used to read the field is cached
+            A = self.__dict__.get('_array_type')
+            if A is None:
+                A = _rawffi.Array(fieldtype._ffishape_)
+                self.__dict__['_array_type'] = A
+            suba = A.fromaddress(obj._buffer.buffer + self.offset, 1)
+            return fieldtype._CData_output(suba, obj, self.num)
 
     def __set__(self, obj, value):
         if self.inside_anon_field is not None:
@@ -258,7 +258,7 @@ class FFI(object):
         return self._backend.newp(cdecl, init)
 
     def new_allocator(self, alloc=None, free=None,
-                      should_clear_after_alloc=True):
+                      should_clear_after_alloc=True, arena=0):
         """Return a new allocator, i.e. a function that behaves like ffi.new()
         but uses the provided low-level 'alloc' and 'free' functions.
 
@@ -271,10 +271,19 @@ class FFI(object):
         If 'should_clear_after_alloc' is set to False, then the memory
         returned by 'alloc' is assumed to be already cleared (or you are
         fine with garbage); otherwise CFFI will clear it.
+
+        If 'arena' is a size in bytes (PyPy only), the memory is taken
+        from chunks of that size, each freed when all the objects
+        allocated from it are dead.
         """
         compiled_ffi = self._backend.FFI()
-        allocator = compiled_ffi.new_allocator(alloc, free,
-                                               should_clear_after_alloc)
+        if arena:
+            allocator = compiled_ffi.new_allocator(alloc, free,
+                                                   should_clear_after_alloc,
+                                                   arena)
+        else:
+            allocator = compiled_ffi.new_allocator(alloc, free,
+                                                   should_clear_after_alloc)
         def allocate(cdecl, init=None):
             if isinstance(cdecl, basestring):
                 cdecl = self._typeof(cdecl)
@@ -171,6 +171,12 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
               cmdline="--ext",
               default=None),
 
+    StrOption("prebuilt_modules",
+              "Comma-separated list of pure Python modules imported at "
+              "translation time and prebuilt in the executable",
+              cmdline="--prebuilt-modules",
+              default=None),
+
     BoolOption("translationmodules",
           "use only those modules that are needed to run translate.py on pypy",
                default=False,
@@ -366,6 +366,9 @@ class PyPyTarget(object):
 
     def get_entry_point(self, config):
         space = make_objspace(config)
+        if config.objspace.prebuilt_modules:
+            from pypy.module.sys.initpath import prebuild_modules
+            prebuild_modules(space, config.objspace.prebuilt_modules.split(','))
 
         # manually imports app_main.py
         filename = os.path.join(pypydir, 'interpreter', 'app_main.py')
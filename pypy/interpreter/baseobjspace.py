@@ -471,7 +471,8 @@ class ObjSpace(object):
                 if e.match(self, self.w_KeyError):
                     continue
                 raise
-            if isinstance(w_mod, Module) and not w_mod.startup_called:
+            if (isinstance(w_mod, Module) and not w_mod.startup_called and
+                    not w_mod.deferred_startup):
                 w_mod.init(self)
 
     def finish(self):
@@ -3,6 +3,7 @@ from pypy.interpreter.error import OperationError, get_cleared_operation_error
 from rpython.rlib.unroll import unrolling_iterable
 from rpython.rlib.objectmodel import specialize, not_rpython
 from rpython.rlib import jit, rgc, objectmodel
+from rpython.rtyper.lltypesystem import lltype, rffi
 
 TICK_COUNTER_STEP = 100
 
@@ -23,7 +24,8 @@ class ExecutionContext(object):
     # XXX [fijal] but they're not. is_being_profiled is guarded a bit all
     #     over the place as well as w_tracefunc
 
-    _immutable_fields_ = ['profilefunc?', 'w_tracefunc?']
+    _immutable_fields_ = ['profilefunc?', 'w_tracefunc?',
+                          'profile_code_only?']
 
     def __init__(self, space):
         self.space = space
@@ -33,6 +35,7 @@ class ExecutionContext(object):
         self.compiler = space.createcompiler()
         self.profilefunc = None
         self.w_profilefuncarg = None
+        self.profile_code_only = False
         self.thread_disappeared = False   # might be set to True after os.fork()
 
     @staticmethod
@@ -158,8 +161,11 @@ class ExecutionContext(object):
             return
         self.run_trace_func(frame)
 
-    @jit.unroll_safe
+    @jit.dont_look_inside
     def run_trace_func(self, frame):
+        # only called for frames that have an f_trace: from JIT-compiled
+        # code this is a single residual call instead of an unrolled
+        # walk over co_lnotab
         code = frame.pycode
         d = frame.getorcreatedebug()
         if d.instr_lb <= frame.last_instr < d.instr_ub:
@@ -268,21 +274,28 @@ class ExecutionContext(object):
     def setprofile(self, w_func):
         """Set the global trace function."""
         if self.space.is_w(w_func, self.space.w_None):
-            self.profilefunc = None
-            self.w_profilefuncarg = None
+            self.setllprofile(None, None)
         else:
             self.setllprofile(app_profile_call, w_func)
 
     def getprofile(self):
         return self.w_profilefuncarg
 
-    def setllprofile(self, func, w_arg):
+    def setllprofile(self, func, w_arg, code_only=False):
+        """Set a low-level profile function, called as
+        func(space, w_arg, frame, event, w_aarg).  If 'code_only' is True,
+        it is called with the frame's PyCode instead of the frame itself.
+        The frame then does not escape, and JIT-compiled code can keep
+        running with its frames virtual while being profiled."""
         if func is not None:
             if w_arg is None:
                 raise ValueError("Cannot call setllprofile with real None")
             self.force_all_frames(is_being_profiled=True)
+        else:
+            code_only = False
         self.profilefunc = func
         self.w_profilefuncarg = w_arg
+        self.profile_code_only = code_only
 
     def force_all_frames(self, is_being_profiled=False):
         # "Force" all frames in the sense of the jit, and optionally
@@ -311,8 +324,6 @@ class ExecutionContext(object):
         if self.is_tracing or frame.hide():
             return
 
-        space = self.space
-
         # Tracing cases
         if event == 'call':
             w_callback = self.gettrace()
@@ -320,35 +331,7 @@ class ExecutionContext(object):
             w_callback = frame.get_w_f_trace()
 
         if w_callback is not None and event != "leaveframe":
-            if operr is not None:
-                w_value = operr.get_w_value(space)
-                w_arg = space.newtuple([operr.w_type, w_value,
-                                        operr.get_w_traceback(space)])
-
-            d = frame.getorcreatedebug()
-            if d.w_locals is not None:
-                # only update the w_locals dict if it exists
-                # if it does not exist yet and the tracer accesses it via
-                # frame.f_locals, it is filled by PyFrame.getdictscope
-                frame.fast2locals()
-            self.is_tracing += 1
-            try:
-                try:
-                    w_result = space.call_function(w_callback, frame, space.newtext(event), w_arg)
-                    if space.is_w(w_result, space.w_None):
-                        # bug-to-bug compatibility with CPython
-                        # http://bugs.python.org/issue11992
-                        pass   #d.w_f_trace = None
-                    else:
-                        d.w_f_trace = w_result
-                except:
-                    self.settrace(space.w_None)
-                    d.w_f_trace = None
-                    raise
-            finally:
-                self.is_tracing -= 1
-                if d.w_locals is not None:
-                    frame.locals2fast()
+            self._call_trace_func(frame, w_callback, event, w_arg, operr)
 
         # Profile cases
         if self.profilefunc is not None:
@@ -359,24 +342,71 @@ class ExecutionContext(object):
                     event == 'c_exception'):
                 return
 
-            last_exception = frame.last_exception
             if event == 'leaveframe':
                 event = 'return'
 
-            assert self.is_tracing == 0
-            self.is_tracing += 1
+            last_exception = frame.last_exception
             try:
-                try:
-                    self.profilefunc(space, self.w_profilefuncarg,
-                                     frame, event, w_arg)
-                except:
-                    self.profilefunc = None
-                    self.w_profilefuncarg = None
-                    raise
-
+                if self.profile_code_only:
+                    # the frame does not escape: the JIT can look inside
+                    # the profile function and keep the frame virtual
+                    self._call_profile_func(frame.getcode(), event, w_arg)
+                else:
+                    self._call_app_profile_func(frame, event, w_arg)
             finally:
                 frame.last_exception = last_exception
-                self.is_tracing -= 1
+
+    @jit.dont_look_inside
+    def _call_trace_func(self, frame, w_callback, event, w_arg, operr):
+        # the frame escapes to app-level anyway: from JIT-compiled code,
+        # this is a single residual call
+        space = self.space
+        if operr is not None:
+            w_value = operr.get_w_value(space)
+            w_arg = space.newtuple([operr.w_type, w_value,
+                                    operr.get_w_traceback(space)])
+
+        d = frame.getorcreatedebug()
+        if d.w_locals is not None:
+            # only update the w_locals dict if it exists
+            # if it does not exist yet and the tracer accesses it via
+            # frame.f_locals, it is filled by PyFrame.getdictscope
+            frame.fast2locals()
+        self.is_tracing += 1
+        try:
+            try:
+                w_result = space.call_function(w_callback, frame, space.newtext(event), w_arg)
+                if space.is_w(w_result, space.w_None):
+                    # bug-to-bug compatibility with CPython
+                    # http://bugs.python.org/issue11992
+                    pass   #d.w_f_trace = None
+                else:
+                    d.w_f_trace = w_result
+            except:
+                self.settrace(space.w_None)
+                d.w_f_trace = None
+                raise
+        finally:
+            self.is_tracing -= 1
+            if d.w_locals is not None:
+                frame.locals2fast()
+
+    @jit.dont_look_inside
+    def _call_app_profile_func(self, frame, event, w_arg):
+        self._call_profile_func(frame, event, w_arg)
+
+    def _call_profile_func(self, w_frame_or_code, event, w_arg):
+        assert self.is_tracing == 0
+        self.is_tracing += 1
+        try:
+            try:
+                self.profilefunc(self.space, self.w_profilefuncarg,
+                                 w_frame_or_code, event, w_arg)
+            except:
+                self.setllprofile(None, None)
+                raise
+        finally:
+            self.is_tracing -= 1
 
     def checksignals(self):
         """Similar to PyErr_CheckSignals().  If called in the main thread,
@@ -443,6 +473,13 @@ class AbstractActionFlag(object):
             self._periodic_actions.insert(0, action)
         self._rebuild_action_dispatcher()
 
+    def get_ticker_address(self):
+        """Return the address of the ticker as a LONGP, if it is stored
+        in C, or NULL.  The GIL uses it to ask the running thread to call
+        the periodic actions soon, by setting it to -1 from another thread.
+        """
+        return lltype.nullptr(rffi.LONGP.TO)
+
     def getcheckinterval(self):
         return self.checkinterval_scaled // TICK_COUNTER_STEP
 
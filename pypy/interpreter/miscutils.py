@@ -4,6 +4,7 @@ Miscellaneous utilities.
 
 from rpython.rlib.listsort import make_timsort_class
 from rpython.rlib.objectmodel import not_rpython
+from rpython.rlib.rarithmetic import r_longlong
 
 
 class ThreadLocals:
@@ -37,6 +38,20 @@ class ThreadLocals:
     def getallvalues(self):
         return {0: self._value}
 
+    # without the thread module there is no GIL: the switch interval is
+    # only remembered, and nobody ever waits
+    _switchinterval = 5000
+
+    def setswitchinterval(self, microseconds):
+        self._switchinterval = microseconds
+
+    def getswitchinterval(self):
+        return self._switchinterval
+
+    def getgilwaitstats(self):
+        zero = r_longlong(0)
+        return (zero, zero, zero, zero, zero)
+
     def _cleanup_(self):
         # should still be unfilled at this point during translation.
         # but in some corner cases it is not...  unsure why
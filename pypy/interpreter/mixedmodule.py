@@ -85,6 +85,8 @@ class MixedModule(Module):
         return self.space.call_function(w_builtin, *args_w)
 
     def getdictvalue(self, space, name):
+        if self.deferred_startup and not self.startup_called:
+            self.init(space)
         w_value = space.finditem_str(self.w_dict, name)
         if self.lazy and w_value is None:
             return self._load_lazily(space, name)
@@ -119,6 +121,8 @@ class MixedModule(Module):
             return w_value
 
     def getdict(self, space):
+        if self.deferred_startup and not self.startup_called:
+            self.init(space)
         if self.lazy:
             for name in self.loaders:
                 w_value = self.get(name)
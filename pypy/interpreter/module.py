@@ -5,15 +5,24 @@ Module objects.
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError
 from rpython.rlib.objectmodel import we_are_translated, not_rpython
+from rpython.rlib.debug import debug_start, debug_stop, debug_print
+from rpython.rlib.debug import have_debug_prints
 
 
 class Module(W_Root):
     """A module."""
 
-    _immutable_fields_ = ["w_dict?"]
+    # 'startup_called' is read by every attribute lookup on a MixedModule
+    # with a deferred startup(), and only changes once
+    _immutable_fields_ = ["w_dict?", "startup_called?"]
 
     _frozen = False
 
+    # if True, space.startup() does not call startup() even if the module
+    # was already imported during translation; it is only called when the
+    # module is imported again or its content is first used
+    deferred_startup = False
+
     def __init__(self, space, w_name, w_dict=None, add_package=True):
         self.space = space
         if w_dict is None:
@@ -62,7 +71,17 @@ class Module(W_Root):
                 if self._frozen:
                     return
             self.startup_called = True
-            self.startup(space)
+            if not we_are_translated():
+                self.startup(space)
+                return
+            # PYPYLOG=module-startup:file gives the time spent in startup()
+            debug_start("module-startup")
+            if have_debug_prints() and self.w_name is not None:
+                debug_print(space.text_w(self.w_name))
+            try:
+                self.startup(space)
+            finally:
+                debug_stop("module-startup")
 
     def startup(self, space):
         """This is called at runtime on import to allow the module to
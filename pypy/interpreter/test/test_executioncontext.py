@@ -80,6 +80,29 @@ class TestExecutionContext:
         space.getexecutioncontext().setllprofile(None, None)
         assert l == ['call', 'return', 'call', 'return']
 
+    def test_llprofile_code_only(self):
+        from pypy.interpreter.pycode import PyCode
+        l = []
+
+        def profile_func(space, w_arg, code, event, w_aarg):
+            assert isinstance(code, PyCode)
+            l.append((event, code.co_name))
+
+        space = self.space
+        space.getexecutioncontext().setllprofile(profile_func, space.w_None,
+                                                 code_only=True)
+        space.appexec([], """():
+        def f():
+            pass
+        f()
+        """)
+        space.getexecutioncontext().setllprofile(None, None)
+        assert not space.getexecutioncontext().profile_code_only
+        names = [name for (event, name) in l]
+        assert [event for (event, name) in l] == [
+            'call', 'return', 'call', 'call', 'return', 'return']
+        assert names[3] == names[4] == 'f'
+
     def test_llprofile_c_call(self):
         from pypy.interpreter.function import Function, Method
         l = []
@@ -31,6 +31,39 @@ class TestMixedModule(object):
         assert self.space.builtin_modules["test_module"] is m
         assert isinstance(self.space.builtin_modules["test_module.sub"], SubModule)
 
+    def test_deferred_startup(self):
+        space = self.space
+        started = []
+        class Module(MixedModule):
+            interpleveldefs = {"value": "space.wrap(42)"}
+            appleveldefs = {}
+            deferred_startup = True
+            def startup(self, space):
+                started.append(space.text_w(self.w_name))
+
+        m = Module(space, space.wrap("test_deferred"))
+        m.install()
+        w_modules = space.sys.get('modules')
+        w_names = space.sys.get('builtin_module_names')
+        space.setitem(w_modules, space.wrap("test_deferred"), m)
+        space.setattr(space.sys, space.wrap('builtin_module_names'),
+                      space.add(w_names,
+                                space.newtuple([space.wrap("test_deferred")])))
+        try:
+            # as if imported during translation: space.startup() leaves it
+            space.startup()
+            assert started == []
+            # the first use of the module runs startup()
+            assert space.int_w(space.getattr(m, space.wrap("value"))) == 42
+            assert started == ["test_deferred"]
+            space.getattr(m, space.wrap("value"))
+            assert started == ["test_deferred"]
+        finally:
+            space.setattr(space.sys, space.wrap('builtin_module_names'),
+                          w_names)
+            del space.builtin_modules["test_deferred"]
+            space.delitem(w_modules, space.wrap("test_deferred"))
+
 class AppTestMixedModule(object):
     pytestmark = py.test.mark.skipif("config.option.runappdirect")
 
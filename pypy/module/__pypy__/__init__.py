@@ -32,6 +32,9 @@ class ThreadModule(MixedModule):
     interpleveldefs = {
         '_signals_enter':  'interp_signal.signals_enter',
         '_signals_exit':   'interp_signal.signals_exit',
+        'setswitchinterval': 'interp_gil.setswitchinterval',
+        'getswitchinterval': 'interp_gil.getswitchinterval',
+        'gil_wait_stats':  'interp_gil.gil_wait_stats',
     }
 
 
@@ -0,0 +1,41 @@
+import sys
+from rpython.rlib import rgil
+from rpython.rlib.unroll import unrolling_iterable
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+
+
+@unwrap_spec(interval=float)
+def setswitchinterval(space, interval):
+    """Set the GIL switch interval, in seconds.  A thread that waited for
+    the GIL for that long asks the running thread to release it, at the
+    next bytecode or loop header, even in JIT-compiled code."""
+    if not interval > 0.0:
+        raise oefmt(space.w_ValueError,
+                    "switch interval must be strictly positive")
+    microseconds = interval * 1e6
+    if microseconds > float(sys.maxint):
+        microseconds = float(sys.maxint)
+    space.threadlocals.setswitchinterval(max(int(microseconds), 1))
+
+def getswitchinterval(space):
+    """Return the GIL switch interval, in seconds."""
+    return space.newfloat(space.threadlocals.getswitchinterval() * 1e-6)
+
+unrolling_wait_stats = unrolling_iterable(enumerate(rgil.WAIT_STATS))
+
+def gil_wait_stats(space):
+    """Return a dict with the time spent waiting for the GIL, in seconds,
+    and the number of such waits, for the current thread
+    ('thread_wait_time', 'thread_waits') and for all threads
+    ('total_wait_time', 'total_waits').  'switch_requests' is the number
+    of waits that lasted longer than the switch interval."""
+    stats = space.threadlocals.getgilwaitstats()
+    w_result = space.newdict()
+    for i, name in unrolling_wait_stats:
+        if name.endswith('_time'):
+            w_value = space.newfloat(float(stats[i]) * 1e-6)
+        else:
+            w_value = space.newint(stats[i])
+        space.setitem_str(w_result, name, w_value)
+    return w_result
@@ -0,0 +1,50 @@
+from pypy.module.thread.test.support import GenericTestThread
+
+
+class AppTestNoThread:
+    spaceconfig = dict(usemodules=['__pypy__'])
+
+    def test_switchinterval(self):
+        from __pypy__ import thread
+        assert thread.getswitchinterval() == 0.005
+        thread.setswitchinterval(0.01)
+        assert thread.getswitchinterval() == 0.01
+        raises(ValueError, thread.setswitchinterval, 0.0)
+        raises(ValueError, thread.setswitchinterval, -1.0)
+        thread.setswitchinterval(0.005)
+
+    def test_gil_wait_stats(self):
+        from __pypy__ import thread
+        stats = thread.gil_wait_stats()
+        assert sorted(stats) == ['switch_requests', 'thread_wait_time',
+                                 'thread_waits', 'total_wait_time',
+                                 'total_waits']
+        assert stats['total_waits'] == 0
+
+
+class AppTestGIL(GenericTestThread):
+    spaceconfig = dict(usemodules=['__pypy__', 'thread', 'signal', 'time'])
+
+    def test_switchinterval(self):
+        from __pypy__ import thread
+        old = thread.getswitchinterval()
+        try:
+            thread.setswitchinterval(0.001)
+            assert thread.getswitchinterval() == 0.001
+            thread.setswitchinterval(1e-9)
+            assert thread.getswitchinterval() == 1e-6
+        finally:
+            thread.setswitchinterval(old)
+
+    def test_gil_wait_stats(self):
+        import __pypy__, thread
+        done = []
+        def f():
+            done.append(__pypy__.thread.gil_wait_stats())
+        thread.start_new_thread(f, ())
+        self.waitfor(lambda: done)
+        stats = __pypy__.thread.gil_wait_stats()
+        assert stats['total_waits'] >= stats['thread_waits'] >= 0
+        assert stats['total_wait_time'] >= stats['thread_wait_time'] >= 0.0
+        assert stats['switch_requests'] <= stats['total_waits']
+        assert done[0]['total_waits'] <= stats['total_waits']
@@ -6,18 +6,75 @@ from pypy.interpreter.gateway import interp2app, unwrap_spec, WrappedDefault
 from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.rlib import rgc
 
+# the arena hands out memory aligned like malloc() does on 64-bit platforms
+ARENA_ALIGN = 16
+
+
+class ArenaChunk(object):
+    """A block of raw memory from which arena cdatas are bump-allocated.
+    Every such cdata keeps its chunk alive, so the whole chunk is freed
+    with a single free() when the last of them dies."""
+
+    def __init__(self, size, zero):
+        if zero:
+            self.ptr = lltype.malloc(rffi.CCHARP.TO, size,
+                                     flavor='raw', zero=True)
+        else:
+            self.ptr = lltype.malloc(rffi.CCHARP.TO, size,
+                                     flavor='raw', zero=False)
+        self.size = size
+        self.used = 0
+        rgc.add_memory_pressure(size, self)
+
+    @rgc.must_be_light_finalizer
+    def __del__(self):
+        lltype.free(self.ptr, flavor='raw')
+
+
+class Arena(object):
+    """The mutable part of an arena allocator: the current chunk."""
+
+    def __init__(self, chunk_size, should_clear_after_alloc):
+        self.chunk_size = chunk_size
+        self.should_clear_after_alloc = should_clear_after_alloc
+        self.current = None
+
+    def allocate(self, space, datasize, ctype, length):
+        from pypy.module._cffi_backend import cdataobj
+        size = (datasize + (ARENA_ALIGN - 1)) & ~(ARENA_ALIGN - 1)
+        if size == 0:
+            size = ARENA_ALIGN
+        chunk = self.current
+        if chunk is None or chunk.used + size > chunk.size:
+            if size > self.chunk_size:
+                # too big: use a chunk of its own, but keep the current one
+                chunk = ArenaChunk(size, self.should_clear_after_alloc)
+            else:
+                chunk = ArenaChunk(self.chunk_size,
+                                   self.should_clear_after_alloc)
+                self.current = chunk
+        ptr = rffi.ptradd(chunk.ptr, chunk.used)
+        chunk.used += size
+        w_res = cdataobj.W_CDataNewArena(space, ptr, ctype, length)
+        w_res.chunk = chunk
+        return w_res
+
 
 class W_Allocator(W_Root):
     _immutable_ = True
 
-    def __init__(self, ffi, w_alloc, w_free, should_clear_after_alloc):
+    def __init__(self, ffi, w_alloc, w_free, should_clear_after_alloc,
+                 arena=None):
         self.ffi = ffi    # may be None
         self.w_alloc = w_alloc
         self.w_free = w_free
         self.should_clear_after_alloc = should_clear_after_alloc
+        self.arena = arena    # an Arena, or None
 
     def allocate(self, space, datasize, ctype, length=-1):
         from pypy.module._cffi_backend import cdataobj, ctypeptr
+        if self.arena is not None:
+            return self.arena.allocate(space, datasize, ctype, length)
         if self.w_alloc is None:
             if self.should_clear_after_alloc:
                 ptr = lltype.malloc(rffi.CCHARP.TO, datasize,
@@ -71,7 +128,7 @@ W_Allocator.typedef = TypeDef(
 W_Allocator.typedef.acceptable_as_base_class = False
 
 
-def new_allocator(ffi, w_alloc, w_free, should_clear_after_alloc):
+def new_allocator(ffi, w_alloc, w_free, should_clear_after_alloc, arena=0):
     space = ffi.space
     if space.is_none(w_alloc):
         w_alloc = None
@@ -79,7 +136,17 @@ def new_allocator(ffi, w_alloc, w_free, should_clear_after_alloc):
         w_free = None
     if w_alloc is None and w_free is not None:
         raise oefmt(space.w_TypeError, "cannot pass 'free' without 'alloc'")
-    alloc = W_Allocator(ffi, w_alloc, w_free, bool(should_clear_after_alloc))
+    should_clear_after_alloc = bool(should_clear_after_alloc)
+    if arena < 0:
+        raise oefmt(space.w_ValueError, "'arena' must be positive")
+    if arena > 0:
+        if w_alloc is not None:
+            raise oefmt(space.w_TypeError,
+                        "cannot pass both 'arena' and 'alloc'")
+        a = Arena(arena, should_clear_after_alloc)
+    else:
+        a = None
+    alloc = W_Allocator(ffi, w_alloc, w_free, should_clear_after_alloc, a)
     return alloc
 
 
@@ -545,6 +545,12 @@ class W_CDataNewStd(W_CDataNewOwning):
         lltype.free(self._ptr, flavor='raw')
 
 
+class W_CDataNewArena(W_CDataNewOwning):
+    """Subclass using an arena allocator: the memory is part of a
+    bigger ArenaChunk, which is freed when all its cdatas are dead"""
+    _attrs_ = ['chunk']
+
+
 class W_CDataNewNonStd(W_CDataNewOwning):
     """Subclass using a non-standard allocator"""
     _attrs_ = ['w_raw_cdata', 'w_free']
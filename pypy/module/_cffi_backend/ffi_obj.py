@@ -449,9 +449,10 @@ pointer to the memory somewhere else, e.g. into another structure."""
 
     @unwrap_spec(w_alloc=WrappedDefault(None),
                  w_free=WrappedDefault(None),
-                 should_clear_after_alloc=int)
+                 should_clear_after_alloc=int,
+                 arena=int)
     def descr_new_allocator(self, w_alloc, w_free,
-                            should_clear_after_alloc=1):
+                            should_clear_after_alloc=1, arena=0):
         """\
 Return a new allocator, i.e. a function that behaves like ffi.new()
 but uses the provided low-level 'alloc' and 'free' functions.
@@ -465,10 +466,17 @@ If both 'alloc' and 'free' are None, the default is used.
 If 'should_clear_after_alloc' is set to False, then the memory
 returned by 'alloc' is assumed to be already cleared (or you are
 fine with garbage); otherwise CFFI will clear it.
+
+If 'arena' is a size in bytes, then 'alloc' and 'free' must be None,
+and the allocator hands out memory from chunks of that size, instead
+of calling malloc() for every object.  A chunk is freed only when all
+the objects allocated from it are dead; this is much faster for many
+short-lived small objects, but a single long-lived object keeps its
+whole chunk alive.
         """
         #
         return allocator.new_allocator(self, w_alloc, w_free,
-                                       should_clear_after_alloc)
+                                       should_clear_after_alloc, arena)
 
 
     def descr_new_handle(self, w_arg):
@@ -486,6 +486,33 @@ class AppTestFFIObj:
         alloc5 = ffi.new_allocator(myalloc5)
         raises(MemoryError, alloc5, "int[5]")
 
+    def test_ffi_new_allocator_arena(self):
+        import _cffi_backend as _cffi1_backend
+        ffi = _cffi1_backend.FFI()
+        raises(TypeError, ffi.new_allocator, lambda n: None, arena=256)
+        raises(ValueError, ffi.new_allocator, arena=-1)
+        alloc = ffi.new_allocator(arena=256)
+        p1 = alloc("int[10]")
+        p2 = alloc("int *", 42)
+        p3 = alloc("char[]", 1000)      # bigger than the chunk size
+        p4 = alloc("char[]", 0)
+        assert ffi.sizeof(p1) == 40
+        assert ffi.sizeof(p3) == 1000
+        assert list(p1) == [0] * 10
+        assert p2[0] == 42
+        assert p3[999] == '\x00'
+        assert repr(p1) == "<cdata 'int[10]' owning 40 bytes>"
+        a1 = int(ffi.cast("intptr_t", p1))
+        a2 = int(ffi.cast("intptr_t", p2))
+        a4 = int(ffi.cast("intptr_t", p4))
+        # p1 and p2, then p4, come from the same chunk, 16-bytes aligned
+        assert a2 == a1 + 48
+        assert a4 == a2 + 16
+        for i in range(10):
+            p1[i] = i * 3
+        assert p2[0] == 42
+        assert list(p1) == range(0, 30, 3)
+
     def test_bool_issue228(self):
         import _cffi_backend as _cffi1_backend
         ffi = _cffi1_backend.FFI()
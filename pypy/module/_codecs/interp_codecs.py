@@ -4,8 +4,10 @@ from rpython.rlib.rstring import UnicodeBuilder
 from rpython.rlib import runicode
 from rpython.rlib.runicode import code_to_unichr, MAXUNICODE
 
+from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.gateway import interp2app, unwrap_spec, WrappedDefault
+from pypy.interpreter.typedef import TypeDef
 from pypy.interpreter import unicodehelper
 
 
@@ -596,13 +598,21 @@ def charmap_decode(space, string, errors="strict", w_mapping=None):
     if len(string) == 0:
         return space.newtuple([space.newunicode(u''), space.newint(0)])
 
+    final = True
+    state = space.fromcache(CodecState)
     if space.is_none(w_mapping):
         mapping = None
+    elif space.isinstance_w(w_mapping, space.w_unicode):
+        # fast path for the decoding tables in the encodings package
+        table = space.unicode_w(w_mapping)
+        result, consumed = runicode.str_decode_charmap_table(
+            string, len(string), errors,
+            final, state.decode_error_handler, table)
+        return space.newtuple([space.newunicode(result),
+                               space.newint(consumed)])
     else:
         mapping = Charmap_Decode(space, w_mapping)
 
-    final = True
-    state = space.fromcache(CodecState)
     result, consumed = runicode.str_decode_charmap(
         string, len(string), errors,
         final, state.decode_error_handler, mapping)
@@ -612,21 +622,47 @@ def charmap_decode(space, string, errors="strict", w_mapping=None):
 def charmap_encode(space, uni, errors="strict", w_mapping=None):
     if errors is None:
         errors = 'strict'
+    state = space.fromcache(CodecState)
+    if isinstance(w_mapping, W_EncodingMap):
+        result = runicode.unicode_encode_charmap_table(
+            uni, len(uni), errors,
+            state.encode_error_handler, w_mapping.encoding_map)
+        return space.newtuple([space.newbytes(result),
+                               space.newint(len(uni))])
+
     if space.is_none(w_mapping):
         mapping = None
     else:
         mapping = Charmap_Encode(space, w_mapping)
 
-    state = space.fromcache(CodecState)
     result = runicode.unicode_encode_charmap(
         uni, len(uni), errors,
         state.encode_error_handler, mapping)
     return space.newtuple([space.newbytes(result), space.newint(len(uni))])
 
 
+class W_EncodingMap(W_Root):
+    """The result of charmap_build() for a full decoding table: a
+    precompiled reverse table that charmap_encode() can use without
+    going through the object space for every character."""
+
+    def __init__(self, encoding_map):
+        self.encoding_map = encoding_map
+
+    def descr_size(self, space):
+        return space.newint(self.encoding_map.get_size())
+
+W_EncodingMap.typedef = TypeDef(
+    "EncodingMap",
+    size = interp2app(W_EncodingMap.descr_size),
+)
+W_EncodingMap.typedef.acceptable_as_base_class = False
+
+
 @unwrap_spec(chars=unicode)
 def charmap_build(space, chars):
-    # XXX CPython sometimes uses a three-level trie
+    if len(chars) == 256:
+        return W_EncodingMap(runicode.EncodingMap(chars))
     w_charmap = space.newdict()
     for num in range(len(chars)):
         elem = chars[num]
@@ -656,6 +656,39 @@ class AppTestPartialEvaluation:
         assert codecs.charmap_build(u'123456') == {49: 0, 50: 1, 51: 2,
                                                    52: 3, 53: 4, 54: 5}
 
+    def test_charmap_build_encoding_map(self):
+        import codecs
+        table = u''.join([unichr(i) for i in range(128)] +
+                         [unichr(0x400 + i) for i in range(127)] +
+                         [u'\ufffe'])
+        m = codecs.charmap_build(table)
+        assert type(m).__name__ == 'EncodingMap'
+        assert m.size() > 0
+        assert codecs.charmap_encode(u'ab\u0401', 'strict', m) == (
+            'ab\x81', 3)
+        assert codecs.charmap_encode(u'', 'strict', m) == ('', 0)
+        raises(UnicodeEncodeError, codecs.charmap_encode, u'\ufffe',
+               'strict', m)
+        exc = raises(UnicodeEncodeError, codecs.charmap_encode,
+                     u'a\xe9\xe9b', 'strict', m)
+        assert (exc.value.start, exc.value.end) == (1, 3)
+        assert codecs.charmap_encode(u'a\xe9\u0401', 'replace', m) == (
+            'a?\x81', 3)
+        assert codecs.charmap_encode(u'a\xe9', 'xmlcharrefreplace', m) == (
+            'a&#233;', 2)
+        assert codecs.charmap_encode(u'a\xe9', 'ignore', m) == ('a', 2)
+
+    def test_charmap_table_roundtrip(self):
+        import codecs
+        for encoding in ['cp1252', 'iso8859_2', 'koi8_r', 'mac_roman']:
+            data = ''.join([chr(i) for i in range(256)])
+            u = data.decode(encoding, 'ignore')
+            assert u.encode(encoding) == ''.join(
+                [c for c in data if c.decode(encoding, 'ignore')])
+        assert '\x80\x81'.decode('cp1252', 'replace') == u'\u20ac\ufffd'
+        exc = raises(UnicodeDecodeError, '\x81'.decode, 'cp1252')
+        assert exc.value.reason == 'character maps to <undefined>'
+
     def test_utf7_start_end_in_exception(self):
         try:
             '+IC'.decode('utf-7')
@@ -243,7 +243,7 @@ class W_File(W_AbstractStream):
             while size > 0:
                 # "peeks" on the underlying stream to see how many chars
                 # we can safely read without reading past an end-of-line
-                startindex, peeked = stream.peek()
+                startindex, peeked = stream.peek(size)
                 assert 0 <= startindex <= len(peeked)
                 endindex = startindex + size
                 pn = peeked.find("\n", startindex, endindex)
@@ -320,6 +320,14 @@ class W_File(W_AbstractStream):
         from pypy.module._file.readinto import direct_readinto
         return direct_readinto(self, w_rwbuffer)
 
+    def direct_readinto_buffer(self, rwbuffer):
+        from pypy.module._file.readinto import direct_readinto_buffer
+        return direct_readinto_buffer(self, rwbuffer)
+
+    def direct_write_buffer(self, rbuffer):
+        from pypy.module._file.readinto import direct_write_buffer
+        direct_write_buffer(self, rbuffer)
+
     # ____________________________________________________________
     #
     # The 'file_' methods are the one exposed to app-level.
@@ -464,6 +472,14 @@ Size defaults to the current file position, as returned by tell().""",
     _decl(locals(), "write_str", "Interp-level only, see file_write()",
           exposed=False,
           wrapresult="space.w_None")
+    _decl(locals(), "readinto_buffer",
+          "Interp-level only, like readinto() with an interp-level buffer",
+          exposed=False,
+          wrapresult="result")
+    _decl(locals(), "write_buffer",
+          "Interp-level only, like write() with an interp-level buffer",
+          exposed=False,
+          wrapresult="space.w_None")
     _decl(locals(), "__iter__",
         """Iterating over files, as in 'for line in f:', returns each line of
 the file one by one.""",
@@ -1,13 +1,18 @@
 import errno
+import os
 from rpython.rlib import rposix
 from rpython.rlib.objectmodel import keepalive_until_here
-from rpython.rlib.rposix import c_read
+from rpython.rlib.rposix import c_read, c_write
 from rpython.rtyper.lltypesystem import lltype, rffi
 from pypy.module._file.interp_file import is_wouldblock_error, signal_checker
 
 
 def direct_readinto(self, w_rwbuffer):
     rwbuffer = self.space.writebuf_w(w_rwbuffer)
+    return self.space.newint(direct_readinto_buffer(self, rwbuffer))
+
+
+def direct_readinto_buffer(self, rwbuffer):
     stream = self.getstream()
     size = rwbuffer.getlength()
     target_address = lltype.nullptr(rffi.CCHARP.TO)
@@ -73,4 +78,46 @@ def direct_readinto(self, w_rwbuffer):
                     raise OSError(err, "read error")
             keepalive_until_here(rwbuffer)
 
-    return self.space.newint(target_pos)
+    return target_pos
+
+
+def direct_write_buffer(self, rbuffer):
+    stream = self.getstream()
+    self.check_writable()
+    self.softspace = 0
+    size = rbuffer.getlength()
+    source_address = lltype.nullptr(rffi.CCHARP.TO)
+    fd = -1
+    source_pos = 0
+
+    # only binary data can skip the stream: in text mode, the stream
+    # may have to translate the newlines
+    if size > 64 and (self.binary or os.linesep == '\n'):
+        try:
+            source_address = rbuffer.get_raw_address()
+        except ValueError:
+            pass
+        else:
+            stream.flush()
+            if stream.count_buffered_bytes() == 0:
+                fd = stream.try_to_find_file_descriptor()
+
+    if fd < 0 or not source_address:
+        # fall-back
+        stream.write(rbuffer.as_str())
+
+    else:
+        # optimized case: call c_write() directly on the raw memory
+        while size > 0:
+            got = c_write(fd, rffi.ptradd(source_address, source_pos), size)
+            got = rffi.cast(lltype.Signed, got)
+            if got >= 0:
+                source_pos += got
+                size -= got
+            else:
+                err = rposix.get_saved_errno()
+                if err == errno.EINTR:
+                    signal_checker(self.space)()
+                    continue
+                raise OSError(err, "write error")
+        keepalive_until_here(rbuffer)
@@ -42,6 +42,30 @@ class AppTestFile(object):
         finally:
             f.close()
 
+    def test_mmap_mode(self):
+        with self.file(self.temppath, "wb") as f:
+            f.write("foo\nbar\n" * 1000 + "last")
+        f = self.file(self.temppath, "rbm")
+        try:
+            assert f.mode == "rbm"
+            assert f.readline() == "foo\n"
+            assert f.readline(2) == "ba"
+            assert f.read(2) == "r\n"
+            assert f.tell() == 8
+            lines = list(f)
+            assert len(lines) == 1999
+            assert lines[-1] == "last"
+            f.seek(-5, 2)
+            assert f.read() == "\nlast"
+            f.seek(0)
+            buf = bytearray(100)
+            assert f.readinto(buf) == 100
+            assert str(buf) == ("foo\nbar\n" * 13)[:100]
+            assert f.tell() == 100
+            raises(IOError, f.write, "x")
+        finally:
+            f.close()
+
     def test_readline(self):
         f = self.file(self.temppath, "w")
         try:
@@ -17,6 +17,8 @@ class Module(MixedModule):
     if HAS_FAST_PKCS5_PBKDF2_HMAC:
         interpleveldefs['pbkdf2_hmac'] = 'interp_hashlib.pbkdf2_hmac'
 
+    deferred_startup = True
+
     def startup(self, space):
         w_meth_names = fetch_names(space)
         space.setattr(self, space.newtext('openssl_md_meth_names'), w_meth_names)
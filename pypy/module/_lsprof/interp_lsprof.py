@@ -273,13 +273,13 @@ def prepare_spec(space, w_arg):
     else:
         return (None, space.type(w_arg))
 
-def lsprof_call(space, w_self, frame, event, w_arg):
+def lsprof_call(space, w_self, code, event, w_arg):
+    # installed with code_only=True: we get the PyCode of the frame, not
+    # the frame itself, so that the frame is not forced by profiling
     assert isinstance(w_self, W_Profiler)
     if event == 'call':
-        code = frame.getcode()
         w_self._enter_call(code)
     elif event == 'return':
-        code = frame.getcode()
         w_self._enter_return(code)
     elif event == 'c_call':
         if w_self.builtins:
@@ -336,7 +336,8 @@ class W_Profiler(W_Root):
         self.total_timestamp -= read_timestamp()
         # set profiler hook
         c_setup_profiling()
-        space.getexecutioncontext().setllprofile(lsprof_call, self)
+        space.getexecutioncontext().setllprofile(lsprof_call, self,
+                                                  code_only=True)
 
     @jit.elidable
     def _get_or_make_entry(self, f_code, make=True):
@@ -1,5 +1,5 @@
 from rpython.rlib import jit, rgc
-from rpython.rlib.buffer import RawBuffer
+from rpython.rlib.buffer import RawBuffer, SubBuffer
 from rpython.rlib.objectmodel import keepalive_until_here
 from rpython.rlib.rarithmetic import ovfcheck, widen
 from rpython.rlib.unroll import unrolling_iterable
@@ -401,6 +401,23 @@ class W_ArrayBase(W_Root):
             size = ovfcheck(self.itemsize * n)
         except OverflowError:
             raise MemoryError
+        if n > 0 and space.is_w(space.type(w_f),
+                                space.gettypeobject(W_File.typedef)):
+            # fast path for real files: read directly into the array
+            # memory, without going through an intermediate string
+            oldlen = self.len
+            self.setlen(oldlen + n)
+            rwbuffer = SubBuffer(ArrayBuffer(self, False),
+                                 oldlen * self.itemsize, size)
+            try:
+                got = w_f.file_readinto_buffer(rwbuffer)
+            except OperationError:
+                self.setlen(oldlen)
+                raise
+            self.setlen(oldlen + got / self.itemsize)
+            if got < size:
+                raise oefmt(space.w_EOFError, "not enough items in file")
+            return
         w_item = space.call_method(w_f, 'read', space.newint(size))
         item = space.bytes_w(w_item)
         if len(item) < size:
@@ -419,6 +436,11 @@ class W_ArrayBase(W_Root):
         Write all items (as machine values) to the file object f.  Also
         called as write.
         """
+        if space.is_w(space.type(w_f), space.gettypeobject(W_File.typedef)):
+            # fast path for real files: write directly from the array
+            # memory, without making a string copy of it
+            w_f.file_write_buffer(ArrayBuffer(self, True))
+            return
         w_s = self.descr_tostring(space)
         space.call_method(w_f, 'write', w_s)
 
@@ -751,7 +773,7 @@ W_ArrayBase.typedef = TypeDef(
     pop = interpindirect2app(W_ArrayBase.descr_pop),
     insert = interpindirect2app(W_ArrayBase.descr_insert),
 
-    tolist = interp2app(W_ArrayBase.descr_tolist),
+    tolist = interpindirect2app(W_ArrayBase.descr_tolist),
     fromlist = interp2app(W_ArrayBase.descr_fromlist),
     tostring = interp2app(W_ArrayBase.descr_tostring),
     fromstring = interp2app(W_ArrayBase.descr_fromstring),
@@ -1012,6 +1034,25 @@ def make_array(mytype):
 
         # interface
 
+        def descr_tolist(self, space):
+            # integer and float arrays give lists with the int or float
+            # strategy, whose storage is filled directly
+            if mytype.unwrap == 'int_w':
+                lst = [0] * self.len
+                buf = self.get_buffer()
+                for i in range(self.len):
+                    lst[i] = rffi.cast(lltype.Signed, buf[i])
+                keepalive_until_here(self)
+                return space.newlist_int(lst)
+            elif mytype.unwrap == 'float_w':
+                lst = [0.0] * self.len
+                buf = self.get_buffer()
+                for i in range(self.len):
+                    lst[i] = float(buf[i])
+                keepalive_until_here(self)
+                return space.newlist_float(lst)
+            return W_ArrayBase.descr_tolist(self, space)
+
         def descr_append(self, space, w_x):
             x = self.item_w(w_x)
             index = self.len
@@ -222,6 +222,32 @@ class AppTestArray(object):
             raises(EOFError, a.fromfile, myfile(b'\x01', 2 + i), 2)
             assert len(a) == 1 and a[0] == 257
 
+    def test_tofile_fromfile_large(self):
+        a = self.array('l', range(1000))
+        f = open(self.tempfile, 'wb')
+        f.write('x')
+        a.tofile(f)
+        a.tofile(f)
+        f.close()
+        f = open(self.tempfile, 'rb')
+        assert f.read(1) == 'x'
+        b = self.array('l', [-1])
+        b.fromfile(f, 1500)
+        assert b.tolist() == [-1] + range(1000) + range(500)
+        raises(EOFError, b.fromfile, f, 600)
+        assert b.tolist() == [-1] + range(1000) + range(1000)
+        f.close()
+
+    def test_fromfile_file_subclass(self):
+        class MyFile(file):
+            def read(self, n):
+                return '\x02' * n
+        f = MyFile(self.tempfile, 'rb')
+        a = self.array('b')
+        a.fromfile(f, 5)
+        f.close()
+        assert a.tolist() == [2] * 5
+
     def test_fromlist(self):
         a = self.array('b')
         raises(OverflowError, a.fromlist, [1, 2, 400])
@@ -1027,3 +1053,21 @@ class AppTestArray(object):
 
     def test_fresh_array_buffer_str(self):
         assert str(buffer(self.array('i'))) == ''
+
+
+class AppTestArrayStrategies(object):
+    spaceconfig = {'usemodules': ['array', '__pypy__']}
+
+    def test_tolist_strategy(self):
+        from array import array
+        from __pypy__ import strategy
+        for tc in 'bBhHiIl':
+            l = array(tc, [1, 2, 3]).tolist()
+            assert l == [1, 2, 3]
+            assert strategy(l) == "IntegerListStrategy"
+        for tc in 'fd':
+            l = array(tc, [1.5, 2.5]).tolist()
+            assert l == [1.5, 2.5]
+            assert strategy(l) == "FloatListStrategy"
+        assert strategy(array('i').tolist()) == "IntegerListStrategy"
+        assert array('c', 'ab').tolist() == ['a', 'b']
@@ -459,7 +459,7 @@ class ReadBZ2Filter(Stream):
         self.readlength += len(result)
         return result
 
-    def peek(self):
+    def peek(self, size=-1):
         return (self.pos, self.buffer)
 
     def try_to_find_file_descriptor(self):
@@ -171,6 +171,9 @@ corresponding Unix manual entries for more information on calls."""
         interpleveldefs['_getfullpathname'] = 'interp_posix._getfullpathname'
     if hasattr(os, 'chroot'):
         interpleveldefs['chroot'] = 'interp_posix.chroot'
+    if os.name != 'nt':
+        # rposix_scandir only gives unicode names on Windows
+        interpleveldefs['scandir'] = 'interp_scandir.scandir'
 
     for name in rposix.WAIT_MACROS:
         if hasattr(os, name):
@@ -0,0 +1,288 @@
+import stat
+from errno import ENOENT
+from rpython.rlib import rposix_scandir, rposix_stat
+
+from pypy.interpreter.gateway import unwrap_spec, interp2app
+from pypy.interpreter.error import OperationError, oefmt, wrap_oserror2
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.baseobjspace import W_Root
+
+from pypy.module.posix.interp_posix import build_stat_result
+from pypy.module.sys.interp_encoding import getfilesystemencoding
+
+
+def scandir(space, w_path=None):
+    """scandir(path='.') -> iterator of DirEntry objects for given path
+
+Like listdir(), but the entries also cache the file type reported by
+the operating system, so that is_dir(), is_file() and is_symlink()
+usually don't need a system call."""
+    if space.is_none(w_path):
+        w_path = space.newtext(".")
+    result_is_bytes = not space.isinstance_w(w_path, space.w_unicode)
+    if result_is_bytes:
+        path = space.bytes0_w(w_path)
+    else:
+        path = space.fsencode_w(w_path)
+    try:
+        dirp = rposix_scandir.opendir(path)
+    except OSError as e:
+        raise wrap_oserror2(space, e, w_path)
+    path_prefix = path
+    if len(path_prefix) > 0 and path_prefix[-1] != '/':
+        path_prefix += '/'
+    w_path_prefix = space.newbytes(path_prefix)
+    if not result_is_bytes:
+        w_path_prefix = _decode_name(space, w_path_prefix)
+    return W_ScandirIterator(space, dirp, path_prefix, w_path_prefix,
+                             result_is_bytes)
+
+def _decode_name(space, w_bytes):
+    # like listdir(): decode with the filesystem encoding, but fall back
+    # to the original byte string if that fails
+    try:
+        return space.call_method(w_bytes, "decode",
+                                 getfilesystemencoding(space))
+    except OperationError as e:
+        if e.async(space):
+            raise
+        return w_bytes
+
+
+class W_ScandirIterator(W_Root):
+    _in_next = False
+
+    def __init__(self, space, dirp, path_prefix, w_path_prefix,
+                 result_is_bytes):
+        self.space = space
+        self.dirp = dirp
+        self.path_prefix = path_prefix
+        self.w_path_prefix = w_path_prefix
+        self.result_is_bytes = result_is_bytes
+        self.register_finalizer(space)
+
+    def _finalize_(self):
+        self._close()
+
+    def _close(self):
+        dirp = self.dirp
+        if dirp:
+            self.dirp = rposix_scandir.NULL_DIRP
+            rposix_scandir.closedir(dirp)
+
+    def iter_w(self):
+        return self
+
+    def fail(self, err=None):
+        self._close()
+        if err is None:
+            raise OperationError(self.space.w_StopIteration, self.space.w_None)
+        else:
+            raise err
+
+    def next_w(self):
+        if not self.dirp:
+            raise self.fail()
+        if self._in_next:
+            raise self.fail(oefmt(self.space.w_RuntimeError,
+                "cannot use ScandirIterator from multiple threads "
+                "concurrently"))
+        self._in_next = True
+        try:
+            while True:
+                try:
+                    entry = rposix_scandir.nextentry(self.dirp)
+                except OSError as e:
+                    raise self.fail(wrap_oserror2(self.space, e,
+                                                  self.w_path_prefix))
+                if not entry:
+                    raise self.fail()
+                name = rposix_scandir.get_name_bytes(entry)
+                if name != '.' and name != '..':
+                    break
+            known_type = rposix_scandir.get_known_type(entry)
+            inode = rposix_scandir.get_inode(entry)
+        finally:
+            self._in_next = False
+        return W_DirEntry(self, name, known_type, inode)
+
+
+W_ScandirIterator.typedef = TypeDef(
+    'posix.ScandirIterator',
+    __iter__ = interp2app(W_ScandirIterator.iter_w),
+    next = interp2app(W_ScandirIterator.next_w),
+)
+W_ScandirIterator.typedef.acceptable_as_base_class = False
+
+
+FLAG_STAT  = 256
+FLAG_LSTAT = 512
+
+
+class W_DirEntry(W_Root):
+    w_path = None
+
+    def __init__(self, scandir_iterator, name, known_type, inode):
+        space = scandir_iterator.space
+        self.space = space
+        self.scandir_iterator = scandir_iterator
+        self.name = name          # always bytes
+        self.inode = inode
+        assert known_type == (known_type & 255)
+        self.flags = known_type   # plus FLAG_STAT and FLAG_LSTAT
+        w_name = space.newbytes(name)
+        if not scandir_iterator.result_is_bytes:
+            w_name = _decode_name(space, w_name)
+        self.w_name = w_name
+
+    def descr_repr(self, space):
+        u = space.text_w(space.repr(self.w_name))
+        return space.newtext("<DirEntry %s>" % u)
+
+    def fget_name(self, space):
+        return self.w_name
+
+    def fget_path(self, space):
+        w_path = self.w_path
+        if w_path is None:
+            # decode the whole path like the name: if that fails, the
+            # path is returned as a byte string too
+            scandir_iterator = self.scandir_iterator
+            w_path = space.newbytes(scandir_iterator.path_prefix + self.name)
+            if not scandir_iterator.result_is_bytes:
+                w_path = _decode_name(space, w_path)
+            self.w_path = w_path
+        return w_path
+
+    # The internal methods, used to implement the public methods at
+    # the end of the class.  Every method only calls methods *before*
+    # it in program order, so there is no cycle.
+
+    def get_lstat(self):
+        """Get the lstat() of the direntry.  May raise OSError."""
+        if (self.flags & FLAG_LSTAT) == 0:
+            path = self.scandir_iterator.path_prefix + self.name
+            st = rposix_stat.lstat(path)
+            self.flags |= FLAG_LSTAT
+            self.d_lstat = st
+        return self.d_lstat
+
+    def get_stat(self):
+        """Get the stat() of the direntry.  This is implemented in
+        such a way that it won't do both a stat() and a lstat().
+        """
+        if (self.flags & FLAG_STAT) == 0:
+            # We don't have the 'd_stat'.  If the known_type says the
+            # direntry is not a DT_LNK, then try to get and cache the
+            # 'd_lstat' instead.  Then, or if we already have a
+            # 'd_lstat' from before, *and* if the 'd_lstat' is not a
+            # S_ISLNK, we can reuse it unmodified for 'd_stat'.
+            if (self.flags & 255) != rposix_scandir.DT_LNK:
+                if not self.flags & FLAG_LSTAT:
+                    # Unlike CPython, for us known_type can be DT_UNKNOWN
+                    # here; in that case we call lstat() first to know
+                    # if we have a symlink or not
+                    self.get_lstat()
+                if not stat.S_ISLNK(self.d_lstat.st_mode):
+                    self.d_stat = self.d_lstat
+                    self.flags |= FLAG_STAT
+                    return self.d_stat
+            path = self.scandir_iterator.path_prefix + self.name
+            st = rposix_stat.stat(path)
+            self.flags |= FLAG_STAT
+            self.d_stat = st
+        return self.d_stat
+
+    def get_stat_or_lstat(self, follow_symlinks):
+        if follow_symlinks:
+            return self.get_stat()
+        else:
+            return self.get_lstat()
+
+    def check_mode(self, follow_symlinks):
+        """Get the stat() or lstat() of the direntry, and return the
+        S_IFMT.  If calling stat()/lstat() gives us ENOENT, return -1
+        instead; it is better to give up and answer "no, not this type"
+        to requests, rather than propagate the error.
+        """
+        try:
+            st = self.get_stat_or_lstat(follow_symlinks)
+        except OSError as e:
+            if e.errno == ENOENT:    # not found
+                return -1
+            raise wrap_oserror2(self.space, e, self.fget_path(self.space))
+        return stat.S_IFMT(st.st_mode)
+
+    def is_dir(self, follow_symlinks):
+        known_type = self.flags & 255
+        if known_type != rposix_scandir.DT_UNKNOWN:
+            if known_type == rposix_scandir.DT_DIR:
+                return True
+            elif follow_symlinks and known_type == rposix_scandir.DT_LNK:
+                pass    # don't know in this case
+            else:
+                return False
+        return self.check_mode(follow_symlinks) == stat.S_IFDIR
+
+    def is_file(self, follow_symlinks):
+        known_type = self.flags & 255
+        if known_type != rposix_scandir.DT_UNKNOWN:
+            if known_type == rposix_scandir.DT_REG:
+                return True
+            elif follow_symlinks and known_type == rposix_scandir.DT_LNK:
+                pass    # don't know in this case
+            else:
+                return False
+        return self.check_mode(follow_symlinks) == stat.S_IFREG
+
+    def is_symlink(self):
+        """Check if the direntry is a symlink.  May get the lstat()."""
+        known_type = self.flags & 255
+        if known_type != rposix_scandir.DT_UNKNOWN:
+            return known_type == rposix_scandir.DT_LNK
+        return self.check_mode(follow_symlinks=False) == stat.S_IFLNK
+
+    @unwrap_spec(follow_symlinks=bool)
+    def descr_is_dir(self, space, follow_symlinks=True):
+        """return True if the entry is a directory; cached per entry"""
+        return space.newbool(self.is_dir(follow_symlinks))
+
+    @unwrap_spec(follow_symlinks=bool)
+    def descr_is_file(self, space, follow_symlinks=True):
+        """return True if the entry is a file; cached per entry"""
+        return space.newbool(self.is_file(follow_symlinks))
+
+    def descr_is_symlink(self, space):
+        """return True if the entry is a symbolic link; cached per entry"""
+        return space.newbool(self.is_symlink())
+
+    @unwrap_spec(follow_symlinks=bool)
+    def descr_stat(self, space, follow_symlinks=True):
+        """return stat_result object for the entry; cached per entry"""
+        try:
+            st = self.get_stat_or_lstat(follow_symlinks)
+        except OSError as e:
+            raise wrap_oserror2(space, e, self.fget_path(space))
+        return build_stat_result(space, st)
+
+    def descr_inode(self, space):
+        """return inode of the entry; cached per entry"""
+        return space.newint(self.inode)
+
+
+W_DirEntry.typedef = TypeDef(
+    'posix.DirEntry',
+    __repr__ = interp2app(W_DirEntry.descr_repr),
+    name = GetSetProperty(W_DirEntry.fget_name,
+                          doc="the entry's base filename, relative to "
+                              'scandir() "path" argument'),
+    path = GetSetProperty(W_DirEntry.fget_path,
+                          doc="the entry's full path name; equivalent to "
+                              "os.path.join(scandir_path, entry.name)"),
+    is_dir = interp2app(W_DirEntry.descr_is_dir),
+    is_file = interp2app(W_DirEntry.descr_is_file),
+    is_symlink = interp2app(W_DirEntry.descr_is_symlink),
+    stat = interp2app(W_DirEntry.descr_stat),
+    inode = interp2app(W_DirEntry.descr_inode),
+)
+W_DirEntry.typedef.acceptable_as_base_class = False
@@ -0,0 +1,162 @@
+import sys, os
+import py
+from rpython.tool.udir import udir
+from pypy.module.posix.test import test_posix2
+
+
+def _make_dir(dirname, content):
+    d = os.path.join(str(udir), dirname)
+    os.mkdir(d)
+    for key, value in content.items():
+        filename = os.path.join(d, key)
+        if value == 'dir':
+            os.mkdir(filename)
+        elif value == 'file':
+            with open(filename, 'w') as f:
+                pass
+        elif value.startswith('symlink:'):
+            os.symlink(value[8:], filename)
+        else:
+            raise NotImplementedError(repr(value))
+    return d
+
+
+class AppTestScandir(object):
+    spaceconfig = {'usemodules': test_posix2.USEMODULES}
+
+    def setup_class(cls):
+        if os.name == 'nt':
+            py.test.skip("scandir() is only provided on posix")
+        space = cls.space
+        cls.w_posix = space.appexec([], test_posix2.GET_POSIX)
+        cls.w_dir_empty = space.wrap(_make_dir('empty', {}))
+        cls.w_dir0 = space.wrap(_make_dir('dir0', {'f1': 'file',
+                                                   'f2': 'file',
+                                                   'f3': 'file'}))
+        cls.w_dir1 = space.wrap(_make_dir('dir1', {'file1': 'file'}))
+        cls.w_dir2 = space.wrap(_make_dir('dir2', {'subdir2': 'dir'}))
+        cls.w_dir3 = space.wrap(_make_dir('dir3', {'sfile3': 'symlink:file3'}))
+        cls.w_dir4 = space.wrap(_make_dir('dir4', {'sdir4': 'symlink:dir4'}))
+        cls.w_dir6 = space.wrap(_make_dir('dir6', {'sdir6': 'symlink:../dir2'}))
+        cls.w_dir7 = space.wrap(_make_dir('dir7', {'\xff': 'file'}))
+
+    def test_scandir_empty(self):
+        posix = self.posix
+        sd = posix.scandir(self.dir_empty)
+        assert list(sd) == []
+        assert list(sd) == []
+
+    def test_scandir_files(self):
+        posix = self.posix
+        sd = posix.scandir(self.dir0)
+        names = [d.name for d in sd]
+        assert sorted(names) == ['f1', 'f2', 'f3']
+
+    def test_unicode_versus_bytes(self):
+        posix = self.posix
+        d = next(posix.scandir())
+        assert type(d.name) is str
+        assert type(d.path) is str
+        assert d.path == './' + d.name
+        d = next(posix.scandir(u'.'))
+        assert type(d.name) is unicode
+        assert type(d.path) is unicode
+        assert d.path == u'./' + d.name
+        d = next(posix.scandir('/'))
+        assert type(d.name) is str
+        assert type(d.path) is str
+        assert d.path == '/' + d.name
+        d = next(posix.scandir(u'/'))
+        assert type(d.name) is unicode
+        assert type(d.path) is unicode
+        assert d.path == u'/' + d.name
+
+    def test_undecodable_name(self):
+        posix = self.posix
+        d = next(posix.scandir(unicode(self.dir7)))
+        assert d.name == '\xff'
+        assert type(d.path) is str
+        assert d.path == self.dir7 + '/\xff'
+
+    def test_stat1(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        assert d.name == 'file1'
+        assert d.stat().st_mode & 0o170000 == 0o100000    # S_IFREG
+        assert d.stat().st_size == 0
+        assert d.stat() is not d.stat()     # new stat_result each time
+        assert d.inode() == d.stat().st_ino
+
+    def test_stat4(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir4))
+        assert d.name == 'sdir4'
+        raises(OSError, d.stat)
+        assert d.stat(follow_symlinks=False).st_mode & 0o170000 == 0o120000
+
+    def test_dir1(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        assert d.name == 'file1'
+        assert     d.is_file()
+        assert not d.is_dir()
+        assert not d.is_symlink()
+        assert     d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_dir2(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir2))
+        assert d.name == 'subdir2'
+        assert not d.is_file()
+        assert     d.is_dir()
+        assert not d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert     d.is_dir(follow_symlinks=False)
+
+    def test_dir3(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir3))
+        assert d.name == 'sfile3'
+        assert not d.is_file()      # broken symlink
+        assert not d.is_dir()
+        assert     d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_dir6(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir6))
+        assert d.name == 'sdir6'
+        assert not d.is_file()
+        assert     d.is_dir()
+        assert     d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_repr(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        assert repr(d) == "<DirEntry 'file1'>"
+
+    def test_no_unexpected_attributes(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        raises(AttributeError, "d.foo = 42")
+        raises(TypeError, type(d))
+
+    def test_walk(self):
+        import os
+        result = list(os.walk(self.dir6, followlinks=False))
+        assert result == [(self.dir6, ['sdir6'], [])]
+        result = list(os.walk(self.dir6, followlinks=True))
+        sdir6 = os.path.join(self.dir6, 'sdir6')
+        assert result == [(self.dir6, ['sdir6'], []),
+                          (sdir6, ['subdir2'], []),
+                          (os.path.join(sdir6, 'subdir2'), [], [])]
+        result = list(os.walk(self.dir0))
+        assert len(result) == 1
+        assert sorted(result[0][2]) == ['f1', 'f2', 'f3']
+        result = list(os.walk(self.dir2, topdown=False))
+        assert result == [(os.path.join(self.dir2, 'subdir2'), [], []),
+                          (self.dir2, ['subdir2'], [])]
@@ -59,6 +59,8 @@ class Module(MixedModule):
         assert len(ver) >= 5, (
             "Cannot compile with the wide (UTF-16) version of Expat")
 
+    deferred_startup = True
+
     def startup(self, space):
         from pypy.module.pyexpat import interp_pyexpat
         w_ver = interp_pyexpat.get_expat_version(space)
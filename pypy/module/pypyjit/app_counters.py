@@ -0,0 +1,31 @@
+"""
+Plain Python helpers to relate the guard failure counters of
+get_stats_snapshot() to the loops reported by the compile hook.
+"""
+
+def get_guard_failures(loopinfo, snapshot=None):
+    """get_guard_failures(loopinfo, snapshot=None) -> list
+
+    Return a list of (guard, greenkey, count) for each guard of the given
+    JitLoopInfo that failed at least once.  'greenkey' is the one of the
+    closest preceding debug_merge_point, i.e. the source location of the
+    guard (for the main interpreter loop, a triplet (code, ofs,
+    is_profiled)).  The counters only work for guards compiled after
+    pypyjit.enable_guard_counters(), or if the backend debugging is
+    enabled, e.g. with PYPYLOG=jit-backend-counts:...
+    """
+    from pypyjit import get_stats_snapshot, GuardOp, DebugMergePoint
+
+    if snapshot is None:
+        snapshot = get_stats_snapshot()
+    failures = snapshot.guard_failures
+    result = []
+    greenkey = None
+    for op in loopinfo.operations:
+        if isinstance(op, DebugMergePoint):
+            greenkey = op.greenkey
+        elif isinstance(op, GuardOp):
+            count = failures.get(op.descr_number, 0)
+            if count:
+                result.append((op, greenkey, count))
+    return result
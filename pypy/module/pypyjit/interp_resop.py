@@ -128,10 +128,12 @@ def wrap_oplist(space, logops, operations, ops_offset=None):
             descr = op.getdescr()
             if descr is not None: # can be none in on_abort!
                 hash = op.getdescr().get_jitcounter_hash()
+                descr_number = compute_unique_id(descr)
             else:
                 hash = r_uint(0)
+                descr_number = 0
             l_w.append(GuardOp(name, ofs, logops.repr_of_resop(op),
-                hash))
+                hash, descr_number))
         else:
             l_w.append(WrappedOp(name, ofs, logops.repr_of_resop(op)))
     return l_w
@@ -167,9 +169,10 @@ class WrappedOp(W_Root):
         return space.newtext(self.name)
 
 class GuardOp(WrappedOp):
-    def __init__(self, name, offset, repr_of_resop, hash):
+    def __init__(self, name, offset, repr_of_resop, hash, descr_number=0):
         WrappedOp.__init__(self, name, offset, repr_of_resop)
         self.hash = hash
+        self.descr_number = descr_number
 
 class DebugMergePoint(WrappedOp):
     """ A class representing Debug Merge Point - the entry point
@@ -220,6 +223,10 @@ GuardOp.typedef = TypeDef(
     name = GetSetProperty(GuardOp.descr_name),
     offset = interp_attrproperty("offset", cls=GuardOp, wrapfn="newint"),
     hash = interp_attrproperty("hash", cls=GuardOp, wrapfn="newint"),
+    descr_number = interp_attrproperty("descr_number", cls=GuardOp,
+                     doc="Number of the guard, as used in the 'guard' "
+                         "entries of get_stats_snapshot().guard_failures",
+                     wrapfn="newint"),
     )
 GuardOp.typedef.acceptable_as_base_class = False
 
@@ -348,10 +355,12 @@ W_JitLoopInfo.typedef.acceptable_as_base_class = False
 
 
 class W_JitInfoSnapshot(W_Root):
-    def __init__(self, space, w_times, w_counters, w_counter_times):
+    def __init__(self, space, w_times, w_counters, w_counter_times,
+                 w_guard_failures):
         self.w_loop_run_times = w_times
         self.w_counters = w_counters
         self.w_counter_times = w_counter_times
+        self.w_guard_failures = w_guard_failures
 
 W_JitInfoSnapshot.typedef = TypeDef(
     "JitInfoSnapshot",
@@ -362,7 +371,11 @@ W_JitInfoSnapshot.typedef = TypeDef(
                                        doc="various JIT counters"),
     counter_times = interp_attrproperty_w("w_counter_times",
                                             cls=W_JitInfoSnapshot,
-                                            doc="various JIT timers")
+                                            doc="various JIT timers"),
+    guard_failures = interp_attrproperty_w("w_guard_failures",
+                                     cls=W_JitInfoSnapshot,
+                                     doc="number of failures of each guard, "
+                                         "keyed by GuardOp.descr_number"),
 )
 W_JitInfoSnapshot.typedef.acceptable_as_base_class = False
 
@@ -373,8 +386,15 @@ def get_stats_snapshot(space):
     """
     ll_times = jit_hooks.stats_get_loop_run_times(None)
     w_times = space.newdict()
+    w_guard_failures = space.newdict()
     if ll_times:
         for i in range(len(ll_times)):
+            if ll_times[i].type == 'g':
+                if ll_times[i].counter > 0:
+                    space.setitem(w_guard_failures,
+                                  space.newint(ll_times[i].number),
+                                  space.newint(ll_times[i].counter))
+                continue
             w_key = space.newtuple([space.newtext(ll_times[i].type),
                                     space.newint(ll_times[i].number)])
             space.setitem(w_times, w_key,
@@ -388,7 +408,8 @@ def get_stats_snapshot(space):
     space.setitem_str(w_counter_times, 'TRACING', space.newfloat(tr_time))
     b_time = jit_hooks.stats_get_times_value(None, Counters.BACKEND)
     space.setitem_str(w_counter_times, 'BACKEND', space.newfloat(b_time))
-    return W_JitInfoSnapshot(space, w_times, w_counters, w_counter_times)
+    return W_JitInfoSnapshot(space, w_times, w_counters, w_counter_times,
+                             w_guard_failures)
 
 def get_stats_asmmemmgr(space):
     """Returns the raw memory currently used by the JIT backend,
@@ -403,6 +424,19 @@ def enable_debug(space):
     """
     jit_hooks.stats_set_debug(None, True)
 
+def enable_guard_counters(space):
+    """ Count the failures of the guards in the loops and bridges compiled
+    from now on, for get_stats_snapshot().guard_failures.  Unlike the full
+    jit debugging, this does not count loop entries; the only cost is one
+    increment when a guard fails.
+    """
+    jit_hooks.stats_set_guard_counters(None, True)
+
+def disable_guard_counters(space):
+    """ Stop counting the failures of the guards compiled from now on.
+    """
+    jit_hooks.stats_set_guard_counters(None, False)
+
 def disable_debug(space):
     """ Disable the jit debugging. This means some very small loops will be
     marginally faster and the counters will stop working.
@@ -200,6 +200,23 @@ class AppTestJitHook(object):
         op = loop.operations[2]
         assert op.name == 'guard_nonnull'
 
+    def test_get_guard_failures(self):
+        import pypyjit
+        loops = []
+        pypyjit.set_compile_hook(loops.append)
+        self.on_compile()
+        loop = loops[0]
+        guard_nonnull = loop.operations[2]
+        guard_true = loop.operations[3]
+        assert isinstance(guard_true, pypyjit.GuardOp)
+        assert guard_nonnull.descr_number != guard_true.descr_number
+
+        class FakeSnapshot(object):
+            guard_failures = {guard_true.descr_number: 42}
+
+        res = pypyjit.get_guard_failures(loop, FakeSnapshot())
+        assert res == [(guard_true, (self.f.func_code, 0, False), 42)]
+
     def test_non_reentrant(self):
         import pypyjit
         l = []
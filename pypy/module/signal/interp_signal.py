@@ -39,6 +39,10 @@ class SignalActionFlag(AbstractActionFlag):
         p = pypysig_getaddr_occurred()
         p.c_value = -1
 
+    def get_ticker_address(self):
+        # 'c_value' is the first and only field of the structure
+        return rffi.cast(rffi.LONGP, pypysig_getaddr_occurred())
+
     def decrement_ticker(self, by):
         p = pypysig_getaddr_occurred()
         value = p.c_value
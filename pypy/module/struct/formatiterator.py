@@ -1,6 +1,7 @@
 from rpython.rlib.rarithmetic import (r_uint, r_ulonglong, r_longlong,
                                       maxint, intmask)
 from rpython.rlib import jit
+from rpython.rlib.buffer import SubBuffer
 from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rstruct.error import StructError
 from rpython.rlib.rstruct.formatiterator import FormatIterator
@@ -199,3 +200,113 @@ class UnpackFormatIterator(FormatIterator):
 
     def skip(self, size):
         self.read(size) # XXX, could avoid taking the slice
+
+
+COLUMN_EMPTY = 0
+COLUMN_INT = 1
+COLUMN_FLOAT = 2
+COLUMN_OBJ = 3
+
+class UnpackColumn(object):
+    """The values of one field across all the records.  Stays unboxed as
+    long as all the values are machine-sized ints, or all are floats."""
+
+    def __init__(self):
+        self.kind = COLUMN_EMPTY
+        self.ints = []
+        self.floats = []
+        self.items_w = []
+
+    def append_int(self, space, value):
+        if self.kind == COLUMN_EMPTY:
+            self.kind = COLUMN_INT
+        if self.kind == COLUMN_INT:
+            self.ints.append(value)
+        else:
+            self.append_w(space, space.newint(value))
+
+    def append_float(self, space, value):
+        if self.kind == COLUMN_EMPTY:
+            self.kind = COLUMN_FLOAT
+        if self.kind == COLUMN_FLOAT:
+            self.floats.append(value)
+        else:
+            self.append_w(space, space.newfloat(value))
+
+    def append_w(self, space, w_value):
+        if self.kind == COLUMN_INT:
+            self.items_w = [space.newint(x) for x in self.ints]
+            self.ints = []
+        elif self.kind == COLUMN_FLOAT:
+            self.items_w = [space.newfloat(x) for x in self.floats]
+            self.floats = []
+        self.kind = COLUMN_OBJ
+        self.items_w.append(w_value)
+
+    def wrap(self, space):
+        if self.kind == COLUMN_INT:
+            return space.newlist_int(self.ints)
+        elif self.kind == COLUMN_FLOAT:
+            return space.newlist_float(self.floats)
+        return space.newlist(self.items_w)
+
+
+class ColumnUnpackFormatIterator(UnpackFormatIterator):
+    """Unpacks all the records of a buffer, and stores each field into
+    its own UnpackColumn instead of building a tuple per record."""
+
+    def __init__(self, space, buf):
+        UnpackFormatIterator.__init__(self, space, buf)
+        self.records = buf
+        self.columns = []
+        self.colindex = 0
+
+    def unpack_records(self, plan):
+        records = self.records
+        size = plan.size
+        count = records.getlength() // size
+        for i in range(count):
+            self.buf = SubBuffer(records, i * size, size)
+            self.length = size
+            self.pos = 0
+            self.colindex = 0
+            self.interpret_plan(plan)
+
+    def build_columns_w(self):
+        return [column.wrap(self.space) for column in self.columns]
+
+    def _next_column(self):
+        index = self.colindex
+        self.colindex = index + 1
+        if index == len(self.columns):
+            self.columns.append(UnpackColumn())
+        return self.columns[index]
+
+    @specialize.argtype(1)
+    def appendobj(self, value):
+        space = self.space
+        column = self._next_column()
+        is_unsigned = (isinstance(value, r_uint) or
+                       isinstance(value, r_ulonglong))
+        if is_unsigned:
+            if value <= maxint:
+                column.append_int(space, intmask(value))
+            else:
+                column.append_w(space, space.newint(value))
+        elif isinstance(value, r_longlong):
+            if value == r_longlong(intmask(value)):
+                column.append_int(space, intmask(value))
+            else:
+                column.append_w(space, space.newint(value))
+        elif isinstance(value, bool):
+            column.append_w(space, space.newbool(value))
+        elif isinstance(value, int):
+            column.append_int(space, value)
+        elif isinstance(value, float):
+            column.append_float(space, value)
+        elif isinstance(value, str):
+            column.append_w(space, space.newbytes(value))
+        elif isinstance(value, unicode):
+            column.append_w(space, space.newunicode(value))
+        else:
+            assert 0, "unreachable"
@@ -2,7 +2,7 @@ from rpython.rlib import jit
 from rpython.rlib.buffer import SubBuffer
 from rpython.rlib.mutbuffer import MutableStringBuffer
 from rpython.rlib.rstruct.error import StructError, StructOverflowError
-from rpython.rlib.rstruct.formatiterator import CalcSizeFormatIterator
+from rpython.rlib.rstruct.formatiterator import compile_format
 
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.gateway import interp2app, unwrap_spec
@@ -10,62 +10,84 @@ from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.typedef import TypeDef, interp_attrproperty
 from pypy.interpreter.typedef import make_weakref_descr
 from pypy.module.struct.formatiterator import (
-    PackFormatIterator, UnpackFormatIterator
+    PackFormatIterator, UnpackFormatIterator, ColumnUnpackFormatIterator
 )
 
 
+# like CPython, forget all the compiled formats when there are too many
+MAXCACHE = 100
+
 class Cache:
     def __init__(self, space):
         self.error = space.new_exception_class("struct.error", space.w_Exception)
+        self.plans = {}
 
 
 def get_error(space):
     return space.fromcache(Cache).error
 
 
-def _calcsize(space, format):
-    fmtiter = CalcSizeFormatIterator()
+def _compile(space, format):
     try:
-        fmtiter.interpret(format)
+        return compile_format(format)
     except StructOverflowError as e:
         raise OperationError(space.w_OverflowError, space.newtext(e.msg))
     except StructError as e:
         raise OperationError(get_error(space), space.newtext(e.msg))
-    return fmtiter.totalsize
+
+
+@jit.elidable
+def get_plan(space, format):
+    """Return the FormatPlan for 'format', shared by the module-level
+    functions and all the Struct objects with the same format."""
+    plans = space.fromcache(Cache).plans
+    try:
+        return plans[format]
+    except KeyError:
+        pass
+    plan = _compile(space, format)
+    if len(plans) >= MAXCACHE:
+        plans.clear()
+    plans[format] = plan
+    return plan
 
 
 @unwrap_spec(format='text')
 def calcsize(space, format):
     """Return size of C struct described by format string fmt."""
-    return space.newint(_calcsize(space, format))
+    return space.newint(get_plan(space, format).size)
 
 
-def _pack(space, format, args_w):
-    """Return string containing values v1, v2, ... packed according to fmt."""
-    size = _calcsize(space, format)
-    wbuf = MutableStringBuffer(size)
+def _pack_plan(space, plan, wbuf, args_w):
     fmtiter = PackFormatIterator(space, wbuf, args_w)
     try:
-        fmtiter.interpret(format)
+        fmtiter.interpret_plan(plan)
     except StructOverflowError as e:
         raise OperationError(space.w_OverflowError, space.newtext(e.msg))
     except StructError as e:
         raise OperationError(get_error(space), space.newtext(e.msg))
     assert fmtiter.pos == wbuf.getlength(), 'missing .advance() or wrong calcsize()'
-    return wbuf.finish()
 
 
-@unwrap_spec(format='text')
-def pack(space, format, args_w):
-    return space.newbytes(_pack(space, format, args_w))
+def _unpack_plan(space, plan, buf):
+    fmtiter = UnpackFormatIterator(space, buf)
+    try:
+        fmtiter.interpret_plan(plan)
+    except StructOverflowError as e:
+        raise OperationError(space.w_OverflowError, space.newtext(e.msg))
+    except StructError as e:
+        raise OperationError(get_error(space), space.newtext(e.msg))
+    return space.newtuple(fmtiter.result_w[:])
 
 
-@unwrap_spec(format='text', offset=int)
-def pack_into(space, format, w_buffer, offset, args_w):
-    """ Pack the values v1, v2, ... according to fmt.
-Write the packed bytes into the writable buffer buf starting at offset
-    """
-    size = _calcsize(space, format)
+def _pack(space, plan, args_w):
+    wbuf = MutableStringBuffer(plan.size)
+    _pack_plan(space, plan, wbuf, args_w)
+    return space.newbytes(wbuf.finish())
+
+
+def _pack_into(space, plan, w_buffer, offset, args_w):
+    size = plan.size
     buf = space.getarg_w('w*', w_buffer)
     if offset < 0:
         offset += buf.getlength()
@@ -73,39 +95,16 @@ Write the packed bytes into the writable buffer buf starting at offset
         raise oefmt(get_error(space),
                     "pack_into requires a buffer of at least %d bytes",
                     size)
-    #
-    wbuf = SubBuffer(buf, offset, size)
-    fmtiter = PackFormatIterator(space, wbuf, args_w)
-    try:
-        fmtiter.interpret(format)
-    except StructOverflowError as e:
-        raise OperationError(space.w_OverflowError, space.newtext(e.msg))
-    except StructError as e:
-        raise OperationError(get_error(space), space.newtext(e.msg))
-
-
-def _unpack(space, format, buf):
-    fmtiter = UnpackFormatIterator(space, buf)
-    try:
-        fmtiter.interpret(format)
-    except StructOverflowError as e:
-        raise OperationError(space.w_OverflowError, space.newtext(e.msg))
-    except StructError as e:
-        raise OperationError(get_error(space), space.newtext(e.msg))
-    return space.newtuple(fmtiter.result_w[:])
+    _pack_plan(space, plan, SubBuffer(buf, offset, size), args_w)
 
 
-@unwrap_spec(format='text')
-def unpack(space, format, w_str):
+def _unpack(space, plan, w_str):
     buf = space.getarg_w('s*', w_str)
-    return _unpack(space, format, buf)
+    return _unpack_plan(space, plan, buf)
 
 
-@unwrap_spec(format='text', offset=int)
-def unpack_from(space, format, w_buffer, offset=0):
-    """Unpack the buffer, containing packed C structure data, according to
-fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
-    size = _calcsize(space, format)
+def _unpack_from(space, plan, w_buffer, offset):
+    size = plan.size
     buf = space.getarg_w('z*', w_buffer)
     if buf is None:
         raise oefmt(get_error(space), "unpack_from requires a buffer argument")
@@ -115,37 +114,122 @@ fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
         raise oefmt(get_error(space),
                     "unpack_from requires a buffer of at least %d bytes",
                     size)
-    buf = SubBuffer(buf, offset, size)
-    return _unpack(space, format, buf)
+    return _unpack_plan(space, plan, SubBuffer(buf, offset, size))
+
+
+@unwrap_spec(format='text')
+def pack(space, format, args_w):
+    """Return string containing values v1, v2, ... packed according to fmt."""
+    return _pack(space, get_plan(space, format), args_w)
+
+
+@unwrap_spec(format='text', offset=int)
+def pack_into(space, format, w_buffer, offset, args_w):
+    """ Pack the values v1, v2, ... according to fmt.
+Write the packed bytes into the writable buffer buf starting at offset
+    """
+    _pack_into(space, get_plan(space, format), w_buffer, offset, args_w)
+
+
+@unwrap_spec(format='text')
+def unpack(space, format, w_str):
+    return _unpack(space, get_plan(space, format), w_str)
+
+
+@unwrap_spec(format='text', offset=int)
+def unpack_from(space, format, w_buffer, offset=0):
+    """Unpack the buffer, containing packed C structure data, according to
+fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
+    return _unpack_from(space, get_plan(space, format), w_buffer, offset)
+
+
+def _check_iter_buffer(space, size, buf):
+    if size == 0:
+        raise oefmt(get_error(space),
+                    "cannot iteratively unpack with a struct of length 0")
+    if buf.getlength() % size != 0:
+        raise oefmt(get_error(space),
+                    "iterative unpacking requires a buffer of a multiple "
+                    "of %d bytes", size)
+
+
+@unwrap_spec(format='text')
+def iter_unpack(space, format, w_buffer):
+    """Return an iterator yielding tuples unpacked from the buffer, like
+repeated calls to unpack_from().  Requires that the buffer size is a
+multiple of calcsize(fmt)."""
+    w_struct = W_Struct(space, format)
+    return w_struct.descr_iter_unpack(space, w_buffer)
 
 
 class W_Struct(W_Root):
-    _immutable_fields_ = ["format", "size"]
+    _immutable_fields_ = ["format", "size", "plan"]
 
     format = ""
     size = -1
+    plan = None
+
+    def __init__(self, space, format):
+        self._init(space, format)
+
+    def _init(self, space, format):
+        self.format = format
+        self.plan = get_plan(space, format)
+        self.size = self.plan.size
 
     def descr__new__(space, w_subtype, __args__):
         return space.allocate_instance(W_Struct, w_subtype)
 
     @unwrap_spec(format='text')
     def descr__init__(self, space, format):
-        self.format = format
-        self.size = _calcsize(space, format)
+        self._init(space, format)
+
+    def _get_plan(self, space):
+        plan = jit.promote(self.plan)
+        if plan is None:
+            raise oefmt(get_error(space), "Struct.__init__() was not called")
+        return plan
 
     def descr_pack(self, space, args_w):
-        return pack(space, jit.promote_string(self.format), args_w)
+        return _pack(space, self._get_plan(space), args_w)
 
     @unwrap_spec(offset=int)
     def descr_pack_into(self, space, w_buffer, offset, args_w):
-        return pack_into(space, jit.promote_string(self.format), w_buffer, offset, args_w)
+        _pack_into(space, self._get_plan(space), w_buffer, offset, args_w)
 
     def descr_unpack(self, space, w_str):
-        return unpack(space, jit.promote_string(self.format), w_str)
+        return _unpack(space, self._get_plan(space), w_str)
 
     @unwrap_spec(offset=int)
     def descr_unpack_from(self, space, w_buffer, offset=0):
-        return unpack_from(space, jit.promote_string(self.format), w_buffer, offset)
+        return _unpack_from(space, self._get_plan(space), w_buffer, offset)
+
+    def descr_iter_unpack(self, space, w_buffer):
+        """Return an iterator yielding tuples unpacked from the buffer, like
+repeated calls to unpack_from().  Requires that the buffer size is a
+multiple of the struct size."""
+        plan = self._get_plan(space)
+        buf = space.getarg_w('s*', w_buffer)
+        _check_iter_buffer(space, plan.size, buf)
+        return W_UnpackIter(plan, buf)
+
+    def descr_unpack_columns(self, space, w_buffer):
+        """Unpack all the records of the buffer at once, and return a tuple
+with one list per field of the format: the first list contains the first
+field of every record, and so on.  Integer and float fields give lists
+of unboxed values, without creating a tuple per record.  Requires that
+the buffer size is a multiple of the struct size."""
+        plan = self._get_plan(space)
+        buf = space.getarg_w('s*', w_buffer)
+        _check_iter_buffer(space, plan.size, buf)
+        fmtiter = ColumnUnpackFormatIterator(space, buf)
+        try:
+            fmtiter.unpack_records(plan)
+        except StructOverflowError as e:
+            raise OperationError(space.w_OverflowError, space.newtext(e.msg))
+        except StructError as e:
+            raise OperationError(get_error(space), space.newtext(e.msg))
+        return space.newtuple(fmtiter.build_columns_w())
 
 W_Struct.typedef = TypeDef("Struct",
     __new__=interp2app(W_Struct.descr__new__.im_func),
@@ -157,8 +241,46 @@ W_Struct.typedef = TypeDef("Struct",
     unpack=interp2app(W_Struct.descr_unpack),
     pack_into=interp2app(W_Struct.descr_pack_into),
     unpack_from=interp2app(W_Struct.descr_unpack_from),
+    iter_unpack=interp2app(W_Struct.descr_iter_unpack),
+    unpack_columns=interp2app(W_Struct.descr_unpack_columns),
     __weakref__=make_weakref_descr(W_Struct),
 )
 
+
+class W_UnpackIter(W_Root):
+    def __init__(self, plan, buf):
+        self.plan = plan
+        self.buf = buf
+        self.index = 0
+
+    def descr_iter(self, space):
+        return self
+
+    def descr_next(self, space):
+        buf = self.buf
+        if buf is None:
+            raise OperationError(space.w_StopIteration, space.w_None)
+        size = self.plan.size
+        if self.index + size > buf.getlength():
+            self.buf = None
+            raise OperationError(space.w_StopIteration, space.w_None)
+        w_res = _unpack_plan(space, self.plan, SubBuffer(buf, self.index, size))
+        self.index += size
+        return w_res
+
+    def descr_length_hint(self, space):
+        if self.buf is None:
+            return space.newint(0)
+        length = (self.buf.getlength() - self.index) // self.plan.size
+        return space.newint(length)
+
+W_UnpackIter.typedef = TypeDef("unpack_iterator",
+    __iter__=interp2app(W_UnpackIter.descr_iter),
+    next=interp2app(W_UnpackIter.descr_next),
+    __length_hint__=interp2app(W_UnpackIter.descr_length_hint),
+)
+W_UnpackIter.typedef.acceptable_as_base_class = False
+
 def clearcache(space):
-    """No-op on PyPy"""
+    """Clear the internal cache of compiled formats."""
+    space.fromcache(Cache).plans.clear()
@@ -5,6 +5,15 @@ Tests for the struct module implemented at interp-level in pypy/module/struct.
 from rpython.rlib.rstruct.nativefmttable import native_is_bigendian
 
 
+def test_plan_cache(space):
+    from pypy.module.struct import interp_struct
+    plan = interp_struct.get_plan(space, '<ih')
+    assert interp_struct.get_plan(space, '<ih') is plan
+    assert interp_struct.W_Struct(space, '<ih').plan is plan
+    interp_struct.clearcache(space)
+    assert interp_struct.get_plan(space, '<ih') is not plan
+
+
 class AppTestStruct(object):
     spaceconfig = dict(usemodules=['struct', 'array'])
 
@@ -462,6 +471,48 @@ class AppTestStruct(object):
         assert val == sys.maxint+1
         assert type(val) is long
 
+    def test_iter_unpack(self):
+        s = self.struct.Struct('<hc')
+        data = s.pack(1, 'a') + s.pack(-2, 'b') + s.pack(3, 'c')
+        it = s.iter_unpack(data)
+        assert it.__length_hint__() == 3
+        assert next(it) == (1, 'a')
+        assert it.__length_hint__() == 2
+        assert list(it) == [(-2, 'b'), (3, 'c')]
+        raises(StopIteration, next, it)
+        assert list(self.struct.iter_unpack('<hc', bytearray(data))) == [
+            (1, 'a'), (-2, 'b'), (3, 'c')]
+        assert list(s.iter_unpack('')) == []
+        raises(self.struct.error, s.iter_unpack, data[:-1])
+        raises(self.struct.error, self.struct.iter_unpack, '', 'abc')
+
+    def test_unpack_columns(self):
+        import sys
+        s = self.struct.Struct('<id2s')
+        data = s.pack(1, 1.5, 'ab') + s.pack(-2, 2.5, 'cd')
+        ints, floats, strs = s.unpack_columns(data)
+        assert ints == [1, -2]
+        assert floats == [1.5, 2.5]
+        assert strs == ['ab', 'cd']
+        assert s.unpack_columns('') == ()
+        raises(self.struct.error, s.unpack_columns, data[:-1])
+        #
+        s = self.struct.Struct('@ic')
+        data = s.pack(5, 'x') + s.pack(6, 'y')
+        assert s.unpack_columns(data) == ([5, 6], ['x', 'y'])
+        #
+        s = self.struct.Struct('<2Qx')
+        data = s.pack(1, sys.maxint + 1) + s.pack(2, 3)
+        col0, col1 = s.unpack_columns(data)
+        assert col0 == [1, 2]
+        assert col1 == [sys.maxint + 1, 3]
+
+    def test_clearcache(self):
+        assert self.struct.pack('<h', 5) == '\x05\x00'
+        self.struct._clearcache()
+        assert self.struct.unpack('<h', '\x05\x00') == (5,)
+        assert self.struct.Struct('<h').unpack_from('\x00\x05\x00', 1) == (5,)
+
 class AppTestStructBuffer(object):
     spaceconfig = dict(usemodules=['struct', '__pypy__'])
 
@@ -8,7 +8,7 @@ import stat
 import sys
 
 from rpython.rlib import rpath, rdynload
-from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.objectmodel import we_are_translated, not_rpython
 from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.translator.tool.cbuild import ExternalCompilationInfo
 
@@ -174,9 +174,66 @@ def pypy_find_stdlib(space, executable):
     w_prefix = space.newtext(prefix)
     space.setitem(space.sys.w_dict, space.newtext('prefix'), w_prefix)
     space.setitem(space.sys.w_dict, space.newtext('exec_prefix'), w_prefix)
+    relocate_prebuilt_modules(space, prefix)
     return space.newlist([space.newtext(p) for p in path])
 
 
+@not_rpython
+def prebuild_modules(space, names):
+    """Import the given modules of lib_pypy and lib-python at translation
+    time, together with the modules they import.  They end up in the
+    prebuilt heap of the executable, and in sys.modules at startup.
+    Only for modules whose import does not depend on the environment
+    (os.environ, the current directory, sys.argv...).
+    """
+    state = get_state(space)
+    w_modules = space.sys.get('modules')
+    before = space.unwrap(space.call_method(w_modules, 'keys'))
+    space.appexec([space.newlist([space.newtext(name) for name in names])],
+    """(names):
+        import sys
+        saved = sys.dont_write_bytecode
+        sys.dont_write_bytecode = True
+        try:
+            for name in names:
+                __import__(name)
+        finally:
+            sys.dont_write_bytecode = saved
+    """)
+    for name in space.unwrap(space.call_method(w_modules, 'keys')):
+        if name in before or name in space.builtin_modules:
+            continue
+        w_mod = space.getitem(w_modules, space.newtext(name))
+        if not space.is_w(w_mod, space.w_None):
+            state.prebuilt_modules_w.append(w_mod)
+
+def relocate_prebuilt_modules(space, prefix):
+    # the __file__ and __path__ of the prebuilt modules point inside the
+    # source tree used for the translation; make them point to 'prefix'
+    state = get_state(space)
+    srcdir = space.text_w(state.w_initial_prefix)
+    if prefix == srcdir:
+        return
+    for w_mod in state.prebuilt_modules_w:
+        w_dict = space.getattr(w_mod, space.newtext('__dict__'))
+        w_file = space.finditem_str(w_dict, '__file__')
+        if w_file is not None:
+            space.setitem_str(w_dict, '__file__',
+                              _relocate(space, w_file, srcdir, prefix))
+        w_path = space.finditem_str(w_dict, '__path__')
+        if w_path is not None:
+            space.setitem_str(w_dict, '__path__', space.newlist(
+                [_relocate(space, w_item, srcdir, prefix)
+                 for w_item in space.listview(w_path)]))
+
+def _relocate(space, w_filename, srcdir, prefix):
+    if space.isinstance_w(w_filename, space.w_bytes):
+        filename = space.bytes_w(w_filename)
+        if filename.startswith(srcdir + os.sep):
+            return space.newtext(prefix + filename[len(srcdir):])
+    return w_filename
+
+
 # ____________________________________________________________
 
 
@@ -14,6 +14,8 @@ class State:
         self.w_modules = space.newdict(module=True)
         self.w_warnoptions = space.newlist([])
         self.w_argv = space.newlist([])
+        # the modules imported at translation time (--prebuilt-modules)
+        self.prebuilt_modules_w = []
 
         self.setinitialpath(space)
 
@@ -114,3 +114,27 @@ def test_resolvedirof(tmpdir):
         myfile2 = bar.join('myfile')
         myfile2.mksymlinkto(myfile)
         assert resolvedirof(str(myfile2)) == foo
+
+def test_prebuild_modules(space):
+    from pypy.module.sys.initpath import (prebuild_modules,
+                                          relocate_prebuilt_modules)
+    from pypy.module.sys.state import get as get_state
+    state = get_state(space)
+    w_modules = space.sys.get('modules')
+    w_keyword = space.newtext('keyword')
+    if space.finditem(w_modules, w_keyword) is not None:
+        space.delitem(w_modules, w_keyword)
+    prebuild_modules(space, ['keyword'])
+    try:
+        [w_mod] = state.prebuilt_modules_w
+        assert space.is_w(space.getitem(w_modules, w_keyword), w_mod)
+        srcdir = space.text_w(state.w_initial_prefix)
+        w_file = space.getattr(w_mod, space.newtext('__file__'))
+        assert space.text_w(w_file).startswith(srcdir + os.sep)
+        relocate_prebuilt_modules(space, '/somewhere/else')
+        w_file = space.getattr(w_mod, space.newtext('__file__'))
+        assert space.text_w(w_file).startswith(
+            '/somewhere/else' + os.sep + 'lib-python' + os.sep)
+    finally:
+        del state.prebuilt_modules_w[:]
+        space.delitem(w_modules, w_keyword)
@@ -518,6 +518,20 @@ class TestFunctions(BaseCTypesTestChecker):
         assert tf_b(-126) == -42
         assert tf_b._ptr is ptr
 
+    def test_direct_args(self):
+        f = dll._testfunc_i_bhilfd
+        f.argtypes = [c_byte, c_short, c_int, c_long, c_float, c_double]
+        f.restype = c_int
+        assert f(1, 2, 3, 4L, 5.0, 6.0) == 21
+        assert f._direct_types == [(int, long)] * 4 + [(float,)] * 2
+        # arguments that are not of the direct types still work
+        assert f(c_byte(1), 2, 3, 4, 5, c_double(6.0)) == 21
+        with pytest.raises(ArgumentError):
+            f(1, 2, 3, 4, "5", 6.0)
+        f.argtypes = [c_byte, c_short, c_int, c_long, c_float, c_double]
+        assert f._direct_types is None
+        assert f(1, 2, 3, 4, 5.0, 6.0) == 21
+
     def test_custom_from_param(self):
         class A(c_byte):
             @classmethod
@@ -532,6 +546,22 @@ class TestFunctions(BaseCTypesTestChecker):
         assert tf_b("yadda") == -42
         assert seen == ["yadda"]
 
+    def test_inherited_custom_from_param(self):
+        class A(c_byte):
+            @classmethod
+            def from_param(cls, obj):
+                seen.append(obj)
+                return -126
+        class B(A):
+            pass
+        tf_b = dll.tf_b
+        tf_b.restype = c_byte
+        tf_b.argtypes = [B]
+        seen = []
+        assert tf_b(5) == -42
+        assert seen == [5]
+        assert tf_b._direct_types == [None]
+
     @pytest.mark.xfail(reason="warnings are disabled")
     def test_warnings(self):
         import warnings
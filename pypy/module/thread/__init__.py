@@ -18,6 +18,9 @@ class Module(MixedModule):
         'allocate_lock':          'os_lock.allocate_lock',
         'allocate':               'os_lock.allocate_lock',  # obsolete synonym
         'LockType':               'os_lock.Lock',
+        'RLock':                  'os_lock.W_RLock',
+        'Condition':              'os_lock.W_Condition',
+        'Queue':                  'os_queue.W_Queue',
         '_local':                 'os_local.Local',
         'error':                  'space.fromcache(error.Cache).w_error',
     }
@@ -28,6 +28,7 @@ class GILThreadLocals(OSThreadLocals):
             # Note: this is a quasi-immutable read by module/pypyjit/interp_jit
             # It must be changed (to True) only if it was really False before
             rgil.allocate()
+            rgil.set_ticker(space.actionflag.get_ticker_address())
             self.gil_ready = True
             result = True
         else:
@@ -37,6 +38,15 @@ class GILThreadLocals(OSThreadLocals):
     def threads_initialized(self):
         return self.gil_ready
 
+    def setswitchinterval(self, microseconds):
+        rgil.set_switch_interval(microseconds)
+
+    def getswitchinterval(self):
+        return rgil.get_switch_interval()
+
+    def getgilwaitstats(self):
+        return rgil.get_wait_stats()
+
     ## def reinit_threads(self, space):
     ##     "Called in the child process after a fork()"
     ##     OSThreadLocals.reinit_threads(self, space)
@@ -44,7 +54,9 @@ class GILThreadLocals(OSThreadLocals):
 
 class GILReleaseAction(PeriodicAsyncAction):
     """An action called every sys.checkinterval bytecodes.  It releases
-    the GIL to give some other thread a chance to run.
+    the GIL to give some other thread a chance to run.  It is also called
+    soon after another thread waited for the GIL for longer than the
+    switch interval: see RPyGilSetTicker() in thread_gil.c.
     """
 
     def perform(self, executioncontext, frame):
@@ -8,8 +8,9 @@ from pypy.module.thread.error import wrap_thread_error
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.gateway import interp2app, unwrap_spec
 from pypy.interpreter.typedef import TypeDef, make_weakref_descr
-from pypy.interpreter.error import oefmt
-from rpython.rlib.rarithmetic import r_longlong, ovfcheck_float_to_longlong
+from pypy.interpreter.error import OperationError, oefmt
+from rpython.rlib.rarithmetic import (r_longlong, ovfcheck,
+    ovfcheck_float_to_longlong)
 
 
 RPY_LOCK_FAILURE, RPY_LOCK_ACQUIRED, RPY_LOCK_INTR = range(3)
@@ -54,6 +55,66 @@ def acquire_timed(space, lock, microseconds):
     return result
 
 
+def timeout_to_microseconds(space, w_timeout):
+    """Convert the 'timeout' argument of Condition.wait() and
+    Queue.get()/put() into microseconds for acquire_timed(): None
+    means blocking forever, and so does a timeout that is too large."""
+    if space.is_none(w_timeout):
+        return r_longlong(-1)
+    return seconds_to_microseconds(space.float_w(w_timeout))
+
+def seconds_to_microseconds(timeout):
+    if timeout <= 0.0:
+        return r_longlong(0)
+    try:
+        return ovfcheck_float_to_longlong(timeout * 1e6)
+    except OverflowError:
+        return r_longlong(-1)
+
+
+class WaiterList(object):
+    """The list of threads blocked waiting on a condition.  Each waiting
+    thread sleeps on its own locked lock, which is released to wake it
+    up.  Thanks to the GIL, the list itself doesn't need any locking."""
+
+    def __init__(self):
+        self.waiters = []
+
+    def wait(self, space, microseconds, release_save=None):
+        """Sleep until notified or until the timeout expires.  Returns
+        True if notified.  If given, 'release_save' is a W_Condition whose
+        lock is released while sleeping and re-acquired afterwards."""
+        try:
+            waiter = rthread.allocate_lock()
+        except rthread.error:
+            raise wrap_thread_error(space, "out of resources")
+        waiter.acquire(True)
+        self.waiters.append(waiter)
+        saved = (0, 0)
+        if release_save is not None:
+            saved = release_save.release_save(space)
+        try:
+            result = acquire_timed(space, waiter, microseconds)
+        finally:
+            if release_save is not None:
+                release_save.acquire_restore(space, saved)
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+        return result == RPY_LOCK_ACQUIRED
+
+    def notify(self, n):
+        while n > 0 and len(self.waiters) > 0:
+            waiter = self.waiters.pop(0)
+            waiter.release()
+            n -= 1
+
+    def notify_all(self):
+        self.notify(len(self.waiters))
+
+    def count(self):
+        return len(self.waiters)
+
+
 class Lock(W_Root):
     "A box around an interp-level lock object."
 
@@ -162,3 +223,261 @@ def allocate_lock(space):
     """Create a new lock object.  (allocate() is an obsolete synonym.)
 See LockType.__doc__ for information about locks."""
     return Lock(space)
+
+
+class W_RLock(W_Root):
+    """A reentrant lock, owned by the thread that acquired it."""
+
+    def __init__(self, space):
+        self.space = space
+        try:
+            self.lock = rthread.allocate_lock()
+        except rthread.error:
+            raise wrap_thread_error(space, "out of resources")
+        self.rlock_owner = 0
+        self.rlock_count = 0
+
+    @staticmethod
+    def descr__new__(space, w_subtype, __args__):
+        self = space.allocate_instance(W_RLock, w_subtype)
+        W_RLock.__init__(self, space)
+        return self
+
+    def descr__init__(self, space):
+        # called again by threading._after_fork() to reset the lock
+        W_RLock.__init__(self, space)
+
+    def descr__repr__(self, space):
+        typename = space.type(self).getname(space)
+        return space.newtext("<%s owner=%d count=%d>" % (
+            typename, self.rlock_owner, self.rlock_count))
+
+    def acquire(self, space, microseconds):
+        tid = rthread.get_ident()
+        if self.rlock_count > 0 and tid == self.rlock_owner:
+            try:
+                self.rlock_count = ovfcheck(self.rlock_count + 1)
+            except OverflowError:
+                raise oefmt(space.w_OverflowError,
+                            "internal lock count overflowed")
+            return True
+        # this first acquire() is a fast path without timeout handling
+        if not self.lock.acquire(False):
+            if microseconds == 0:
+                return False
+            r = acquire_timed(space, self.lock, microseconds)
+            if r != RPY_LOCK_ACQUIRED:
+                return False
+        assert self.rlock_count == 0
+        self.rlock_owner = tid
+        self.rlock_count = 1
+        return True
+
+    @unwrap_spec(blocking=int)
+    def descr_acquire(self, space, blocking=1):
+        """Lock the lock.  If the calling thread already owns it, this
+only increments the recursion level.  With the default argument of True,
+this blocks until the lock is available and returns True.  With an
+argument of False, this never blocks and the return value tells if the
+lock was acquired."""
+        if blocking:
+            microseconds = -1
+        else:
+            microseconds = 0
+        return space.newbool(self.acquire(space, r_longlong(microseconds)))
+
+    def descr_release(self, space):
+        """Release the lock, decrementing the recursion level.  The lock
+must be owned by the calling thread."""
+        if self.rlock_count == 0 or self.rlock_owner != rthread.get_ident():
+            raise oefmt(space.w_RuntimeError,
+                        "cannot release un-acquired lock")
+        self.rlock_count -= 1
+        if self.rlock_count == 0:
+            self.rlock_owner = 0
+            self.lock.release()
+
+    def is_owned(self):
+        return (self.rlock_count > 0 and
+                self.rlock_owner == rthread.get_ident())
+
+    def descr__is_owned(self, space):
+        """For internal use by `threading.Condition`."""
+        return space.newbool(self.is_owned())
+
+    def release_save(self, space):
+        if self.rlock_count == 0:
+            raise oefmt(space.w_RuntimeError,
+                        "cannot release un-acquired lock")
+        count, owner = self.rlock_count, self.rlock_owner
+        self.rlock_count = 0
+        self.rlock_owner = 0
+        self.lock.release()
+        return count, owner
+
+    def acquire_restore(self, space, count, owner):
+        # not interruptible: the state must be restored no matter what
+        if not self.lock.acquire(False):
+            self.lock.acquire(True)
+        self.rlock_owner = owner
+        self.rlock_count = count
+
+    def descr__release_save(self, space):
+        """For internal use by `threading.Condition`."""
+        count, owner = self.release_save(space)
+        return space.newtuple([space.newint(count), space.newint(owner)])
+
+    def descr__acquire_restore(self, space, w_saved_state):
+        """For internal use by `threading.Condition`."""
+        w_count, w_owner = space.fixedview(w_saved_state, 2)
+        self.acquire_restore(space, space.int_w(w_count),
+                             space.int_w(w_owner))
+
+    def descr__enter__(self, space):
+        self.acquire(space, r_longlong(-1))
+        return self
+
+    def descr__exit__(self, space, __args__):
+        self.descr_release(space)
+
+W_RLock.typedef = TypeDef(
+    "thread.RLock",
+    __new__ = interp2app(W_RLock.descr__new__),
+    __init__ = interp2app(W_RLock.descr__init__),
+    __repr__ = interp2app(W_RLock.descr__repr__),
+    acquire = interp2app(W_RLock.descr_acquire),
+    release = interp2app(W_RLock.descr_release),
+    _is_owned = interp2app(W_RLock.descr__is_owned),
+    _release_save = interp2app(W_RLock.descr__release_save),
+    _acquire_restore = interp2app(W_RLock.descr__acquire_restore),
+    __enter__ = interp2app(W_RLock.descr__enter__),
+    __exit__ = interp2app(W_RLock.descr__exit__),
+    __weakref__ = make_weakref_descr(W_RLock),
+    )
+
+
+class W_Condition(W_Root):
+    """A condition variable, using as underlying lock either a
+    thread.LockType or a thread.RLock."""
+
+    def __init__(self, space, w_lock):
+        self.space = space
+        self.w_lock = w_lock
+        self.waiters = WaiterList()
+
+    @staticmethod
+    def descr__new__(space, w_subtype, __args__):
+        self = space.allocate_instance(W_Condition, w_subtype)
+        W_Condition.__init__(self, space, W_RLock(space))
+        return self
+
+    def descr__init__(self, space, w_lock=None):
+        # called again by threading._after_fork() to reset the condition
+        if space.is_none(w_lock):
+            w_lock = W_RLock(space)
+        elif not (isinstance(w_lock, Lock) or isinstance(w_lock, W_RLock)):
+            raise oefmt(space.w_TypeError,
+                        "Condition() lock must be a thread.LockType or "
+                        "a thread.RLock, not %T", w_lock)
+        W_Condition.__init__(self, space, w_lock)
+
+    def descr__repr__(self, space):
+        typename = space.type(self).getname(space)
+        return space.newtext("<%s(%s, %d)>" % (
+            typename, space.text_w(space.repr(self.w_lock)),
+            self.waiters.count()))
+
+    def is_owned(self):
+        w_lock = self.w_lock
+        if isinstance(w_lock, W_RLock):
+            return w_lock.is_owned()
+        assert isinstance(w_lock, Lock)
+        # like threading: a plain lock doesn't know its owner, so
+        # assume that we own it if it is locked
+        if w_lock.lock.acquire(False):
+            w_lock.lock.release()
+            return False
+        return True
+
+    def release_save(self, space):
+        w_lock = self.w_lock
+        if isinstance(w_lock, W_RLock):
+            return w_lock.release_save(space)
+        assert isinstance(w_lock, Lock)
+        w_lock.descr_lock_release(space)
+        return 0, 0
+
+    def acquire_restore(self, space, saved):
+        w_lock = self.w_lock
+        if isinstance(w_lock, W_RLock):
+            count, owner = saved
+            w_lock.acquire_restore(space, count, owner)
+        else:
+            assert isinstance(w_lock, Lock)
+            w_lock.lock.acquire(True)
+
+    def wait(self, space, microseconds):
+        if not self.is_owned():
+            raise oefmt(space.w_RuntimeError,
+                        "cannot wait on un-acquired lock")
+        return self.waiters.wait(space, microseconds, release_save=self)
+
+    def notify(self, space, n):
+        if not self.is_owned():
+            raise oefmt(space.w_RuntimeError,
+                        "cannot notify on un-acquired lock")
+        self.waiters.notify(n)
+
+    def descr_acquire(self, space, __args__):
+        """Acquire the underlying lock."""
+        return space.call_args(space.getattr(self.w_lock,
+                                             space.newtext("acquire")),
+                               __args__)
+
+    def descr_release(self, space):
+        """Release the underlying lock."""
+        return space.call_method(self.w_lock, "release")
+
+    def descr__enter__(self, space):
+        return space.call_method(self.w_lock, "__enter__")
+
+    def descr__exit__(self, space, __args__):
+        return space.call_args(space.getattr(self.w_lock,
+                                             space.newtext("__exit__")),
+                               __args__)
+
+    def descr__is_owned(self, space):
+        return space.newbool(self.is_owned())
+
+    def descr_wait(self, space, w_timeout=None):
+        """Wait until notified or until a timeout occurs.  The lock must
+be acquired by the calling thread; it is released while waiting, and
+acquired again before returning.  The optional timeout is in seconds."""
+        microseconds = timeout_to_microseconds(space, w_timeout)
+        self.wait(space, microseconds)
+
+    @unwrap_spec(n=int)
+    def descr_notify(self, space, n=1):
+        """Wake up at most n threads waiting on this condition."""
+        self.notify(space, n)
+
+    def descr_notify_all(self, space):
+        """Wake up all threads waiting on this condition."""
+        self.notify(space, self.waiters.count())
+
+W_Condition.typedef = TypeDef(
+    "thread.Condition",
+    __new__ = interp2app(W_Condition.descr__new__),
+    __init__ = interp2app(W_Condition.descr__init__),
+    __repr__ = interp2app(W_Condition.descr__repr__),
+    acquire = interp2app(W_Condition.descr_acquire),
+    release = interp2app(W_Condition.descr_release),
+    __enter__ = interp2app(W_Condition.descr__enter__),
+    __exit__ = interp2app(W_Condition.descr__exit__),
+    _is_owned = interp2app(W_Condition.descr__is_owned),
+    wait = interp2app(W_Condition.descr_wait),
+    notify = interp2app(W_Condition.descr_notify),
+    notify_all = interp2app(W_Condition.descr_notify_all),
+    notifyAll = interp2app(W_Condition.descr_notify_all),
+    __weakref__ = make_weakref_descr(W_Condition),
+    )
@@ -0,0 +1,210 @@
+"""
+A blocking FIFO queue, like Queue.Queue, implemented at interp-level.
+"""
+
+import time
+from rpython.rlib.rarithmetic import r_longlong
+from pypy.module.thread.os_lock import WaiterList, seconds_to_microseconds
+from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.typedef import (TypeDef, GetSetProperty,
+    make_weakref_descr)
+from pypy.interpreter.error import OperationError, oefmt
+
+
+class Cache:
+    def __init__(self, space):
+        self.w_empty = None
+        self.w_full = None
+
+def _get_queue_exceptions(space):
+    # the exceptions are the ones of the Queue module, which imports us;
+    # so we fetch them lazily, the first time they are needed
+    cache = space.fromcache(Cache)
+    if cache.w_empty is None:
+        w_empty, w_full = space.fixedview(space.appexec([], """():
+            from Queue import Empty, Full
+            return Empty, Full
+        """), 2)
+        cache.w_empty = w_empty
+        cache.w_full = w_full
+    return cache
+
+def raise_empty(space):
+    raise OperationError(_get_queue_exceptions(space).w_empty, space.w_None)
+
+def raise_full(space):
+    raise OperationError(_get_queue_exceptions(space).w_full, space.w_None)
+
+
+class W_Queue(W_Root):
+    """The items are stored in a circular buffer.  All the operations are
+    done while holding the GIL, so they don't need a lock of their own;
+    the GIL is only released while sleeping in one of the WaiterLists."""
+
+    def __init__(self, space, maxsize):
+        self.space = space
+        self.maxsize = maxsize
+        self.items_w = [None] * 8
+        self.head = 0
+        self.length = 0
+        self.unfinished_tasks = 0
+        self.not_empty = WaiterList()
+        self.not_full = WaiterList()
+        self.all_tasks_done = WaiterList()
+
+    @staticmethod
+    def descr__new__(space, w_subtype, __args__):
+        self = space.allocate_instance(W_Queue, w_subtype)
+        W_Queue.__init__(self, space, 0)
+        return self
+
+    @unwrap_spec(maxsize=int)
+    def descr__init__(self, space, maxsize=0):
+        W_Queue.__init__(self, space, maxsize)
+
+    def is_full(self):
+        return self.maxsize > 0 and self.length >= self.maxsize
+
+    def _append(self, w_item):
+        items_w = self.items_w
+        if self.length == len(items_w):
+            new_items_w = [None] * (2 * len(items_w))
+            for i in range(self.length):
+                new_items_w[i] = items_w[(self.head + i) % len(items_w)]
+            self.items_w = items_w = new_items_w
+            self.head = 0
+        items_w[(self.head + self.length) % len(items_w)] = w_item
+        self.length += 1
+
+    def _popleft(self):
+        items_w = self.items_w
+        w_item = items_w[self.head]
+        items_w[self.head] = None
+        self.head = (self.head + 1) % len(items_w)
+        self.length -= 1
+        return w_item
+
+    def _wait(self, space, waiters, block, endtime):
+        """Sleep until notified on 'waiters'.  Returns False if we should
+        give up: non-blocking call, or timeout expired."""
+        if not block:
+            return False
+        if endtime < 0.0:
+            microseconds = r_longlong(-1)
+        else:
+            remaining = endtime - time.time()
+            if remaining <= 0.0:
+                return False
+            microseconds = seconds_to_microseconds(remaining)
+        waiters.wait(space, microseconds)
+        return True
+
+    def _get_endtime(self, space, block, w_timeout):
+        if not block or space.is_none(w_timeout):
+            return -1.0
+        timeout = space.float_w(w_timeout)
+        if timeout < 0.0:
+            raise oefmt(space.w_ValueError,
+                        "'timeout' must be a non-negative number")
+        return time.time() + timeout
+
+    def put(self, space, w_item, block, w_timeout):
+        endtime = self._get_endtime(space, block, w_timeout)
+        while self.is_full():
+            if not self._wait(space, self.not_full, block, endtime):
+                raise_full(space)
+        self._append(w_item)
+        self.unfinished_tasks += 1
+        self.not_empty.notify(1)
+
+    def get(self, space, block, w_timeout):
+        endtime = self._get_endtime(space, block, w_timeout)
+        while self.length == 0:
+            if not self._wait(space, self.not_empty, block, endtime):
+                raise_empty(space)
+        w_item = self._popleft()
+        self.not_full.notify(1)
+        return w_item
+
+    @unwrap_spec(block=bool)
+    def descr_put(self, space, w_item, block=True, w_timeout=None):
+        """Put an item into the queue.  If 'block' is true, wait if
+necessary until a free slot is available, at most 'timeout' seconds if
+given, and raise the Full exception if none became available.
+Otherwise, put the item if a free slot is immediately available, else
+raise the Full exception."""
+        self.put(space, w_item, block, w_timeout)
+
+    def descr_put_nowait(self, space, w_item):
+        """Put an item into the queue without blocking."""
+        self.put(space, w_item, False, space.w_None)
+
+    @unwrap_spec(block=bool)
+    def descr_get(self, space, block=True, w_timeout=None):
+        """Remove and return an item from the queue.  If 'block' is true,
+wait if necessary until an item is available, at most 'timeout' seconds
+if given, and raise the Empty exception if none became available.
+Otherwise, return an item if one is immediately available, else raise
+the Empty exception."""
+        return self.get(space, block, w_timeout)
+
+    def descr_get_nowait(self, space):
+        """Remove and return an item from the queue without blocking."""
+        return self.get(space, False, space.w_None)
+
+    def descr_qsize(self, space):
+        """Return the approximate size of the queue."""
+        return space.newint(self.length)
+
+    def descr_empty(self, space):
+        """Return True if the queue is empty, False otherwise."""
+        return space.newbool(self.length == 0)
+
+    def descr_full(self, space):
+        """Return True if the queue is full, False otherwise."""
+        return space.newbool(self.is_full())
+
+    def descr_task_done(self, space):
+        """Indicate that a formerly enqueued task is complete."""
+        if self.unfinished_tasks <= 0:
+            raise oefmt(space.w_ValueError,
+                        "task_done() called too many times")
+        self.unfinished_tasks -= 1
+        if self.unfinished_tasks == 0:
+            self.all_tasks_done.notify_all()
+
+    def descr_join(self, space):
+        """Block until all items in the queue have been gotten and
+processed, as reported by calls to task_done()."""
+        while self.unfinished_tasks > 0:
+            self.all_tasks_done.wait(space, r_longlong(-1))
+
+    def fget_maxsize(self, space):
+        return space.newint(self.maxsize)
+
+    def fget_unfinished_tasks(self, space):
+        return space.newint(self.unfinished_tasks)
+
+W_Queue.typedef = TypeDef(
+    "thread.Queue",
+    __doc__ = """Queue(maxsize=0)
+
+A FIFO queue.  If maxsize is <= 0, the queue size is infinite.
+This is like Queue.Queue, without its _put()/_get() hooks and
+its internal attributes.""",
+    __new__ = interp2app(W_Queue.descr__new__),
+    __init__ = interp2app(W_Queue.descr__init__),
+    put = interp2app(W_Queue.descr_put),
+    put_nowait = interp2app(W_Queue.descr_put_nowait),
+    get = interp2app(W_Queue.descr_get),
+    get_nowait = interp2app(W_Queue.descr_get_nowait),
+    qsize = interp2app(W_Queue.descr_qsize),
+    empty = interp2app(W_Queue.descr_empty),
+    full = interp2app(W_Queue.descr_full),
+    task_done = interp2app(W_Queue.descr_task_done),
+    join = interp2app(W_Queue.descr_join),
+    maxsize = GetSetProperty(W_Queue.fget_maxsize),
+    unfinished_tasks = GetSetProperty(W_Queue.fget_unfinished_tasks),
+    __weakref__ = make_weakref_descr(W_Queue),
+    )
@@ -1,7 +1,7 @@
 import time
 from pypy.module.thread import gil
 from rpython.rtyper.lltypesystem.lloperation import llop
-from rpython.rtyper.lltypesystem import lltype
+from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.rlib import rgil
 from rpython.rlib.test import test_rthread
 from rpython.rlib import rthread as thread
@@ -17,6 +17,8 @@ class FakeActionFlag(object):
         return 0
     def set(self, x):
         pass
+    def get_ticker_address(self):
+        return lltype.nullptr(rffi.LONGP.TO)
 
 class FakeSpace(object):
     def __init__(self):
@@ -111,6 +111,127 @@ class AppTestLock(GenericTestThread):
         stop = time.time()
         assert stop - start < 30.0    # ~0.6 sec on pypy-c-jit
 
+    def test_rlock(self):
+        import thread
+        lock = thread.RLock()
+        assert lock.acquire() is True
+        assert lock.acquire(False) is True
+        assert lock._is_owned()
+        assert 'count=2' in repr(lock)
+        lock.release()
+        lock.release()
+        assert not lock._is_owned()
+        raises(RuntimeError, lock.release)
+        with lock:
+            assert lock._is_owned()
+            saved = lock._release_save()
+            assert saved[0] == 1
+            assert not lock._is_owned()
+            lock._acquire_restore(saved)
+        assert not lock._is_owned()
+        #
+        lock.acquire()
+        result = []
+        def f():
+            result.append(lock.acquire(False))
+            lock.acquire()
+            result.append(True)
+            lock.release()
+        thread.start_new_thread(f, ())
+        self.busywait(0.1)
+        assert result == [False]
+        lock.release()
+        self.waitfor(lambda: len(result) == 2)
+        assert result == [False, True]
+
+    def test_condition(self):
+        import thread
+        cond = thread.Condition()
+        raises(RuntimeError, cond.wait)
+        raises(RuntimeError, cond.notify)
+        raises(TypeError, thread.Condition, 42)
+        with cond:
+            cond.wait(0.01)
+            cond.wait(0)
+            cond.notify()
+        #
+        cond = thread.Condition(thread.allocate_lock())
+        result = []
+        def f():
+            with cond:
+                result.append(1)
+                cond.wait()
+                result.append(3)
+        with cond:
+            thread.start_new_thread(f, ())
+            while not result:
+                cond.wait(0.01)
+            result.append(2)
+            cond.notify_all()
+        self.waitfor(lambda: len(result) == 3)
+        assert result == [1, 2, 3]
+
+    def test_queue(self):
+        import thread, Queue
+        q = thread.Queue(2)
+        assert q.maxsize == 2
+        assert q.empty() and not q.full()
+        q.put(1)
+        q.put_nowait(2)
+        assert q.full() and q.qsize() == 2
+        raises(Queue.Full, q.put, 3, False)
+        raises(Queue.Full, q.put, 3, True, 0.01)
+        raises(ValueError, q.put, 3, True, -1)
+        assert q.get() == 1
+        assert q.get_nowait() == 2
+        raises(Queue.Empty, q.get_nowait)
+        raises(Queue.Empty, q.get, True, 0.01)
+        q.task_done()
+        q.task_done()
+        raises(ValueError, q.task_done)
+        q.join()
+        #
+        q = thread.Queue()
+        for i in range(20):
+            q.put(i)
+        assert [q.get() for i in range(20)] == range(20)
+        #
+        result = []
+        def consumer():
+            while True:
+                item = q.get()
+                if item is None:
+                    break
+                result.append(item)
+                q.task_done()
+        thread.start_new_thread(consumer, ())
+        for i in range(10):
+            q.put(i)
+        q.put(None)
+        self.waitfor(lambda: len(result) == 10)
+        assert result == range(10)
+
+    def test_threading_uses_native(self):
+        import thread, threading, Queue
+        assert isinstance(threading.RLock(), thread.RLock)
+        assert isinstance(threading.RLock(), threading._RLock)
+        cond = threading.Condition()
+        assert isinstance(cond, thread.Condition)
+        assert isinstance(cond, threading._Condition)
+        with cond:
+            assert cond._is_owned()
+            assert not cond.wait(0.01)
+        cond = threading.Condition(threading.Lock())
+        assert isinstance(cond, thread.Condition)
+        cond = threading.Condition(threading.Semaphore())
+        assert not isinstance(cond, thread.Condition)
+        assert isinstance(cond, threading._Condition)
+        assert Queue.NativeQueue is thread.Queue
+        event = threading.Event()
+        assert not event.wait(0.01)
+        event.set()
+        assert event.wait(0.01)
+
 
 def test_compile_lock():
     from rpython.rlib import rgc
@@ -28,6 +28,8 @@ class Module(MixedModule):
         'strptime': 'app_time.strptime',
     }
 
+    deferred_startup = True
+
     def startup(self, space):
         if _WIN:
             from pypy.module.time.interp_time import State
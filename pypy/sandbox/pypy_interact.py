@@ -12,7 +12,8 @@ Options:
                   with the 'k', 'm' or 'g' suffix respectively.
     --timeout=N   limit execution time to N (real-time) seconds.
     --log=FILE    log all user input into the FILE.
-    --verbose     log all proxied system calls.
+    --verbose     log all proxied system calls, and print how many of
+                  them there were and the time spent on them at the end.
 
 Note that you can get readline-like behavior with a tool like 'ledit',
 provided you use enough -u options:
@@ -57,9 +58,9 @@ class PyPySandboxedProc(VirtualizedSandboxedProc, SimpleIOSandboxedProc):
             'bin': Dir({
                 'pypy-c': RealFile(self.executable, mode=0111),
                 'lib-python': RealDir(os.path.join(libroot, 'lib-python'),
-                                      exclude=exclude), 
+                                      exclude=exclude, cache_files=True),
                 'lib_pypy': RealDir(os.path.join(libroot, 'lib_pypy'),
-                                      exclude=exclude),
+                                      exclude=exclude, cache_files=True),
                 }),
              'tmp': tmpdirnode,
              })
@@ -124,6 +125,8 @@ def main():
         sandproc.interact()
     finally:
         sandproc.kill()
+        if debug:
+            print >> sys.stderr, sandproc.format_syscall_stats()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
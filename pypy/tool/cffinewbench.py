@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+"""
+Usage: cffinewbench.py [--n=N] [--arena=BYTES] /path/to/pypy-c
+
+Micro-benchmarks for ffi.new() of small short-lived objects, comparing
+the default allocator with an arena allocator (ffi.new_allocator(arena=...)).
+Prints the time in nanoseconds per allocation for each case.
+"""
+
+import subprocess
+import sys
+
+CASES = [
+    ('int', '"int *"'),
+    ('struct', '"struct point *"'),
+    ('array', '"double[16]"'),
+]
+
+PROGRAM = r"""
+import time, cffi
+ffi = cffi.FFI()
+ffi.cdef("struct point { double x, y, z; };")
+new = %(allocator)s
+def run(n):
+    for i in range(n):
+        p = new(%(cdecl)s)
+n = %(n)d
+run(n // 10)      # warm up the JIT
+t0 = time.time()
+run(n)
+print (time.time() - t0) * 1e9 / n
+"""
+
+def measure(executable, n, allocator, cdecl):
+    program = PROGRAM % {'allocator': allocator, 'cdecl': cdecl, 'n': n}
+    out = subprocess.check_output([executable, '-c', program])
+    return float(out.strip())
+
+def main(argv):
+    n = 10000000
+    arena = 65536
+    args = []
+    for arg in argv:
+        if arg.startswith('--n='):
+            n = int(arg[len('--n='):])
+        elif arg.startswith('--arena='):
+            arena = int(arg[len('--arena='):])
+        else:
+            args.append(arg)
+    if len(args) != 1:
+        print __doc__
+        return 2
+    [executable] = args
+    allocators = [('default', 'ffi.new'),
+                  ('arena', 'ffi.new_allocator(arena=%d)' % (arena,))]
+    for name, cdecl in CASES:
+        for allocname, allocator in allocators:
+            ns = measure(executable, n, allocator, cdecl)
+            print '%-8s %-8s %8.1f ns' % (name, allocname, ns)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,84 @@
+#! /usr/bin/env python
+"""
+Usage: startuptime.py [--runs=N] [--max-ms=MS] [--log] /path/to/pypy-c
+
+Measures the startup time of 'pypy-c -c pass', as the best and the median
+of N runs.  With --max-ms, exits with status 1 if the median is above the
+given number of milliseconds, so that it can be used as a benchmark with a
+target.  With --log, runs once more with PYPYLOG=module-startup and prints
+the time spent in the startup() of every built-in module.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+
+def measure(executable, runs):
+    times = []
+    for i in range(runs):
+        t0 = time.time()
+        subprocess.check_call([executable, '-c', 'pass'])
+        times.append(time.time() - t0)
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+def module_startup_times(executable):
+    from rpython.tool.logparser import parse_log_file
+    logfile = os.path.abspath('startuptime.log')
+    env = os.environ.copy()
+    env['PYPYLOG'] = 'module-startup:' + logfile
+    subprocess.check_call([executable, '-c', 'pass'], env=env)
+    result = []
+    def walk(entries):
+        # the startup() of a module can import other modules
+        for entry in entries:
+            if entry[0] == 'debug_print':
+                continue
+            category, start, stop, subentries = entry
+            if category == 'module-startup':
+                name = '?'
+                for subentry in subentries:
+                    if subentry[0] == 'debug_print':
+                        name = subentry[1]
+                        break
+                result.append((stop - start, name))
+            walk(subentries)
+    walk(parse_log_file(logfile, verbose=False))
+    os.unlink(logfile)
+    return result
+
+def main(argv):
+    runs = 20
+    max_ms = None
+    log = False
+    args = []
+    for arg in argv:
+        if arg.startswith('--runs='):
+            runs = int(arg[len('--runs='):])
+        elif arg.startswith('--max-ms='):
+            max_ms = float(arg[len('--max-ms='):])
+        elif arg == '--log':
+            log = True
+        else:
+            args.append(arg)
+    if len(args) != 1:
+        print __doc__
+        return 2
+    [executable] = args
+    best, median = measure(executable, runs)
+    print 'startup time: best %.1f ms, median %.1f ms (%d runs)' % (
+        best * 1000.0, median * 1000.0, runs)
+    if log:
+        for ticks, name in sorted(module_startup_times(executable),
+                                  reverse=True):
+            print '%14d ticks  %s' % (ticks, name)
+    if max_ms is not None and median * 1000.0 > max_ms:
+        print 'FAILED: the median is above the target of %.1f ms' % (max_ms,)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+    sys.exit(main(sys.argv[1:]))
@@ -175,6 +175,12 @@ translation_optiondescription = OptionDescription(
     IntOption("make_jobs", "Specify -j argument to make for compilation"
               " (C backend only)",
               cmdline="--make-jobs", default=detect_number_of_processors()),
+    IntOption("jobs", "Number of processes used to write the C source files"
+              " (C backend only, needs fork())",
+              cmdline="--jobs", default=1),
+    BoolOption("object_cache", "Reuse the object files compiled by previous"
+               " translations from identical C files (C backend only)",
+               cmdline="--object-cache", default=False),
 
     # Flags of the TranslationContext:
     BoolOption("list_comprehension_operations",
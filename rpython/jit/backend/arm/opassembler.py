@@ -246,6 +246,12 @@ class ResOpAssembler(BaseAssembler):
     emit_op_guard_no_overflow = emit_op_guard_true
     emit_op_guard_overflow    = emit_op_guard_false
 
+    def emit_op_guard_always_fails(self, op, arglocs, regalloc, fcond):
+        # the guard is patched into a branch on the opposite of
+        # 'guard_success_cc', and the opposite of AL is AL
+        self.guard_success_cc = c.AL
+        return self._emit_guard(op, arglocs)
+
     def emit_op_guard_class(self, op, arglocs, regalloc, fcond):
         self._cmp_guard_class(op, arglocs, regalloc, fcond)
         self.guard_success_cc = c.EQ
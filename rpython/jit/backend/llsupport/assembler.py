@@ -15,7 +15,7 @@ from rpython.rtyper.lltypesystem import rffi, lltype
 from rpython.rlib.rjitlog import rjitlog as jl
 
 DEBUG_COUNTER = lltype.Struct('DEBUG_COUNTER',
-    # 'b'ridge, 'l'abel or # 'e'ntry point
+    # 'b'ridge, 'l'abel, 'e'ntry point or 'g'uard failure
     ('i', lltype.Signed),      # first field, at offset 0
     ('type', lltype.Char),
     ('number', lltype.Signed)
@@ -75,6 +75,8 @@ class BaseAssembler(object):
         self.rtyper = cpu.rtyper
         # do not rely on this attribute if you test for jitlog
         self._debug = False
+        # count guard failures even if not self._debug
+        self._guard_counters = False
         self.loop_run_counters = []
 
     def stitch_bridge(self, faildescr, target):
@@ -182,6 +184,11 @@ class BaseAssembler(object):
         self._debug = v
         return r
 
+    def set_guard_counters(self, v):
+        r = self._guard_counters
+        self._guard_counters = v
+        return r
+
     def rebuild_faillocs_from_descr(self, descr, inputargs):
         locs = []
         GPR_REGS = len(self.cpu.gen_regs)
@@ -372,7 +379,7 @@ class BaseAssembler(object):
                                track_allocation=False)
         struct.i = 0
         struct.type = tp
-        if tp == 'b' or tp == 'e':
+        if tp == 'b' or tp == 'e' or tp == 'g':
             struct.number = number
         else:
             assert token
@@ -390,6 +397,8 @@ class BaseAssembler(object):
             length = len(self.loop_run_counters)
             for i in range(length):
                 struct = self.loop_run_counters[i]
+                if struct.type == 'g' and struct.i == 0:
+                    continue     # don't report guards that never failed
                 if struct.type == 'l':
                     prefix = 'TargetToken(%d)' % struct.number
                 else:
@@ -400,6 +409,8 @@ class BaseAssembler(object):
                         num = str(r_uint(num))
                     if struct.type == 'b':
                         prefix = 'bridge %s' % num
+                    elif struct.type == 'g':
+                        prefix = 'guard %s' % num
                     else:
                         prefix = 'entry %s' % num
                 debug_print(prefix + ':' + str(struct.i))
@@ -1,4 +1,4 @@
-import os
+import os, sys
 from rpython.jit.metainterp.history import Const, REF, JitCellToken
 from rpython.rlib.objectmodel import we_are_translated, specialize
 from rpython.jit.metainterp.resoperation import rop, AbstractValue
@@ -47,12 +47,8 @@ class LinkedList(object):
 
     def append(self, size, item):
         key = self.fm.get_loc_index(item)
-        if size == 2:
-            self._append(key)
-            self._append(key + 1)
-        else:
-            assert size == 1
-            self._append(key)
+        for i in range(size):
+            self._append(key + i)
 
     def _append(self, key):
         if self.master_node is None or self.master_node.val > key:
@@ -172,7 +168,7 @@ class FrameManager(object):
         return self.get_new_loc(box)
 
     def get_new_loc(self, box):
-        size = self.frame_size(box.type)
+        size = self.box_frame_size(box)
         hint = self.hint_frame_pos.get(box, -1)
         # frame_depth is rounded up to a multiple of 'size', assuming
         # that 'size' is a power of two.  The reason for doing so is to
@@ -204,14 +200,14 @@ class FrameManager(object):
 
     def bind(self, box, loc):
         pos = self.get_loc_index(loc)
-        size = self.frame_size(box.type)
+        size = self.box_frame_size(box)
         self.current_frame_depth = max(pos + size, self.current_frame_depth)
         self.bindings[box] = loc
 
     def finish_binding(self):
         all = [0] * self.get_frame_depth()
         for b, loc in self.bindings.iteritems():
-            size = self.frame_size(b.type)
+            size = self.box_frame_size(b)
             pos = self.get_loc_index(loc)
             for i in range(pos, pos + size):
                 all[i] = 1
@@ -228,7 +224,7 @@ class FrameManager(object):
         except KeyError:
             return    # already gone
         del self.bindings[box]
-        size = self.frame_size(box.type)
+        size = self.box_frame_size(box)
         self.freelist.append(size, loc)
         if not we_are_translated():
             self._check_invariants()
@@ -236,7 +232,7 @@ class FrameManager(object):
     def _check_invariants(self):
         all = [0] * self.get_frame_depth()
         for b, loc in self.bindings.iteritems():
-            size = self.frame_size(b)
+            size = self.box_frame_size(b)
             pos = self.get_loc_index(loc)
             for i in range(pos, pos + size):
                 assert not all[i]
@@ -260,6 +256,12 @@ class FrameManager(object):
     def frame_size(type):
         return 1
 
+    def box_frame_size(self, box):
+        """ Number of frame words used by 'box'; by default this only
+        depends on its type
+        """
+        return self.frame_size(box.type)
+
     @staticmethod
     def get_loc_index(loc):
         raise NotImplementedError("Purely abstract")
@@ -270,6 +272,81 @@ class FrameManager(object):
         """
         raise NotImplementedError("Purely abstract")
 
+NO_USAGE = sys.maxint
+
+class RegisterHints(object):
+    """ Lifetime information for the register allocator, on top of the
+    longevity: the positions where every variable is really used, and the
+    registers that some variables will have to be in at a given position
+    (arguments of calls, of the final JUMP, fixed-register instructions).
+    """
+    def __init__(self, real_usages):
+        self.real_usages = real_usages  # {var: increasing list of positions}
+        self.fixed_vars = {}            # {var: [(position, reg)]}
+        self.fixed_positions = {}       # {reg: increasing list of positions}
+        self.fixed_owners = {}          # {reg: list of vars, same length}
+
+    def fixed_register(self, position, reg, var):
+        """ Record that 'var' is wanted in 'reg' at 'position'.  Must be
+        called with increasing positions for any given var or reg.
+        """
+        if var not in self.fixed_vars:
+            self.fixed_vars[var] = []
+        self.fixed_vars[var].append((position, reg))
+        if reg not in self.fixed_positions:
+            self.fixed_positions[reg] = []
+            self.fixed_owners[reg] = []
+        self.fixed_positions[reg].append(position)
+        self.fixed_owners[reg].append(var)
+
+    def next_real_usage(self, var, position):
+        """ The first position after 'position' where 'var' is used by an
+        operation other than a JUMP or LABEL, or NO_USAGE.
+        """
+        usages = self.real_usages.get(var, None)
+        if usages is not None:
+            i = _first_after(usages, position)
+            if i < len(usages):
+                return usages[i]
+        return NO_USAGE
+
+    def preferred_register(self, var, position):
+        """ The next register where 'var' is wanted, or None. """
+        fixed = self.fixed_vars.get(var, None)
+        if fixed is not None:
+            for fixed_position, reg in fixed:
+                if fixed_position >= position:
+                    return reg
+        return None
+
+    def is_reserved(self, reg, var, start, end):
+        """ Return True if another variable than 'var' wants to be in 'reg'
+        at some position between 'start' and 'end', both included.
+        """
+        positions = self.fixed_positions.get(reg, None)
+        if positions is not None:
+            owners = self.fixed_owners[reg]
+            for i in range(_first_after(positions, start - 1), len(positions)):
+                if positions[i] > end:
+                    break
+                if owners[i] is not var:
+                    return True
+        return False
+
+def _first_after(positions, position):
+    # index of the first item of the sorted list 'positions' that is
+    # greater than 'position'
+    lo = 0
+    hi = len(positions)
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if positions[mid] <= position:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
 class RegisterManager(object):
 
     """ Class that keeps track of register allocations
@@ -280,10 +357,15 @@ class RegisterManager(object):
     save_around_call_regs = []
     frame_reg             = None
 
-    def __init__(self, longevity, frame_manager=None, assembler=None):
+    def __init__(self, longevity, frame_manager=None, assembler=None,
+                 hints=None):
         self.free_regs = self.all_regs[:]
         self.free_regs.reverse()
         self.longevity = longevity
+        self.hints = hints
+        # statistics: moves between locations, and stores to the frame
+        self.num_moves = 0
+        self.num_spills = 0
         self.temp_boxes = []
         if not we_are_translated():
             self.reg_bindings = OrderedDict()
@@ -385,6 +467,11 @@ class RegisterManager(object):
             loc = self.reg_bindings.get(v, None)
             if loc is not None and loc not in self.no_lower_byte_regs:
                 return loc
+            if loc is None and self.hints is not None:
+                preferred = self.hints.preferred_register(v, self.position)
+                if (preferred is not None and preferred in self.free_regs
+                        and preferred not in self.no_lower_byte_regs):
+                    return self.try_allocate_reg(v, preferred)
             for i in range(len(self.free_regs) - 1, -1, -1):
                 reg = self.free_regs[i]
                 if reg not in self.no_lower_byte_regs:
@@ -399,10 +486,43 @@ class RegisterManager(object):
             return self.reg_bindings[v]
         except KeyError:
             if self.free_regs:
-                loc = self.free_regs.pop()
+                if self.hints is not None:
+                    i = self._pick_free_reg(v)
+                    loc = self.free_regs[i]
+                    del self.free_regs[i]
+                else:
+                    loc = self.free_regs.pop()
                 self.reg_bindings[v] = loc
                 return loc
 
+    def _pick_free_reg(self, v):
+        """ Return the index in 'free_regs' of the register to use for v,
+        with the hints: the register where v is needed next if it is free,
+        otherwise a register that no other variable needs before v dies.
+        """
+        hints = self.hints
+        preferred = hints.preferred_register(v, self.position)
+        if preferred is not None:
+            for i in range(len(self.free_regs)):
+                if self.free_regs[i] is preferred:
+                    return i
+        if v in self.longevity:
+            end = self.longevity[v][1]
+        else:
+            end = self.position
+        for i in range(len(self.free_regs) - 1, -1, -1):
+            if not hints.is_reserved(self.free_regs[i], v, self.position, end):
+                return i
+        return len(self.free_regs) - 1
+
+    def _spill_priority(self, v):
+        # the variable with the highest priority is spilled first: with
+        # the hints, it is the one used again the latest; otherwise, the
+        # one that lives the longest
+        if self.hints is not None:
+            return self.hints.next_real_usage(v, self.position)
+        return self.longevity[v][1]
+
     def _spill_var(self, v, forbidden_vars, selected_reg,
                    need_lower_byte=False):
         v_to_spill = self._pick_variable_to_spill(v, forbidden_vars,
@@ -412,6 +532,7 @@ class RegisterManager(object):
         if self.frame_manager.get(v_to_spill) is None:
             newloc = self.frame_manager.loc(v_to_spill)
             self.assembler.regalloc_mov(loc, newloc)
+            self.num_spills += 1
         return loc
 
     def _pick_variable_to_spill(self, v, forbidden_vars, selected_reg=None,
@@ -431,7 +552,7 @@ class RegisterManager(object):
                     continue
             if need_lower_byte and reg in self.no_lower_byte_regs:
                 continue
-            max_age = self.longevity[next][1]
+            max_age = self._spill_priority(next)
             if cur_max_age < max_age:
                 cur_max_age = max_age
                 candidate = next
@@ -499,6 +620,7 @@ class RegisterManager(object):
         assert isinstance(v, Const)
         immloc = self.convert_to_imm(v)
         if selected_reg:
+            self.num_moves += 1
             if selected_reg in self.free_regs:
                 self.assembler.regalloc_mov(immloc, selected_reg)
                 return selected_reg
@@ -524,6 +646,7 @@ class RegisterManager(object):
                                       need_lower_byte=need_lower_byte)
         if prev_loc is not loc:
             self.assembler.regalloc_mov(prev_loc, loc)
+            self.num_moves += 1
         return loc
 
     def _reallocate_from_to(self, from_v, to_v):
@@ -536,9 +659,11 @@ class RegisterManager(object):
             loc = self.free_regs.pop()
             self.reg_bindings[v] = loc
             self.assembler.regalloc_mov(prev_loc, loc)
+            self.num_moves += 1
         else:
             loc = self.frame_manager.loc(v)
             self.assembler.regalloc_mov(prev_loc, loc)
+            self.num_spills += 1
 
     def force_result_in_reg(self, result_v, v, forbidden_vars=[]):
         """ Make sure that result is in the same register as v.
@@ -553,6 +678,7 @@ class RegisterManager(object):
             else:
                 loc = self._spill_var(v, forbidden_vars, None)
             self.assembler.regalloc_mov(self.convert_to_imm(v), loc)
+            self.num_moves += 1
             self.reg_bindings[result_v] = loc
             return loc
         if v not in self.reg_bindings:
@@ -560,6 +686,7 @@ class RegisterManager(object):
             prev_loc = self.frame_manager.loc(v)
             loc = self.force_allocate_reg(result_v, forbidden_vars)
             self.assembler.regalloc_mov(prev_loc, loc)
+            self.num_moves += 1
             return loc
         if self.longevity[v][1] > self.position:
             # we need to find a new place for variable v and
@@ -579,6 +706,7 @@ class RegisterManager(object):
             reg = self.reg_bindings[v]
             to = self.frame_manager.loc(v)
             self.assembler.regalloc_mov(reg, to)
+            self.num_spills += 1
         # otherwise it's clean
 
     def _bc_spill(self, v, new_free_regs):
@@ -671,7 +799,7 @@ class RegisterManager(object):
             else:
                 # this is a register like eax/rax, which needs either
                 # spilling or moving.
-                move_or_spill.append((v, max_age))
+                move_or_spill.append((v, self._spill_priority(v)))
 
         if len(move_or_spill) > 0:
             while len(self.free_regs) > 0:
@@ -701,6 +829,7 @@ class RegisterManager(object):
                     assert reg in self.save_around_call_regs
                     assert new_reg not in self.save_around_call_regs
                 self.assembler.regalloc_mov(reg, new_reg)
+                self.num_moves += 1
                 self.reg_bindings[v] = new_reg    # change the binding
                 new_free_regs.append(reg)
                 #
@@ -854,6 +983,25 @@ def compute_vars_longevity(inputargs, operations):
     
     return longevity, last_real_usage
 
+def compute_real_usages(operations):
+    # compute a dictionary that maps variables to the increasing list of
+    # the indexes of the operations, other than JUMP and LABEL, using them
+    real_usages = {}
+    for i in range(len(operations)):
+        op = operations[i]
+        opnum = op.getopnum()
+        if opnum == rop.JUMP or opnum == rop.LABEL:
+            continue
+        for j in range(op.numargs()):
+            arg = op.getarg(j)
+            if isinstance(arg, Const):
+                continue
+            if arg not in real_usages:
+                real_usages[arg] = [i]
+            elif real_usages[arg][-1] != i:
+                real_usages[arg].append(i)
+    return real_usages
+
 def is_comparison_or_ovf_op(opnum):
     return rop.is_comparison(opnum) or rop.is_ovf(opnum)
 
@@ -1,6 +1,7 @@
 import py
 from rpython.jit.metainterp.history import ConstInt, INT, FLOAT
 from rpython.jit.backend.llsupport.regalloc import FrameManager, LinkedList
+from rpython.jit.backend.llsupport.regalloc import RegisterHints, NO_USAGE
 from rpython.jit.backend.llsupport.regalloc import RegisterManager as BaseRegMan
 from rpython.jit.metainterp.resoperation import InputArgInt, InputArgRef,\
      InputArgFloat
@@ -378,6 +379,94 @@ class TestRegalloc(object):
         assert spilled2 is loc
         rm._check_invariants()
 
+    def test_hints_preferred_register(self):
+        b0, b1 = newboxes(0, 1)
+        longevity = {b0: (0, 3), b1: (0, 2)}
+        hints = RegisterHints({b0: [3], b1: [2]})
+        hints.fixed_register(3, r1, b0)
+        rm = RegisterManager(longevity, hints=hints)
+        rm.next_instruction()
+        assert rm.try_allocate_reg(b0) is r1
+        # r1 is not free any more
+        assert rm.try_allocate_reg(b1) is not r1
+        rm._check_invariants()
+
+    def test_hints_preferred_register_lower_byte(self):
+        b0, b1 = newboxes(0, 1)
+        longevity = {b0: (0, 3), b1: (0, 3)}
+        hints = RegisterHints({b0: [3], b1: [3]})
+        hints.fixed_register(3, r1, b0)
+        hints.fixed_register(3, r2, b1)
+
+        class XRegisterManager(RegisterManager):
+            no_lower_byte_regs = [r2, r3]
+
+        rm = XRegisterManager(longevity, hints=hints)
+        rm.next_instruction()
+        # without the hint, b0 would get r0
+        assert rm.try_allocate_reg(b0, need_lower_byte=True) is r1
+        # r2 has no lower byte
+        assert rm.try_allocate_reg(b1, need_lower_byte=True) is r0
+        rm._check_invariants()
+
+    def test_hints_reserved_register(self):
+        b0, b1 = newboxes(0, 1)
+        longevity = {b0: (0, 3), b1: (0, 5)}
+        hints = RegisterHints({b0: [3], b1: [5]})
+        # without hints, b1 would get r0, the last free register
+        hints.fixed_register(3, r0, b0)
+        rm = RegisterManager(longevity, hints=hints)
+        rm.next_instruction()
+        loc = rm.try_allocate_reg(b1)
+        assert loc is not r0
+        assert rm.try_allocate_reg(b0) is r0
+        rm._check_invariants()
+
+    def test_hints_spill_next_usage(self):
+        b0, b1, b2, b3, b4 = newboxes(0, 1, 2, 3, 4)
+        # b3 lives the longest, but b0 is used again the latest
+        longevity = {b0: (0, 9), b1: (0, 9), b2: (0, 9), b3: (0, 10),
+                     b4: (1, 2)}
+        hints = RegisterHints({b0: [8, 9], b1: [2, 9], b2: [3, 9],
+                               b3: [4, 10], b4: [2]})
+        asm = MockAsm()
+        rm = RegisterManager(longevity, frame_manager=TFrameManager(),
+                             assembler=asm, hints=hints)
+        rm.next_instruction()
+        for b in b0, b1, b2, b3:
+            rm.force_allocate_reg(b)
+        rm.next_instruction()
+        loc = rm.loc(b0)
+        assert rm.force_allocate_reg(b4) is loc
+        assert b0 not in rm.reg_bindings
+        assert rm.num_spills == 1
+        assert rm.num_moves == 0
+        rm._check_invariants()
+
+    def test_hints_next_real_usage(self):
+        b0, b1 = newboxes(0, 1)
+        hints = RegisterHints({b0: [1, 4, 7]})
+        assert hints.next_real_usage(b0, 0) == 1
+        assert hints.next_real_usage(b0, 1) == 4
+        assert hints.next_real_usage(b0, 6) == 7
+        assert hints.next_real_usage(b0, 7) == NO_USAGE
+        assert hints.next_real_usage(b1, 0) == NO_USAGE
+
+    def test_count_moves(self):
+        b0, b1 = newboxes(0, 1)
+        longevity = {b0: (0, 2), b1: (1, 2)}
+        asm = MockAsm()
+        rm = RegisterManager(longevity, frame_manager=TFrameManager(),
+                             assembler=asm)
+        rm.next_instruction()
+        rm.force_allocate_reg(b0)
+        rm.next_instruction()
+        rm.force_result_in_reg(b1, b0)
+        # b0 is still alive, it was moved away to another free register
+        assert rm.num_moves == 1
+        assert rm.num_spills == 0
+        assert len(asm.moves) == 1
+
 
     def test_hint_frame_locations_1(self):
         for hint_value in range(11):
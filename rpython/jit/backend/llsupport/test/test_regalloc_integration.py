@@ -322,6 +322,79 @@ class TestRegallocSimple(BaseTestRegalloc):
         self.interpret(ops, [0, 0, 0, 0])
         assert self.getints(4) == [1<<29, 30, 3, 4]
 
+    def test_register_hints_shift_count(self):
+        ops = '''
+        [i0, i1]
+        i2 = int_add(i1, 1)
+        i3 = int_lshift(i0, i2)
+        finish(i3)
+        '''
+        loop = self.parse(ops)
+        regalloc = self.cpu.build_regalloc()
+        regalloc.prepare_loop(loop.inputargs, loop.operations,
+                              loop.original_jitcell_token, [])
+        if getattr(regalloc, 'hints', None) is None:
+            py.test.skip("no register hints in this backend")
+        from rpython.jit.backend.x86.regloc import ecx
+        i2 = loop.operations[0]
+        assert regalloc.hints.preferred_register(i2, 0) is ecx
+        self.interpret(ops, [3, 4])
+        assert self.getint(0) == 3 << 5
+
+    def test_register_hints_chosen(self, monkeypatch):
+        ops = '''
+        [i0, i1]
+        i2 = int_lt(i0, i1)
+        i3 = int_lshift(i0, i2)
+        finish(i3)
+        '''
+        regalloc = self.prepare_loop(ops)
+        if getattr(regalloc, 'hints', None) is None:
+            py.test.skip("no register hints in this backend")
+        from rpython.jit.backend.x86.regloc import ecx
+        result_locs = {}
+        def perform(self, op, arglocs, result_loc):
+            result_locs[op.getopnum()] = result_loc
+            RegAlloc_perform(self, op, arglocs, result_loc)
+        RegAlloc_perform = type(regalloc).perform.im_func
+        monkeypatch.setattr(type(regalloc), 'perform', perform)
+        self.interpret(ops, [3, 4])
+        assert self.getint(0) == 3 << 1
+        # without the hint, i0 would be loaded into ecx, the first free
+        # register, and i2 would have to be moved there for the shift
+        assert result_locs[rop.INT_LT] is ecx
+
+    def test_register_hints_reduce_moves(self, monkeypatch):
+        ops = '''
+        [i0, i1, i2]
+        label(i0, i1, i2, descr=targettoken)
+        i3 = int_lt(i0, i1)
+        i4 = int_lshift(i2, i3)
+        i5 = call_i(ConstClass(f2ptr), i4, i0, descr=f2_calldescr)
+        i6 = int_add(i5, i1)
+        i7 = int_and(i6, 1023)
+        i8 = int_add(i1, 1)
+        i9 = int_lt(i8, 10)
+        guard_true(i9) [i7, i8]
+        jump(i7, i8, i0, descr=targettoken)
+        '''
+        if not hasattr(type(self.cpu.build_regalloc()),
+                       'use_register_hints'):
+            py.test.skip("no register hints in this backend")
+        tracker = self.cpu.tracker
+        moves = {}
+        results = {}
+        for use_hints in [False, True]:
+            monkeypatch.setattr(type(self.cpu.build_regalloc()),
+                                'use_register_hints', use_hints)
+            before = tracker.total_regalloc_moves
+            self.interpret(ops, [3, 0, 5])
+            moves[use_hints] = tracker.total_regalloc_moves - before
+            results[use_hints] = self.getints(2)
+        assert results[True] == results[False]
+        assert results[True][1] == 10
+        assert moves[True] < moves[False]
+
     def test_result_selected_reg_via_neg(self):
         ops = '''
         [i0, i1, i2, i3]
@@ -7,6 +7,8 @@ class CPUTotalTracker(object):
     total_compiled_bridges = 0
     total_freed_loops = 0
     total_freed_bridges = 0
+    total_regalloc_moves = 0      # only counted by the x86 backend
+    total_regalloc_spills = 0
 
 class AbstractCPU(object):
     supports_floats = False
@@ -50,6 +52,13 @@ class AbstractCPU(object):
         """
         return False
 
+    def set_guard_counters(self, value):
+        """ Enable or disable the counting of guard failures in the code
+        compiled from now on, without the rest of the debugging info.
+        Does nothing by default. Returns the previous setting.
+        """
+        return False
+
     def compile_loop(self, inputargs, operations, looptoken, jd_id=0,
                      unique_id=0, log=True, name='', logger=None):
         """Assemble the given loop.
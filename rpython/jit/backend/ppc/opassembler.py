@@ -296,6 +296,11 @@ class GuardOpAssembler(object):
         self.guard_success_cc = c.NS
         self._emit_guard(op, arglocs)
 
+    def emit_guard_always_fails(self, op, arglocs, regalloc):
+        self.mc.cmp_op(0, r.SCRATCH.value, r.SCRATCH.value)
+        self.guard_success_cc = c.NE
+        self._emit_guard(op, arglocs)
+
     def emit_guard_value(self, op, arglocs, regalloc):
         l0 = arglocs[0]
         l1 = arglocs[1]
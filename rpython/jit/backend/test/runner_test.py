@@ -3515,6 +3515,38 @@ class LLtypeBackendTest(BaseBackendTest):
         print 'step 4 ok'
         print '-'*79
 
+    def test_guard_always_fails(self):
+        # a trace that ends with guard_always_fails, with a bridge that
+        # jumps back to its label, like the pieces of a split trace
+        faildescr1 = BasicFailDescr(1)
+        faildescr2 = BasicFailDescr(2)
+        labeldescr = TargetToken()
+        loop = parse("""
+        [i0]
+        label(i0, descr=labeldescr)
+        i1 = int_add(i0, 1)
+        guard_always_fails(descr=faildescr1) [i1]
+        """, namespace=locals())
+        looptoken = JitCellToken()
+        self.cpu.compile_loop(loop.inputargs, loop.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 5)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail is faildescr1
+        assert self.cpu.get_int_value(deadframe, 0) == 6
+
+        bridge = parse("""
+        [i1]
+        i2 = int_lt(i1, 10)
+        guard_true(i2, descr=faildescr2) [i1]
+        jump(i1, descr=labeldescr)
+        """, namespace=locals())
+        self.cpu.compile_bridge(faildescr1, bridge.inputargs,
+                                bridge.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 5)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail is faildescr2
+        assert self.cpu.get_int_value(deadframe, 0) == 10
+
     def test_guard_not_invalidated_and_label(self):
         # test that the guard_not_invalidated reserves enough room before
         # the label.  If it doesn't, then in this example after we invalidate
@@ -29,7 +29,7 @@ from rpython.jit.backend.x86.regloc import (eax, ecx, edx, ebx, esp, ebp, esi,
     imm0, imm1, FloatImmedLoc, RawEbpLoc, RawEspLoc)
 from rpython.rlib.objectmodel import we_are_translated
 from rpython.jit.backend.x86 import rx86, codebuf, callbuilder
-from rpython.jit.backend.x86.vector_ext import VectorAssemblerMixin
+from rpython.jit.backend.x86.vector_ext import VectorAssemblerMixin, ymm
 from rpython.jit.backend.x86.callbuilder import follow_jump
 from rpython.jit.metainterp.resoperation import rop
 from rpython.jit.backend.x86 import support
@@ -45,6 +45,7 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
     _regalloc = None
     _output_loop_log = None
     _second_tmp_reg = ecx
+    uses_ymm = False     # 32-bytes vectors in the code being compiled
 
     DEBUG_FRAME_DEPTH = False
 
@@ -89,6 +90,7 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
                                                         allblocks)
         self.target_tokens_currently_compiling = {}
         self.frame_depth_to_patch = []
+        self.uses_ymm = False
 
     def teardown(self):
         self.pending_guard_tokens = None
@@ -1105,8 +1107,18 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         to_xmm = isinstance(to_loc, RegLoc) and to_loc.is_xmm
         if from_xmm or to_xmm:
             if from_xmm and to_xmm:
-                # copy 128-bit from -> to
-                self.mc.MOVAPD(to_loc, from_loc)
+                if (self.uses_ymm or from_loc.location_code() == 'y' or
+                                     to_loc.location_code() == 'y'):
+                    # copy 256-bit from -> to
+                    self.mc.VMOVAPD_yy(to_loc.value, from_loc.value)
+                else:
+                    # copy 128-bit from -> to
+                    self.mc.MOVAPD(to_loc, from_loc)
+            elif to_loc.get_width() == 32:
+                # spill a 256-bit vector to its YmmFrameLoc
+                self.mc.VMOVUPD(to_loc, ymm(from_loc))
+            elif from_loc.get_width() == 32:
+                self.mc.VMOVUPD(ymm(to_loc), from_loc)
             else:
                 self.mc.MOVSD(to_loc, from_loc)
         else:
@@ -1116,7 +1128,9 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
     regalloc_mov = mov # legacy interface
 
     def regalloc_push(self, loc):
-        if isinstance(loc, RegLoc) and loc.is_xmm:
+        if self.uses_ymm:
+            self._push_32_bytes(loc)
+        elif isinstance(loc, RegLoc) and loc.is_xmm:
             self.mc.SUB_ri(esp.value, 8)   # = size of doubles
             self.mc.MOVSD_sx(0, loc.value)
         elif WORD == 4 and isinstance(loc, FrameLoc) and loc.get_width() == 8:
@@ -1127,7 +1141,9 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
             self.mc.PUSH(loc)
 
     def regalloc_pop(self, loc):
-        if isinstance(loc, RegLoc) and loc.is_xmm:
+        if self.uses_ymm:
+            self._pop_32_bytes(loc)
+        elif isinstance(loc, RegLoc) and loc.is_xmm:
             self.mc.MOVSD_xs(loc.value, 0)
             self.mc.ADD_ri(esp.value, 8)   # = size of doubles
         elif WORD == 4 and isinstance(loc, FrameLoc) and loc.get_width() == 8:
@@ -1137,6 +1153,33 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         else:
             self.mc.POP(loc)
 
+    def _push_32_bytes(self, loc):
+        # With 256-bit vectors around, every push takes 32 bytes, with
+        # the value at 0(%esp): the pushes and pops of jump.py can then
+        # pair any two locations, whatever their width.
+        if isinstance(loc, RegLoc) and loc.is_xmm:
+            self.mc.SUB_ri(esp.value, 32)
+            self.mc.VMOVUPD_sy(0, loc.value)
+        elif isinstance(loc, FrameLoc) and loc.get_width() == 32:
+            self.mc.SUB_ri(esp.value, 32)
+            self.mc.VMOVUPD_yb(X86_64_XMM_SCRATCH_REG.value, loc.value)
+            self.mc.VMOVUPD_sy(0, X86_64_XMM_SCRATCH_REG.value)
+        else:
+            self.mc.SUB_ri(esp.value, 32 - WORD)
+            self.mc.PUSH(loc)
+
+    def _pop_32_bytes(self, loc):
+        if isinstance(loc, RegLoc) and loc.is_xmm:
+            self.mc.VMOVUPD_ys(loc.value, 0)
+            self.mc.ADD_ri(esp.value, 32)
+        elif isinstance(loc, FrameLoc) and loc.get_width() == 32:
+            self.mc.VMOVUPD_ys(X86_64_XMM_SCRATCH_REG.value, 0)
+            self.mc.VMOVUPD_by(loc.value, X86_64_XMM_SCRATCH_REG.value)
+            self.mc.ADD_ri(esp.value, 32)
+        else:
+            self.mc.POP(loc)
+            self.mc.ADD_ri(esp.value, 32 - WORD)
+
     def regalloc_immedmem2mem(self, from_loc, to_loc):
         # move a ConstFloatLoc directly to a FrameLoc, as two MOVs
         # (even on x86-64, because the immediates are encoded as 32 bits)
@@ -1735,6 +1778,18 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         guard_token.known_scratch_value = saved
         self.pending_guard_tokens.append(guard_token)
 
+    def genop_guard_guard_always_fails(self, guard_op, guard_token,
+                                       locs, ign):
+        # an unconditional jump, patched later like the ones emitted
+        # by implement_guard()
+        self.mc.JMP_l(0)
+        self.mc.force_frame_size(DEFAULT_FRAME_BYTES)
+        pos = self.mc.get_relative_pos(break_basic_block=False)
+        guard_token.pos_jump_offset = pos - 4
+        saved = self.mc.get_scratch_register_known_value()
+        guard_token.known_scratch_value = saved
+        self.pending_guard_tokens.append(guard_token)
+
     def genop_guard_guard_exception(self, guard_op, guard_token, locs, resloc):
         loc = locs[0]
         loc1 = locs[1]
@@ -1933,7 +1988,17 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         #
         self._update_at_exit(guardtok.fail_locs, guardtok.failargs,
                              guardtok.faildescr, regalloc)
+        if self.uses_ymm:
+            # avoid the penalty of the SSE instructions that follow
+            self.mc.VZEROUPPER()
         #
+        if self._debug or self._guard_counters:
+            # count the failures of this guard, for the 'g' entries of
+            # get_all_loop_runs().  Once a bridge is attached, the jump
+            # goes directly to the bridge and its 'b' counter takes over.
+            number = compute_unique_id(guardtok.faildescr)
+            counter = self._register_counter('g', number, None)
+            self.mc.INC(heap(rffi.cast(lltype.Signed, counter)))
         faildescrindex, target = self.store_info_on_descr(startpos, guardtok)
         if IS_X86_64:
             self.mc.PUSH_p(0)     # %rip-relative
@@ -2042,6 +2107,8 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         self.mc = None
 
     def genop_finish(self, op, arglocs, result_loc):
+        if self.uses_ymm:
+            self.mc.VZEROUPPER()
         base_ofs = self.cpu.get_baseofs_of_frame_field()
         if len(arglocs) > 0:
             [return_val] = arglocs
@@ -618,6 +618,18 @@ class CallBuilder64(CallBuilderX86):
         if not self.fnloc_is_immediate:
             self.fnloc = dst_locs[-1]     # the last "argument" prepared above
 
+        regalloc = self.asm._regalloc
+        if regalloc is not None:
+            # count the arguments not already in their location, like
+            # the jump moves; this is what the call hints try to reduce
+            for i in range(len(src_locs)):
+                if src_locs[i]._getregkey() != dst_locs[i]._getregkey():
+                    regalloc.num_call_arg_moves += 1
+            for i in range(len(xmm_src_locs)):
+                if (xmm_src_locs[i]._getregkey() !=
+                        xmm_dst_locs[i]._getregkey()):
+                    regalloc.num_call_arg_moves += 1
+
         if not we_are_translated():  # assert that we got the right stack depth
             floats = 0
             for i in range(len(arglocs)):
@@ -20,16 +20,23 @@ def detect_sse2():
     code = cpu_id(eax=1)
     return bool(code & (1<<25)) and bool(code & (1<<26))
 
-def cpu_id(eax = 1, ret_edx = True, ret_ecx = False):
+def cpu_id(eax = 1, ret_edx = True, ret_ecx = False, ret_ebx = False, ecx = 0):
     asm = ["\xB8",                     # MOV EAX, $eax
                 chr(eax & 0xff),
                 chr((eax >> 8) & 0xff),
                 chr((eax >> 16) & 0xff),
                 chr((eax >> 24) & 0xff),
+           "\xB9",                     # MOV ECX, $ecx
+                chr(ecx & 0xff),
+                chr((ecx >> 8) & 0xff),
+                chr((ecx >> 16) & 0xff),
+                chr((ecx >> 24) & 0xff),
            "\x53",                     # PUSH EBX
            "\x0F\xA2",                 # CPUID
-           "\x5B",                     # POP EBX
           ]
+    if ret_ebx:
+        asm.append("\x89\xD8")         # MOV EAX, EBX
+    asm.append("\x5B")                 # POP EBX
     if ret_edx:
         asm.append("\x92")             # XCHG EAX, EDX
     elif ret_ecx:
@@ -52,6 +59,29 @@ def detect_sse4a(code=-1):
         code = cpu_id(eax=0x80000001, ret_edx=False, ret_ecx=True)
     return bool(code & (1<<20))
 
+def xgetbv_xcr0():
+    # only valid if the OSXSAVE bit is set, see detect_avx()
+    return cpu_info("\x31\xC9"             # XOR ECX, ECX
+                    "\x0F\x01\xD0"         # XGETBV
+                    "\xC3")                 # RET
+
+def detect_avx(code=-1):
+    if code == -1:
+        code = cpu_id(eax=1, ret_edx=False, ret_ecx=True)
+    if not (code & (1<<27)) or not (code & (1<<28)):  # OSXSAVE, AVX
+        return False
+    # the OS must also save and restore the upper halves of the ymm
+    # registers: both the SSE and AVX state bits of XCR0 are needed
+    return (xgetbv_xcr0() & 0x6) == 0x6
+
+def detect_avx2():
+    if not detect_avx():
+        return False
+    if cpu_id(eax=0, ret_edx=False) < 7:    # highest leaf supported
+        return False
+    code = cpu_id(eax=7, ret_edx=False, ret_ebx=True, ecx=0)
+    return bool(code & (1<<5))
+
 def detect_x32_mode():
     # 32-bit         64-bit / x32
     code = cpu_info("\x48"                # DEC EAX
@@ -71,6 +101,10 @@ if __name__ == '__main__':
         print 'Processor supports sse4.2'
     if detect_sse4a():
         print 'Processor supports sse4a'
+    if detect_avx():
+        print 'Processor supports avx'
+    if detect_avx2():
+        print 'Processor supports avx2'
 
     if detect_x32_mode():
         print 'Process is running in "x32" mode.'
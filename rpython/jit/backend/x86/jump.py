@@ -87,10 +87,21 @@ def remap_frame_layout_mixed(assembler,
     # find and push the xmm stack locations from src_locations2 that
     # are going to be overwritten by dst_locations1
     from rpython.jit.backend.x86.arch import WORD
+    # (or that overlap a wide location of dst_locations2 without
+    # starting at the same word: remap_frame_layout only compares the
+    # first word of the locations)
     extrapushes = []
     dst_keys = {}
     for loc in dst_locations1:
         dst_keys[loc._getregkey()] = None
+    dst_keys2 = {}
+    inner_keys2 = {}
+    for loc in dst_locations2:
+        if isinstance(loc, FrameLoc):
+            key = loc._getregkey()
+            dst_keys2[key] = None
+            for ofs in range(WORD, loc.get_width(), WORD):
+                inner_keys2[key + ofs] = None
     src_locations2red = []
     dst_locations2red = []
     for i in range(len(src_locations2)):
@@ -98,8 +109,11 @@ def remap_frame_layout_mixed(assembler,
         dstloc = dst_locations2[i]
         if isinstance(loc, FrameLoc):
             key = loc._getregkey()
-            if (key in dst_keys or (loc.get_width() > WORD and
-                                    (key + WORD) in dst_keys)):
+            overlaps = key in dst_keys or key in inner_keys2
+            for ofs in range(WORD, loc.get_width(), WORD):
+                if key + ofs in dst_keys or key + ofs in dst_keys2:
+                    overlaps = True
+            if overlaps:
                 assembler.regalloc_push(loc)
                 extrapushes.append(dstloc)
                 continue
@@ -8,17 +8,18 @@ from rpython.jit.backend.llsupport.gcmap import allocate_gcmap
 from rpython.jit.backend.llsupport.regalloc import (FrameManager, BaseRegalloc,
      RegisterManager, TempVar, compute_vars_longevity, is_comparison_or_ovf_op,
      valid_addressing_size, get_scale, SAVE_DEFAULT_REGS, SAVE_GCREF_REGS,
-     SAVE_ALL_REGS)
+     SAVE_ALL_REGS, RegisterHints, compute_real_usages)
 from rpython.jit.backend.x86 import rx86
 from rpython.jit.backend.x86.arch import (WORD, JITFRAME_FIXED_SIZE, IS_X86_32,
     IS_X86_64, DEFAULT_FRAME_BYTES)
 from rpython.jit.backend.x86.jump import remap_frame_layout_mixed
-from rpython.jit.backend.x86.regloc import (FrameLoc, RegLoc, ConstFloatLoc,
-    FloatImmedLoc, ImmedLoc, imm, imm0, imm1, ecx, eax, edx, ebx, esi, edi,
-    ebp, r8, r9, r10, r11, r12, r13, r14, r15, xmm0, xmm1, xmm2, xmm3, xmm4,
-    xmm5, xmm6, xmm7, xmm8, xmm9, xmm10, xmm11, xmm12, xmm13, xmm14,
-    X86_64_SCRATCH_REG, X86_64_XMM_SCRATCH_REG)
-from rpython.jit.backend.x86.vector_ext import VectorRegallocMixin
+from rpython.jit.backend.x86.regloc import (FrameLoc, YmmFrameLoc, RegLoc,
+    ConstFloatLoc, FloatImmedLoc, ImmedLoc, imm, imm0, imm1, ecx, eax, edx,
+    ebx, esi, edi, ebp, r8, r9, r10, r11, r12, r13, r14, r15, xmm0, xmm1,
+    xmm2, xmm3, xmm4, xmm5, xmm6, xmm7, xmm8, xmm9, xmm10, xmm11, xmm12,
+    xmm13, xmm14, X86_64_SCRATCH_REG, X86_64_XMM_SCRATCH_REG)
+from rpython.jit.backend.x86.vector_ext import (VectorRegallocMixin,
+    is_ymm, ymm)
 from rpython.jit.codewriter import longlong
 from rpython.jit.codewriter.effectinfo import EffectInfo
 from rpython.jit.metainterp.history import (Const, ConstInt, ConstPtr,
@@ -126,6 +127,32 @@ class X86FrameManager(FrameManager):
         else:
             return 1
 
+    def box_frame_size(self, box):
+        if is_ymm(box):
+            return 4
+        return self.frame_size(box.type)
+
+    def get_new_loc(self, box):
+        if not is_ymm(box):
+            return FrameManager.get_new_loc(self, box)
+        # a 256-bit vector: four words, always taken at the end of the
+        # frame (the free list only hands out one or two words)
+        index = self.get_frame_depth()
+        newloc = YmmFrameLoc(index, get_ebp_ofs(self.base_ofs, index),
+                             box.type)
+        self.current_frame_depth += 4
+        self.bindings[box] = newloc
+        if not we_are_translated():
+            self._check_invariants()
+        return newloc
+
+    def bind(self, box, loc):
+        if is_ymm(box) and not isinstance(loc, YmmFrameLoc):
+            # the input arguments of a bridge get plain FrameLocs
+            assert isinstance(loc, FrameLoc)
+            loc = YmmFrameLoc(loc.position, loc.value, loc.type)
+        FrameManager.bind(self, box, loc)
+
     @staticmethod
     def get_loc_index(loc):
         assert isinstance(loc, FrameLoc)
@@ -147,6 +174,10 @@ for _i, _reg in enumerate(gpr_reg_mgr_cls.all_regs):
 
 class RegAlloc(BaseRegalloc, VectorRegallocMixin):
 
+    # False to allocate registers without the RegisterHints, to compare
+    # the number of moves and spills
+    use_register_hints = True
+
     def __init__(self, assembler, translate_support_code=False):
         assert isinstance(translate_support_code, bool)
         # variables that have place in register
@@ -155,6 +186,7 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
         # to be read/used by the assembler too
         self.jump_target_descr = None
         self.final_jump_op = None
+        self.final_jump_position = -1
 
     def _prepare(self, inputargs, operations, allgcrefs):
         for box in inputargs:
@@ -168,13 +200,66 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
                                                     inputargs, operations)
         self.longevity = longevity
         self.last_real_usage = last_real_usage
+        if self.use_register_hints:
+            self.hints = RegisterHints(compute_real_usages(operations))
+            self.compute_register_hints(operations)
+        else:
+            self.hints = None
         self.rm = gpr_reg_mgr_cls(self.longevity,
                                   frame_manager = self.fm,
-                                  assembler = self.assembler)
+                                  assembler = self.assembler,
+                                  hints = self.hints)
         self.xrm = xmm_reg_mgr_cls(self.longevity, frame_manager = self.fm,
-                                   assembler = self.assembler)
+                                   assembler = self.assembler,
+                                   hints = self.hints)
+        self.num_jump_moves = 0
+        self.num_call_arg_moves = 0
+        self.assembler.uses_ymm = self.uses_ymm_registers(inputargs,
+                                                          operations)
         return operations
 
+    def compute_register_hints(self, operations):
+        # fill 'self.hints' with the registers in which some variables
+        # are needed: the shift count of shifts, and on x86-64 the
+        # arguments of calls that die at the call
+        for i in range(len(operations)):
+            op = operations[i]
+            opnum = op.getopnum()
+            if (opnum == rop.INT_LSHIFT or opnum == rop.INT_RSHIFT or
+                    opnum == rop.UINT_RSHIFT):
+                arg = op.getarg(1)
+                if not isinstance(arg, Const):
+                    self.hints.fixed_register(i, ecx, arg)
+            elif IS_X86_64 and rop.is_plain_call(opnum):
+                self._compute_call_hints(op, i, first_arg_index=1)
+            elif IS_X86_64 and rop.is_call_release_gil(opnum):
+                self._compute_call_hints(op, i, first_arg_index=2)
+
+    def _compute_call_hints(self, op, position, first_arg_index):
+        from rpython.jit.backend.x86.callbuilder import CallBuilder64
+        calldescr = op.getdescr()
+        assert isinstance(calldescr, CallDescr)
+        effectinfo = calldescr.get_extra_info()
+        if (effectinfo is not None and
+                effectinfo.oopspecindex != EffectInfo.OS_NONE):
+            return    # may be one of the special-cased calls
+        next_gpr = 0
+        next_xmm = 0
+        for i in range(first_arg_index, op.numargs()):
+            arg = op.getarg(i)
+            if arg.type == FLOAT:
+                regs = CallBuilder64.ARGUMENTS_XMM
+                index = next_xmm
+                next_xmm += 1
+            else:
+                regs = CallBuilder64.ARGUMENTS_GPR
+                index = next_gpr
+                next_gpr += 1
+            if index >= len(regs) or isinstance(arg, Const):
+                continue
+            if self.longevity[arg][1] == position:
+                self.hints.fixed_register(position, regs[index], arg)
+
     def prepare_loop(self, inputargs, operations, looptoken, allgcrefs):
         operations = self._prepare(inputargs, operations, allgcrefs)
         self._set_initial_bindings(inputargs, looptoken)
@@ -276,7 +361,7 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
             arg = inputargs[i]
             i += 1
             if isinstance(loc, RegLoc):
-                if arg.type == FLOAT:
+                if arg.type == FLOAT or arg.is_vector():
                     self.xrm.reg_bindings[arg] = loc
                     used[loc] = None
                 else:
@@ -324,7 +409,11 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
         if descr.rd_vector_info:
             accuminfo = descr.rd_vector_info
             while accuminfo:
-                accuminfo.location = faillocs[accuminfo.getpos_in_failargs()]
+                pos = accuminfo.getpos_in_failargs()
+                accuminfo.location = faillocs[pos]
+                if is_ymm(guard_op.getfailargs()[pos]):
+                    # the location of the whole accumulator
+                    accuminfo.location = ymm(faillocs[pos])
                 loc = self.loc(accuminfo.getoriginal())
                 faillocs[accuminfo.getpos_in_failargs()] = loc
                 accuminfo = accuminfo.next()
@@ -371,6 +460,13 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
             i += 1
         assert not self.rm.reg_bindings
         assert not self.xrm.reg_bindings
+        tracker = self.assembler.cpu.tracker
+        tracker.total_regalloc_moves += (self.rm.num_moves +
+                                         self.xrm.num_moves +
+                                         self.num_jump_moves +
+                                         self.num_call_arg_moves)
+        tracker.total_regalloc_spills += (self.rm.num_spills +
+                                          self.xrm.num_spills)
         if not we_are_translated():
             self.assembler.mc.UD2()
         self.flush_loop()
@@ -469,6 +565,7 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
     consider_guard_no_overflow = consider_guard_no_exception
     consider_guard_overflow    = consider_guard_no_exception
     consider_guard_not_forced  = consider_guard_no_exception
+    consider_guard_always_fails = consider_guard_no_exception
 
     def consider_guard_value(self, op):
         x = self.make_sure_var_in_reg(op.getarg(0))
@@ -1315,6 +1412,7 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
         if op.getopnum() != rop.JUMP:
             return
         self.final_jump_op = op
+        self.final_jump_position = len(operations) - 1
         descr = op.getdescr()
         assert isinstance(descr, TargetToken)
         if descr._ll_loop_code != 0:
@@ -1331,12 +1429,17 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
         arglocs = descr._x86_arglocs
         jump_op = self.final_jump_op
         assert len(arglocs) == jump_op.numargs()
+        position = self.final_jump_position
         for i in range(jump_op.numargs()):
             box = jump_op.getarg(i)
             if not isinstance(box, Const):
                 loc = arglocs[i]
                 if isinstance(loc, FrameLoc):
                     self.fm.hint_frame_pos[box] = self.fm.get_loc_index(loc)
+                elif (isinstance(loc, RegLoc) and loc is not ebp and
+                          self.hints is not None):
+                    # the register where the box is needed at the JUMP
+                    self.hints.fixed_register(position, loc, box)
 
     def consider_jump(self, op):
         assembler = self.assembler
@@ -1356,6 +1459,8 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
             box = op.getarg(i)
             src_loc = self.loc(box)
             dst_loc = arglocs[i]
+            if src_loc._getregkey() != dst_loc._getregkey():
+                self.num_jump_moves += 1
             if box.type != FLOAT and not box.is_vector():
                 src_locations1.append(src_loc)
                 dst_locations1.append(dst_loc)
@@ -37,6 +37,7 @@ class AssemblerLocation(object):
     def value_j(self): return self.value
     def value_i(self): return self.value
     def value_x(self): return self.value
+    def value_y(self): return self.value
     def value_a(self): raise AssertionError("value_a undefined")
     def value_m(self): raise AssertionError("value_m undefined")
 
@@ -128,6 +129,15 @@ class FrameLoc(RawEbpLoc):
     def get_position(self):
         return self.position
 
+class YmmFrameLoc(FrameLoc):
+    """ A spilled 256-bit vector: four words of the frame, read and
+    written with VMOVUPD.
+    """
+    _immutable_ = True
+
+    def get_width(self):
+        return 32
+
 class RegLoc(AssemblerLocation):
     _immutable_ = True
     def __init__(self, regnum, is_xmm):
@@ -174,6 +184,22 @@ class RegLoc(AssemblerLocation):
     def is_core_reg(self):
         return True
 
+class YmmRegLoc(RegLoc):
+    """ The whole 256 bits of an xmm register, for the AVX2 instructions
+    of the vector backend.  It is only used as an operand of these
+    instructions, the register allocator still hands out XMMREGLOCS.
+    """
+    _immutable_ = True
+    def __init__(self, regnum):
+        RegLoc.__init__(self, regnum, is_xmm=True)
+        self._location_code = 'y'
+
+    def __repr__(self):
+        return 'ymm%d' % self.value
+
+    def get_width(self):
+        return 32
+
 class ImmediateAssemblerLocation(AssemblerLocation):
     _immutable_ = True
 
@@ -335,6 +361,7 @@ if IS_X86_64:
 
 REGLOCS = [RegLoc(i, is_xmm=False) for i in range(16)]
 XMMREGLOCS = [RegLoc(i, is_xmm=True) for i in range(16)]
+YMMREGLOCS = [YmmRegLoc(i) for i in range(16)]
 eax, ecx, edx, ebx, esp, ebp, esi, edi, r8, r9, r10, r11, r12, r13, r14, r15 = REGLOCS
 xmm0, xmm1, xmm2, xmm3, xmm4, xmm5, xmm6, xmm7, xmm8, xmm9, xmm10, xmm11, xmm12, xmm13, xmm14, xmm15 = XMMREGLOCS
 
@@ -356,7 +383,7 @@ X86_64_SCRATCH_REG = r11
 X86_64_XMM_SCRATCH_REG = xmm15
 
 # note: 'r' is after 'i' in this list, for _binaryop()
-unrolling_location_codes = unrolling_iterable(list("irbsmajx"))
+unrolling_location_codes = unrolling_iterable(list("irbsmajxy"))
 
 @specialize.arg(1)
 def _rx86_getattr(obj, methname):
@@ -710,6 +737,10 @@ class LocationCodeBuilder(object):
     MOVDQU = _binaryop('MOVDQU')
     MOVUPD = _binaryop('MOVUPD')
     MOVUPS = _binaryop('MOVUPS')
+    VMOVDQA = _binaryop('VMOVDQA')
+    VMOVDQU = _binaryop('VMOVDQU')
+    VMOVUPD = _binaryop('VMOVUPD')
+    VMOVUPS = _binaryop('VMOVUPS')
     ADDSD = _binaryop('ADDSD')
     SUBSD = _binaryop('SUBSD')
     MULSD = _binaryop('MULSD')
@@ -53,6 +53,9 @@ class AbstractX86CPU(AbstractLLCPU):
     def set_debug(self, flag):
         return self.assembler.set_debug(flag)
 
+    def set_guard_counters(self, flag):
+        return self.assembler.set_guard_counters(flag)
+
     def setup(self):
         self.assembler = Assembler386(self, self.translate_support_code)
 
@@ -348,6 +348,51 @@ rex_w  = encode_rex, 0, REX_W, None       # a REX.W prefix
 rex_nw = encode_rex_opt, 0, 0, None       # an optional REX prefix
 rex_fw = encode_rex, 0, 0, None           # a forced REX prefix
 
+# ____________________________________________________________
+# For AVX (64-bits mode only): the VEX prefix, which replaces the REX
+# prefix, the mandatory 0x66/0xF3/0xF2 prefix and the 0x0F/0x0F38/0x0F3A
+# escape bytes.  It also encodes an additional source register in its
+# 'vvvv' field; the rex_step of 'vex_register' stores this register in
+# the bits 4-7 of the REX byte computed by insn().
+
+VEX_PP = {'': 0, '\x66': 1, '\xF3': 2, '\xF2': 3}
+VEX_MMMMM = {'\x0F': 1, '\x0F\x38': 2, '\x0F\x3A': 3}
+
+@specialize.arg(2)
+def encode_vex(mc, rexbyte, extra, orbyte):
+    assert mc.WORD == 8
+    mmmmm = extra >> 8
+    w = extra & 0x80
+    lpp = extra & 0x07
+    vvvv = (~rexbyte >> 4) & 0xF
+    if mmmmm == 1 and w == 0 and (rexbyte & (REX_X | REX_B)) == 0:
+        # the 2-bytes form
+        mc.writechar('\xC5')
+        mc.writechar(chr((((rexbyte & REX_R) ^ REX_R) << 5) |
+                         (vvvv << 3) | lpp))
+    else:
+        mc.writechar('\xC4')
+        mc.writechar(chr((((rexbyte & 7) ^ 7) << 5) | mmmmm))
+        mc.writechar(chr(w | (vvvv << 3) | lpp))
+    return 0
+
+def vex(pp, escape, w=0, l=1):
+    """The VEX prefix.  'l' is 1 for 256-bit operations (ymm registers)
+    and 0 for 128-bit operations; 'w' is 1 for the few instructions that
+    need a REX.W."""
+    extra = (VEX_MMMMM[escape] << 8) | (w << 7) | (l << 2) | VEX_PP[pp]
+    return encode_vex, 0, extra, None
+
+def encode_vex_register(mc, reg, _, orbyte):
+    return orbyte     # already encoded in the VEX prefix
+
+def rex_vex_register(mc, reg, _):
+    assert 0 <= reg < 16
+    return reg << 4
+
+def vex_register(argnum):
+    return encode_vex_register, argnum, None, rex_vex_register
+
 # ____________________________________________________________
 
 def insn(*encoding):
@@ -797,6 +842,40 @@ class AbstractX86CodeBuilder(object):
     CMPPD_xxi = xmminsn('\x66', rex_nw, '\x0F\xC2', register(1,8), register(2), '\xC0', immediate(3, 'b'))
     CMPPS_xxi = xmminsn(        rex_nw, '\x0F\xC2', register(1,8), register(2), '\xC0', immediate(3, 'b'))
 
+    # following require AVX2, and are only available on 64-bit.
+    # The 'y' operands are ymm registers.
+    VZEROUPPER = xmminsn(vex('', '\x0F', l=0), '\x77')
+    VMOVAPD_yy = xmminsn(vex('\x66', '\x0F'), '\x28', register(1,8), register(2), '\xC0')
+
+    VPCMPEQQ_yyy = xmminsn(vex('\x66', '\x0F\x38'), '\x29', register(1,8), vex_register(2), register(3), '\xC0')
+    VPMULLD_yyy = xmminsn(vex('\x66', '\x0F\x38'), '\x40', register(1,8), vex_register(2), register(3), '\xC0')
+    VPTEST_yy = xmminsn(vex('\x66', '\x0F\x38'), '\x17', register(1,8), register(2), '\xC0')
+    VCVTDQ2PD_yx = xmminsn(vex('\xF3', '\x0F'), '\xE6', register(1,8), register(2), '\xC0')
+    VCVTPD2DQ_xy = xmminsn(vex('\xF2', '\x0F'), '\xE6', register(1,8), register(2), '\xC0')
+    VCVTPS2PD_yx = xmminsn(vex('', '\x0F'), '\x5A', register(1,8), register(2), '\xC0')
+    VCVTPD2PS_xy = xmminsn(vex('\x66', '\x0F'), '\x5A', register(1,8), register(2), '\xC0')
+    VPMOVSXDQ_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x25', register(1,8), register(2), '\xC0')
+    VPBROADCASTB_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x78', register(1,8), register(2), '\xC0')
+    VPBROADCASTW_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x79', register(1,8), register(2), '\xC0')
+    VPBROADCASTD_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x58', register(1,8), register(2), '\xC0')
+    VPBROADCASTQ_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x59', register(1,8), register(2), '\xC0')
+    VBROADCASTSS_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x18', register(1,8), register(2), '\xC0')
+    VBROADCASTSD_yx = xmminsn(vex('\x66', '\x0F\x38'), '\x19', register(1,8), register(2), '\xC0')
+
+    VPSHUFD_yyi = xmminsn(vex('\x66', '\x0F'), '\x70', register(1,8), register(2), '\xC0', immediate(3, 'b'))
+    VPERMQ_yyi = xmminsn(vex('\x66', '\x0F\x3A', w=1), '\x00', register(1,8), register(2), '\xC0', immediate(3, 'b'))
+    VPBLENDD_yyyi = xmminsn(vex('\x66', '\x0F\x3A'), '\x02', register(1,8), vex_register(2), register(3), '\xC0', immediate(4, 'b'))
+    VINSERTI128_yyxi = xmminsn(vex('\x66', '\x0F\x3A'), '\x38', register(1,8), vex_register(2), register(3), '\xC0', immediate(4, 'b'))
+    VEXTRACTI128_xyi = xmminsn(vex('\x66', '\x0F\x3A'), '\x39', register(1), register(2,8), '\xC0', immediate(3, 'b'))
+    VCMPPD_yyyi = xmminsn(vex('\x66', '\x0F'), '\xC2', register(1,8), vex_register(2), register(3), '\xC0', immediate(4, 'b'))
+    VCMPPS_yyyi = xmminsn(vex('', '\x0F'), '\xC2', register(1,8), vex_register(2), register(3), '\xC0', immediate(4, 'b'))
+
+    # shifts by an immediate: the destination is in 'vvvv'
+    VPSRLD_yyi = xmminsn(vex('\x66', '\x0F'), '\x72', vex_register(1), orbyte(2<<3), register(2), '\xC0', immediate(3, 'b'))
+    VPSLLD_yyi = xmminsn(vex('\x66', '\x0F'), '\x72', vex_register(1), orbyte(6<<3), register(2), '\xC0', immediate(3, 'b'))
+    VPSRLQ_yyi = xmminsn(vex('\x66', '\x0F'), '\x73', vex_register(1), orbyte(2<<3), register(2), '\xC0', immediate(3, 'b'))
+    VPSLLQ_yyi = xmminsn(vex('\x66', '\x0F'), '\x73', vex_register(1), orbyte(6<<3), register(2), '\xC0', immediate(3, 'b'))
+
     # ------------------------------------------------------------
 
 Conditions = {
@@ -908,11 +987,11 @@ def define_modrm_modes(insnname_template, before_modrm, after_modrm=[], regtype=
         args = before_modrm + list(modrm)
         methname = insnname_template.replace('*', code)
         if (methname.endswith('_rr') or methname.endswith('_xx')
-                or methname.endswith('_ri')):
+                or methname.endswith('_yy') or methname.endswith('_ri')):
             args.append('\xC0')
         args += after_modrm
 
-        if regtype == 'XMM':
+        if regtype == 'XMM' or regtype == 'YMM':
             insn_func = xmminsn(*args)
         else:
             insn_func = insn(*args)
@@ -928,6 +1007,8 @@ def define_modrm_modes(insnname_template, before_modrm, after_modrm=[], regtype=
         add_insn('r', byte_register(modrm_argnum))
     elif regtype == 'XMM':
         add_insn('x', register(modrm_argnum))
+    elif regtype == 'YMM':
+        add_insn('y', register(modrm_argnum))
     else:
         raise AssertionError("Invalid type")
 
@@ -974,6 +1055,15 @@ define_modrm_modes('MOVUPS_*x', [        rex_nw, '\x0F\x11', register(2, 8)], re
 define_modrm_modes('MOVUPD_x*', ['\x66', rex_nw, '\x0F\x10', register(1, 8)], regtype='XMM')
 define_modrm_modes('MOVUPD_*x', ['\x66', rex_nw, '\x0F\x11', register(2, 8)], regtype='XMM')
 
+define_modrm_modes('VMOVDQA_y*', [vex('\x66', '\x0F'), '\x6F', register(1, 8)], regtype='YMM')
+define_modrm_modes('VMOVDQA_*y', [vex('\x66', '\x0F'), '\x7F', register(2, 8)], regtype='YMM')
+define_modrm_modes('VMOVDQU_y*', [vex('\xF3', '\x0F'), '\x6F', register(1, 8)], regtype='YMM')
+define_modrm_modes('VMOVDQU_*y', [vex('\xF3', '\x0F'), '\x7F', register(2, 8)], regtype='YMM')
+define_modrm_modes('VMOVUPS_y*', [vex('', '\x0F'), '\x10', register(1, 8)], regtype='YMM')
+define_modrm_modes('VMOVUPS_*y', [vex('', '\x0F'), '\x11', register(2, 8)], regtype='YMM')
+define_modrm_modes('VMOVUPD_y*', [vex('\x66', '\x0F'), '\x10', register(1, 8)], regtype='YMM')
+define_modrm_modes('VMOVUPD_*y', [vex('\x66', '\x0F'), '\x11', register(2, 8)], regtype='YMM')
+
 define_modrm_modes('SQRTSD_x*', ['\xF2', rex_nw, '\x0F\x51', register(1,8)], regtype='XMM')
 
 define_modrm_modes('XCHG_r*', [rex_w, '\x87', register(1, 8)])
@@ -1040,6 +1130,40 @@ define_pxmm_insn('PCMPEQD_x*',   '\x76')
 define_pxmm_insn('PCMPEQW_x*',   '\x75')
 define_pxmm_insn('PCMPEQB_x*',   '\x74')
 
+def define_vex_insn(insnname, pp, opcode):
+    # 'insnname_yyy': ymm1 = ymm2 <op> ymm3
+    if len(opcode) > 1:
+        escape = '\x0F' + opcode[0]
+        opcode = opcode[1:]
+    else:
+        escape = '\x0F'
+    insn_func = xmminsn(vex(pp, escape), opcode, register(1, 8),
+                        vex_register(2), register(3), '\xC0')
+    methname = insnname + '_yyy'
+    assert not hasattr(AbstractX86CodeBuilder, methname)
+    setattr(AbstractX86CodeBuilder, methname, insn_func)
+
+define_vex_insn('VPADDQ',   '\x66', '\xD4')
+define_vex_insn('VPADDD',   '\x66', '\xFE')
+define_vex_insn('VPADDW',   '\x66', '\xFD')
+define_vex_insn('VPADDB',   '\x66', '\xFC')
+define_vex_insn('VPSUBQ',   '\x66', '\xFB')
+define_vex_insn('VPSUBD',   '\x66', '\xFA')
+define_vex_insn('VPSUBW',   '\x66', '\xF9')
+define_vex_insn('VPSUBB',   '\x66', '\xF8')
+define_vex_insn('VPMULLW',  '\x66', '\xD5')
+define_vex_insn('VPAND',    '\x66', '\xDB')
+define_vex_insn('VPOR',     '\x66', '\xEB')
+define_vex_insn('VPXOR',    '\x66', '\xEF')
+define_vex_insn('VPCMPEQD', '\x66', '\x76')
+define_vex_insn('VPCMPEQW', '\x66', '\x75')
+define_vex_insn('VPCMPEQB', '\x66', '\x74')
+for _name, _opcode in [('ADD', '\x58'), ('SUB', '\x5C'), ('MUL', '\x59'),
+                       ('DIV', '\x5E'), ('AND', '\x54'), ('XOR', '\x57')]:
+    define_vex_insn('V%sPD' % _name, '\x66', _opcode)
+    define_vex_insn('V%sPS' % _name, '', _opcode)
+del _name, _opcode
+
 # ____________________________________________________________
 
 _classes = (AbstractX86CodeBuilder, X86_64_CodeBuilder, X86_32_CodeBuilder)
@@ -8,9 +8,11 @@ class FakeAssembler:
     class _regalloc:
         class rm:
             free_regs = [ebx]
+        num_call_arg_moves = 0
 
     def __init__(self):
         self._log = []
+        self._regalloc.num_call_arg_moves = 0
 
     def _is_asmgcc(self):
         return False
@@ -32,6 +34,7 @@ def test_base_case(call_release_gil_mode=False):
     cb.prepare_arguments()
     assert asm._log == [('mov', ebx, edi),
                         ('mov', ebx, esi)]
+    assert asm._regalloc.num_call_arg_moves == 2
 
 def test_call_release_gil():
     test_base_case(call_release_gil_mode=True)
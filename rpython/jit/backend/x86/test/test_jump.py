@@ -226,6 +226,32 @@ def test_mixed():
                                  ('mov', edi, s3),
                                  ('pop', s45)]
 
+def test_mixed_ymm():
+    # a 256-bit vector takes four words of the frame
+    assembler = MockAssembler()
+    s4567 = YmmFrameLoc(4, frame_pos(4, INT).value, INT)
+    s5 = frame_pos(5, FLOAT)
+    remap_frame_layout_mixed(assembler, [], [], 'tmp',
+                                        [s4567, xmm2], [xmm3, s5], 'xmmtmp')
+    assert assembler.ops == [('push', s4567),
+                             ('mov', xmm2, s5),
+                             ('pop', xmm3)]
+    #
+    assembler = MockAssembler()
+    remap_frame_layout_mixed(assembler, [], [], 'tmp',
+                                        [s5, xmm2], [xmm3, s4567], 'xmmtmp')
+    assert assembler.ops == [('push', s5),
+                             ('mov', xmm2, s4567),
+                             ('pop', xmm3)]
+    #
+    assembler = MockAssembler()
+    s6 = frame_pos(6, INT)
+    remap_frame_layout_mixed(assembler, [ebx], [s6], 'tmp',
+                                        [s4567], [xmm3], 'xmmtmp')
+    assert assembler.ops == [('push', s4567),
+                             ('mov', ebx, s6),
+                             ('pop', xmm3)]
+
 def test_random_mixed():
     assembler = MockAssembler()
     registers1 = [eax, ebx, ecx]
@@ -13,6 +13,8 @@ from rpython.jit.metainterp.executor import execute
 from rpython.jit.backend.test.runner_test import LLtypeBackendTest
 from rpython.jit.tool.oparser import parse
 import ctypes
+from rpython.rlib.rarithmetic import r_uint
+from rpython.rlib.objectmodel import compute_unique_id
 
 CPU = getcpuclass()
 
@@ -596,10 +598,67 @@ class TestDebuggingAssembler(object):
             assert struct.i == 1
             struct = self.cpu.assembler.get_loop_run_counters(2)
             assert struct.i == 9
+            # one counter per guard, only the second one failed
+            struct = self.cpu.assembler.get_loop_run_counters(3)
+            assert struct.type == 'g'
+            assert struct.i == 0
+            struct = self.cpu.assembler.get_loop_run_counters(4)
+            assert struct.type == 'g'
+            assert struct.i == 1
+            guardno = r_uint(struct.number)
             self.cpu.finish_once()
         finally:
             debug._log = None
         l0 = ('debug_print', 'entry -1:1')
         l1 = ('debug_print', preambletoken.repr_of_descr() + ':1')
         l2 = ('debug_print', targettoken.repr_of_descr() + ':9')
-        assert ('jit-backend-counts', [l0, l1, l2]) in dlog
+        l3 = ('debug_print', 'guard %d:1' % guardno)
+        assert ('jit-backend-counts', [l0, l1, l2, l3]) in dlog
+
+    def test_debugger_counts_guard_failures(self):
+        loop = """
+        [i0]
+        i1 = int_lt(i0, 5)
+        guard_true(i1) [i0]
+        finish(i0)
+        """
+        ops = parse(loop)
+        self.cpu.assembler.set_debug(True)
+        try:
+            looptoken = JitCellToken()
+            self.cpu.compile_loop(ops.inputargs, ops.operations, looptoken)
+            for i in range(10):
+                self.cpu.execute_token(looptoken, i)
+            runs = self.cpu.get_all_loop_runs()
+            guards = [runs[i] for i in range(len(runs))
+                      if runs[i].type == 'g']
+            assert len(guards) == 1
+            assert guards[0].counter == 5
+            descr = ops.operations[1].getdescr()
+            assert guards[0].number == compute_unique_id(descr)
+        finally:
+            self.cpu.assembler.set_debug(False)
+
+    def test_guard_counters_without_debug(self):
+        loop = """
+        [i0]
+        i1 = int_lt(i0, 5)
+        guard_true(i1) [i0]
+        finish(i0)
+        """
+        ops = parse(loop)
+        assert not self.cpu.assembler._debug
+        assert self.cpu.set_guard_counters(True) is False
+        try:
+            looptoken = JitCellToken()
+            self.cpu.compile_loop(ops.inputargs, ops.operations, looptoken)
+            for i in range(10):
+                self.cpu.execute_token(looptoken, i)
+            runs = self.cpu.get_all_loop_runs()
+            # only the guard is counted, not the loop entries
+            assert [runs[i].type for i in range(len(runs))] == ['g']
+            assert runs[0].counter == 5
+            descr = ops.operations[1].getdescr()
+            assert runs[0].number == compute_unique_id(descr)
+        finally:
+            assert self.cpu.set_guard_counters(False) is True
@@ -242,3 +242,13 @@ def test_multibyte_nops():
         assert len(cls.MULTIBYTE_NOPs) == 16
         for i in range(16):
             assert len(cls.MULTIBYTE_NOPs[i]) == i
+
+def test_vex_64():
+    # the 2-bytes VEX prefix when possible, else the 3-bytes one
+    assert_encodes_as(CodeBuilder64, 'VPADDQ_yyy', (xmm1, xmm2, xmm3),
+                      '\xC5\xED\xD4\xCB')
+    assert_encodes_as(CodeBuilder64, 'VPADDQ_yyy', (xmm1, xmm2, xmm9),
+                      '\xC4\xC1\x6D\xD4\xC9')
+    assert_encodes_as(CodeBuilder64, 'VPERMQ_yyi', (xmm0, xmm1, 8),
+                      '\xC4\xE3\xFD\x00\xC1\x08')
+    assert_encodes_as(CodeBuilder64, 'VZEROUPPER', (), '\xC5\xF8\x77')
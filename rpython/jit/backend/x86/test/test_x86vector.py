@@ -3,10 +3,13 @@ from rpython.jit.backend.x86.regloc import *
 from rpython.jit.backend.x86.regalloc import (RegAlloc,
         X86FrameManager, X86XMMRegisterManager, X86RegisterManager)
 from rpython.jit.backend.x86.vector_ext import TempVector
+from rpython.jit.backend.x86 import detect_feature
 from rpython.jit.backend.x86.test import test_basic
 from rpython.jit.backend.x86.test.test_assembler import \
         (TestRegallocPushPop as BaseTestAssembler)
 from rpython.jit.metainterp.test import test_zvector
+from rpython.jit.metainterp.resoperation import (rop, VecOperationNew,
+        InputArgInt, InputArgFloat)
 from rpython.rtyper.lltypesystem import lltype
 from rpython.jit.backend.detect_cpu import getcpuclass
 
@@ -52,6 +55,35 @@ def regalloc(request):
     request.cls.asm = asm
     request.cls.regalloc = regalloc
 
+def test_ymm_frame_locations():
+    a, b = InputArgInt(), InputArgInt()
+    vec = VecOperationNew(rop.VEC_INT_ADD, [a, b], 'i', 8, True, 4)
+    vec2 = VecOperationNew(rop.VEC_INT_ADD, [a, b], 'i', 8, True, 4)
+    small = VecOperationNew(rop.VEC_INT_ADD, [a, b], 'i', 8, True, 2)
+    fm = X86FrameManager(0)
+    loc = fm.loc(InputArgFloat())
+    ymmloc = fm.loc(vec)
+    assert isinstance(ymmloc, YmmFrameLoc)
+    assert ymmloc.position == 1
+    assert ymmloc.get_width() == 32
+    assert fm.get_frame_depth() == 5
+    # the four words are given back when the vector dies
+    fm.mark_as_free(vec)
+    assert fm.freelist.len() == 4
+    assert not isinstance(fm.loc(small), YmmFrameLoc)
+    # a vector passed to a bridge on the frame
+    fm.bind(vec2, FrameLoc(6, 6 * WORD + 16, 'i'))
+    assert isinstance(fm.get(vec2), YmmFrameLoc)
+    assert fm.get_frame_depth() == 10
+
+def test_uses_ymm_registers_bridge():
+    a, b = InputArgInt(), InputArgInt()
+    vec = VecOperationNew(rop.VEC_INT_ADD, [a, b], 'i', 8, True, 4)
+    small = VecOperationNew(rop.VEC_INT_ADD, [a, b], 'i', 8, True, 2)
+    regalloc = RegAlloc(None)
+    assert not regalloc.uses_ymm_registers([a, small], [])
+    assert regalloc.uses_ymm_registers([a, vec], [])
+
 
 
 class TestAssembler(BaseTestAssembler):
@@ -116,6 +148,46 @@ class TestAssembler(BaseTestAssembler):
         res = self.do_test(callback) & 0xffffffff
         assert res == 22
 
+    def imm_4_int64(self, a, b, c, d):
+        adr = self.xrm.assembler.datablockwrapper.malloc_aligned(32, 32)
+        ptr = rffi.cast(rffi.CArrayPtr(rffi.LONGLONG), adr)
+        ptr[0] = rffi.r_longlong(a)
+        ptr[1] = rffi.r_longlong(b)
+        ptr[2] = rffi.r_longlong(c)
+        ptr[3] = rffi.r_longlong(d)
+        return adr
+
+    def test_ymm_spill_round_trip(self):
+        if WORD != 8 or not detect_feature.detect_avx2():
+            py.test.skip("needs AVX2")
+        def callback(asm):
+            # spill a 256-bit vector, reload it, push and pop it as in
+            # jump.py: the upper 128 bits must come back too
+            adr = self.imm_4_int64(11, 12, 13, 14)
+            frame = self.xrm.assembler.datablockwrapper.malloc_aligned(64, 32)
+            loc = YmmFrameLoc(0, 16, INT)
+            asm.uses_ymm = True
+            asm.mc.PUSH_r(ebp.value)
+            asm.mc.MOV_ri(ebp.value, frame)
+            asm.mc.MOV_ri(ecx.value, adr)
+            asm.mc.VMOVUPD_ym(xmm6.value, (ecx.value, 0))
+            asm.mov(xmm6, loc)
+            asm.mov(loc, xmm7)
+            asm.regalloc_push(xmm7)
+            asm.regalloc_pop(loc)
+            asm.regalloc_push(loc)
+            asm.regalloc_pop(xmm4)
+            asm.mc.POP_r(ebp.value)
+            # eax = element 2 + element 3
+            asm.mc.VEXTRACTI128_xyi(xmm4.value, xmm4.value, 1)
+            asm.mc.MOVDQ_rx(eax.value, xmm4.value)
+            asm.mc.PSRLDQ_xi(xmm4.value, 8)
+            asm.mc.MOVDQ_rx(ecx.value, xmm4.value)
+            asm.mc.ADD(eax, ecx)
+            asm.mc.VZEROUPPER()
+        res = self.do_test(callback)
+        assert res == 13 + 14
+
     def test_enforce_var(self, regalloc):
         arg = TempVector('f')
         args = []
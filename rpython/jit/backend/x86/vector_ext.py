@@ -8,7 +8,9 @@ from rpython.jit.backend.x86.regloc import (FrameLoc, RegLoc, ConstFloatLoc,
     FloatImmedLoc, ImmedLoc, imm, imm0, imm1, ecx, eax, edx, ebx, esi, edi,
     ebp, r8, r9, r10, r11, r12, r13, r14, r15, xmm0, xmm1, xmm2, xmm3, xmm4,
     xmm5, xmm6, xmm7, xmm8, xmm9, xmm10, xmm11, xmm12, xmm13, xmm14,
-    X86_64_SCRATCH_REG, X86_64_XMM_SCRATCH_REG, AddressLoc)
+    X86_64_SCRATCH_REG, X86_64_XMM_SCRATCH_REG, AddressLoc, XMMREGLOCS,
+    YMMREGLOCS)
+from rpython.jit.backend.x86.arch import IS_X86_64
 from rpython.jit.backend.llsupport.vector_ext import VectorExt
 from rpython.jit.backend.llsupport.regalloc import (get_scale, TempVar,
     NoVariableToSpill)
@@ -16,7 +18,7 @@ from rpython.jit.metainterp.resoperation import (rop, ResOperation,
         VectorOp, VectorGuardOp)
 from rpython.rlib.objectmodel import we_are_translated, always_inline
 from rpython.rtyper.lltypesystem.lloperation import llop
-from rpython.rtyper.lltypesystem import lltype
+from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.jit.backend.x86 import rx86, detect_feature
 
 # duplicated for easy migration, def in assembler.py as well
@@ -34,6 +36,17 @@ def not_implemented(msg):
     raise NotImplementedError(msg)
 # DUP END
 
+def is_ymm(box):
+    """ True if 'box' is a vector longer than 16 bytes, i.e. if it
+        uses the upper half of an ymm register (AVX2 only)
+    """
+    return (isinstance(box, VectorOp) and box.is_vector() and
+            box.bytesize * box.count > 16)
+
+def ymm(loc):
+    assert isinstance(loc, RegLoc) and loc.is_xmm
+    return YMMREGLOCS[loc.value]
+
 class TempVector(TempVar):
     def __init__(self, type):
         self.type = type
@@ -53,7 +66,12 @@ class X86VectorExt(VectorExt):
     should_align_unroll = True
 
     def setup_once(self, asm):
-        if detect_feature.detect_sse4_1():
+        if IS_X86_64 and detect_feature.detect_avx2():
+            # vectors of up to 32 bytes.  The operations on at most
+            # 16 bytes still use the SSE instructions below.
+            self.enable(32, accum=True)
+            asm.setup_once_vector()
+        elif detect_feature.detect_sse4_1():
             self.enable(16, accum=True)
             asm.setup_once_vector()
         self._setup = True
@@ -82,6 +100,9 @@ class VectorAssemblerMixin(object):
         assert ve is not None # MUST hold, optimize_vector is never entered if vector_ext is entered
         load = arg.bytesize * arg.count - ve.register_size
         assert load <= 0
+        if is_ymm(arg):
+            self._guard_vector_ymm(arg, loc, true)
+            return
         if true:
             self.mc.PXOR(temp, temp)
             # if the vector is not fully packed blend 1s
@@ -107,6 +128,36 @@ class VectorAssemblerMixin(object):
             self.mc.PTEST(loc, loc)
             self.guard_success_cc = rx86.Conditions['NZ']
 
+    def _guard_vector_ymm(self, arg, loc, true):
+        temp = X86_64_XMM_SCRATCH_REG.value
+        if true:
+            # ones at each slot that is zero
+            self.mc.VPXOR_yyy(temp, temp, temp)
+            self._vpcmpeq(arg.bytesize, loc.value, loc.value, temp)
+            # test if all the used slots were non zero
+            self._load_used_slots_mask(arg, temp)
+            self.mc.VPTEST_yy(loc.value, temp)
+            self.guard_success_cc = rx86.Conditions['Z']
+        else:
+            self._load_used_slots_mask(arg, temp)
+            self.mc.VPTEST_yy(loc.value, temp)
+            self.guard_success_cc = rx86.Conditions['NZ']
+
+    def _load_used_slots_mask(self, arg, temp):
+        # ones in all the bytes of the used slots, zeros elsewhere
+        used = arg.bytesize * arg.count
+        if used == 32:
+            self.mc.VPCMPEQQ_yyy(temp, temp, temp)
+        else:
+            adr = self.datablockwrapper.malloc_aligned(32, 32)
+            mask = rffi.cast(rffi.CCHARP, adr)
+            for i in range(32):
+                if i < used:
+                    mask[i] = '\xFF'
+                else:
+                    mask[i] = '\x00'
+            self.mc.VMOVDQU(YMMREGLOCS[temp], heap(adr))
+
     def _blend_unused_slots(self, loc, arg, temp):
         select = 0
         bits_used = (arg.count * arg.bytesize * 8)
@@ -132,6 +183,10 @@ class VectorAssemblerMixin(object):
             scalar_arg = accum_info.getoriginal()
             assert isinstance(vector_loc, RegLoc)
             assert scalar_arg is not None
+            if vector_loc.location_code() == 'y':
+                # first fold the upper half of the ymm register
+                vector_loc = self._accum_fold_ymm(scalar_arg,
+                                    accum_info.accum_operation, vector_loc)
             orig_scalar_loc = scalar_loc
             tmpvar = None
             if not isinstance(scalar_loc, RegLoc):
@@ -155,6 +210,24 @@ class VectorAssemblerMixin(object):
                 self.mov(scalar_loc, orig_scalar_loc)
             accum_info = accum_info.next()
 
+    def _accum_fold_ymm(self, arg, operation, accumloc):
+        # the upper half holds two more elements of the accumulator:
+        # combine them with the two elements of the lower half
+        loc = XMMREGLOCS[accumloc.value]
+        scratch = X86_64_XMM_SCRATCH_REG
+        self.mc.VEXTRACTI128_xyi(scratch.value, accumloc.value, 1)
+        if operation == '+':
+            if arg.type == FLOAT:
+                self.mc.ADDPD(loc, scratch)
+            else:
+                self.mc.PADDQ(loc, scratch)
+        elif operation == '*':
+            self.mc.MULPD(loc, scratch)
+        else:
+            not_implemented("accum operator %s not implemented" %
+                                        (operation,))
+        return loc
+
     def _accum_reduce_mul(self, arg, accumloc, targetloc):
         self.mov(accumloc, targetloc)
         # swap the two elements
@@ -184,6 +257,10 @@ class VectorAssemblerMixin(object):
     def _genop_vec_load(self, op, arglocs, resloc):
         base_loc, ofs_loc, size_loc, scale, ofs, integer_loc = arglocs
         src_addr = addr_add(base_loc, ofs_loc, ofs.value, scale.value)
+        if is_ymm(op):
+            self._vec_load_ymm(ymm(resloc), src_addr, integer_loc.value,
+                               size_loc.value)
+            return
         self._vec_load(resloc, src_addr, integer_loc.value,
                        size_loc.value, False)
 
@@ -203,13 +280,35 @@ class VectorAssemblerMixin(object):
             elif itemsize == 8:
                 self.mc.MOVUPD(resloc, src_addr)
 
+    def _vec_load_ymm(self, resloc, src_addr, integer, itemsize):
+        if integer:
+            self.mc.VMOVDQU(resloc, src_addr)
+        else:
+            if itemsize == 4:
+                self.mc.VMOVUPS(resloc, src_addr)
+            elif itemsize == 8:
+                self.mc.VMOVUPD(resloc, src_addr)
+
     def genop_discard_vec_store(self, op, arglocs):
         base_loc, ofs_loc, value_loc, size_loc, scale,\
                 baseofs, integer_loc = arglocs
         dest_loc = addr_add(base_loc, ofs_loc, baseofs.value, scale.value)
+        if is_ymm(op.getarg(2)):
+            self._vec_store_ymm(dest_loc, ymm(value_loc), integer_loc.value,
+                                size_loc.value)
+            return
         self._vec_store(dest_loc, value_loc, integer_loc.value,
                         size_loc.value, False)
 
+    def _vec_store_ymm(self, dest_loc, value_loc, integer, itemsize):
+        if integer:
+            self.mc.VMOVDQU(dest_loc, value_loc)
+        else:
+            if itemsize == 4:
+                self.mc.VMOVUPS(dest_loc, value_loc)
+            elif itemsize == 8:
+                self.mc.VMOVUPD(dest_loc, value_loc)
+
     @always_inline
     def _vec_store(self, dest_loc, value_loc, integer, itemsize, aligned):
         if integer:
@@ -226,6 +325,11 @@ class VectorAssemblerMixin(object):
     def genop_vec_int_is_true(self, op, arglocs, resloc):
         loc, sizeloc = arglocs
         temp = X86_64_XMM_SCRATCH_REG
+        if is_ymm(op):
+            self.mc.VPXOR_yyy(temp.value, temp.value, temp.value)
+            self._vpcmpeq(sizeloc.value, loc.value, loc.value, temp.value)
+            self._vpcmpeq(sizeloc.value, loc.value, loc.value, temp.value)
+            return
         self.mc.PXOR(temp, temp)
         # every entry that is non zero -> becomes zero
         # zero entries become ones
@@ -237,7 +341,12 @@ class VectorAssemblerMixin(object):
     def genop_vec_int_mul(self, op, arglocs, resloc):
         loc0, loc1, itemsize_loc = arglocs
         itemsize = itemsize_loc.value
-        if itemsize == 2:
+        if is_ymm(op) and (itemsize == 2 or itemsize == 4):
+            if itemsize == 2:
+                self.mc.VPMULLW_yyy(loc0.value, loc0.value, loc1.value)
+            else:
+                self.mc.VPMULLD_yyy(loc0.value, loc0.value, loc1.value)
+        elif itemsize == 2:
             self.mc.PMULLW(loc0, loc1)
         elif itemsize == 4:
             self.mc.PMULLD(loc0, loc1)
@@ -249,7 +358,16 @@ class VectorAssemblerMixin(object):
     def genop_vec_int_add(self, op, arglocs, resloc):
         loc0, loc1, size_loc = arglocs
         size = size_loc.value
-        if size == 1:
+        if is_ymm(op):
+            if size == 1:
+                self.mc.VPADDB_yyy(loc0.value, loc0.value, loc1.value)
+            elif size == 2:
+                self.mc.VPADDW_yyy(loc0.value, loc0.value, loc1.value)
+            elif size == 4:
+                self.mc.VPADDD_yyy(loc0.value, loc0.value, loc1.value)
+            elif size == 8:
+                self.mc.VPADDQ_yyy(loc0.value, loc0.value, loc1.value)
+        elif size == 1:
             self.mc.PADDB(loc0, loc1)
         elif size == 2:
             self.mc.PADDW(loc0, loc1)
@@ -261,7 +379,9 @@ class VectorAssemblerMixin(object):
     def genop_vec_int_sub(self, op, arglocs, resloc):
         loc0, loc1, size_loc = arglocs
         size = size_loc.value
-        if size == 1:
+        if is_ymm(op):
+            self._vpsub(size, loc0.value, loc0.value, loc1.value)
+        elif size == 1:
             self.mc.PSUBB(loc0, loc1)
         elif size == 2:
             self.mc.PSUBW(loc0, loc1)
@@ -270,13 +390,42 @@ class VectorAssemblerMixin(object):
         elif size == 8:
             self.mc.PSUBQ(loc0, loc1)
 
+    def _vpsub(self, size, res, loc0, loc1):
+        if size == 1:
+            self.mc.VPSUBB_yyy(res, loc0, loc1)
+        elif size == 2:
+            self.mc.VPSUBW_yyy(res, loc0, loc1)
+        elif size == 4:
+            self.mc.VPSUBD_yyy(res, loc0, loc1)
+        elif size == 8:
+            self.mc.VPSUBQ_yyy(res, loc0, loc1)
+
+    def _vpcmpeq(self, size, res, loc0, loc1):
+        if size == 1:
+            self.mc.VPCMPEQB_yyy(res, loc0, loc1)
+        elif size == 2:
+            self.mc.VPCMPEQW_yyy(res, loc0, loc1)
+        elif size == 4:
+            self.mc.VPCMPEQD_yyy(res, loc0, loc1)
+        elif size == 8:
+            self.mc.VPCMPEQQ_yyy(res, loc0, loc1)
+
     def genop_vec_int_and(self, op, arglocs, resloc):
+        if is_ymm(op):
+            self.mc.VPAND_yyy(resloc.value, resloc.value, arglocs[0].value)
+            return
         self.mc.PAND(resloc, arglocs[0])
 
     def genop_vec_int_or(self, op, arglocs, resloc):
+        if is_ymm(op):
+            self.mc.VPOR_yyy(resloc.value, resloc.value, arglocs[0].value)
+            return
         self.mc.POR(resloc, arglocs[0])
 
     def genop_vec_int_xor(self, op, arglocs, resloc):
+        if is_ymm(op):
+            self.mc.VPXOR_yyy(resloc.value, resloc.value, arglocs[0].value)
+            return
         self.mc.PXOR(resloc, arglocs[0])
 
     genop_vec_float_xor = genop_vec_int_xor
@@ -285,7 +434,12 @@ class VectorAssemblerMixin(object):
     def genop_vec_float_{type}(self, op, arglocs, resloc):
         loc0, loc1, itemsize_loc = arglocs
         itemsize = itemsize_loc.value
-        if itemsize == 4:
+        if is_ymm(op):
+            if itemsize == 4:
+                self.mc.V{p_op_s}_yyy(loc0.value, loc0.value, loc1.value)
+            elif itemsize == 8:
+                self.mc.V{p_op_d}_yyy(loc0.value, loc0.value, loc1.value)
+        elif itemsize == 4:
             self.mc.{p_op_s}(loc0, loc1)
         elif itemsize == 8:
             self.mc.{p_op_d}(loc0, loc1)
@@ -301,7 +455,12 @@ class VectorAssemblerMixin(object):
     def genop_vec_float_truediv(self, op, arglocs, resloc):
         loc0, loc1, sizeloc = arglocs
         size = sizeloc.value
-        if size == 4:
+        if is_ymm(op):
+            if size == 4:
+                self.mc.VDIVPS_yyy(loc0.value, loc0.value, loc1.value)
+            elif size == 8:
+                self.mc.VDIVPD_yyy(loc0.value, loc0.value, loc1.value)
+        elif size == 4:
             self.mc.DIVPS(loc0, loc1)
         elif size == 8:
             self.mc.DIVPD(loc0, loc1)
@@ -309,7 +468,18 @@ class VectorAssemblerMixin(object):
     def genop_vec_float_abs(self, op, arglocs, resloc):
         src, sizeloc = arglocs
         size = sizeloc.value
-        if size == 4:
+        if is_ymm(op):
+            # the constants are only 16 bytes: build the mask of the
+            # bits other than the sign bit in the scratch register
+            temp = X86_64_XMM_SCRATCH_REG.value
+            self.mc.VPCMPEQQ_yyy(temp, temp, temp)
+            if size == 4:
+                self.mc.VPSRLD_yyi(temp, temp, 1)
+                self.mc.VANDPS_yyy(src.value, src.value, temp)
+            elif size == 8:
+                self.mc.VPSRLQ_yyi(temp, temp, 1)
+                self.mc.VANDPD_yyy(src.value, src.value, temp)
+        elif size == 4:
             self.mc.ANDPS(src, heap(self.single_float_const_abs_addr))
         elif size == 8:
             self.mc.ANDPD(src, heap(self.float_const_abs_addr))
@@ -317,7 +487,17 @@ class VectorAssemblerMixin(object):
     def genop_vec_float_neg(self, op, arglocs, resloc):
         src, sizeloc = arglocs
         size = sizeloc.value
-        if size == 4:
+        if is_ymm(op):
+            # the mask of the sign bits, see genop_vec_float_abs()
+            temp = X86_64_XMM_SCRATCH_REG.value
+            self.mc.VPCMPEQQ_yyy(temp, temp, temp)
+            if size == 4:
+                self.mc.VPSLLD_yyi(temp, temp, 31)
+                self.mc.VXORPS_yyy(src.value, src.value, temp)
+            elif size == 8:
+                self.mc.VPSLLQ_yyi(temp, temp, 63)
+                self.mc.VXORPD_yyy(src.value, src.value, temp)
+        elif size == 4:
             self.mc.XORPS(src, heap(self.single_float_const_neg_addr))
         elif size == 8:
             self.mc.XORPD(src, heap(self.float_const_neg_addr))
@@ -325,12 +505,30 @@ class VectorAssemblerMixin(object):
     def genop_vec_float_eq(self, op, arglocs, resloc):
         lhsloc, rhsloc, sizeloc = arglocs
         size = sizeloc.value
+        if is_ymm(op.getarg(0)):
+            lhs = lhsloc.value
+            if size == 4:
+                self.mc.VCMPPS_yyyi(lhs, lhs, rhsloc.value, 0)
+            else:
+                self.mc.VCMPPD_yyyi(lhs, lhs, rhsloc.value, 0)
+            self.flush_vec_cc_ymm(rx86.Conditions["E"], lhsloc, resloc, size)
+            return
         if size == 4:
             self.mc.CMPPS_xxi(lhsloc.value, rhsloc.value, 0) # 0 means equal
         else:
             self.mc.CMPPD_xxi(lhsloc.value, rhsloc.value, 0)
         self.flush_vec_cc(rx86.Conditions["E"], lhsloc, resloc, sizeloc.value)
 
+    def flush_vec_cc_ymm(self, rev_cond, lhsloc, resloc, size):
+        # like flush_vec_cc(): the ones in 'lhsloc' (all the bits of an
+        # element set) become the integer 1, by computing 0 - (-1)
+        if resloc is ebp:
+            self.guard_success_cc = rev_cond
+        else:
+            temp = X86_64_XMM_SCRATCH_REG.value
+            self.mc.VPXOR_yyy(temp, temp, temp)
+            self._vpsub(size, resloc.value, temp, lhsloc.value)
+
     def flush_vec_cc(self, rev_cond, lhsloc, resloc, size):
         # After emitting an instruction that leaves a boolean result in
         # a condition code (cc), call this.  In the common case, result_loc
@@ -354,6 +552,14 @@ class VectorAssemblerMixin(object):
         lhsloc, rhsloc, sizeloc = arglocs
         size = sizeloc.value
         # b(100) == 1 << 2 means not equal
+        if is_ymm(op.getarg(0)):
+            lhs = lhsloc.value
+            if size == 4:
+                self.mc.VCMPPS_yyyi(lhs, lhs, rhsloc.value, 1 << 2)
+            else:
+                self.mc.VCMPPD_yyyi(lhs, lhs, rhsloc.value, 1 << 2)
+            self.flush_vec_cc_ymm(rx86.Conditions["NE"], lhsloc, resloc, size)
+            return
         if size == 4:
             self.mc.CMPPS_xxi(lhsloc.value, rhsloc.value, 1 << 2)
         else:
@@ -363,12 +569,25 @@ class VectorAssemblerMixin(object):
     def genop_vec_int_eq(self, op, arglocs, resloc):
         lhsloc, rhsloc, sizeloc = arglocs
         size = sizeloc.value
+        if is_ymm(op.getarg(0)):
+            self._vpcmpeq(size, lhsloc.value, lhsloc.value, rhsloc.value)
+            self.flush_vec_cc_ymm(rx86.Conditions["E"], lhsloc, resloc, size)
+            return
         self.mc.PCMPEQ(lhsloc, rhsloc, size)
         self.flush_vec_cc(rx86.Conditions["E"], lhsloc, resloc, sizeloc.value)
 
     def genop_vec_int_ne(self, op, arglocs, resloc):
         lhsloc, rhsloc, sizeloc = arglocs
         size = sizeloc.value
+        if is_ymm(op.getarg(0)):
+            lhs = lhsloc.value
+            temp = X86_64_XMM_SCRATCH_REG.value
+            self._vpcmpeq(size, lhs, lhs, rhsloc.value)
+            # invert the result
+            self.mc.VPCMPEQQ_yyy(temp, temp, temp)
+            self.mc.VPXOR_yyy(lhs, lhs, temp)
+            self.flush_vec_cc_ymm(rx86.Conditions["NE"], lhsloc, resloc, size)
+            return
         self.mc.PCMPEQ(resloc, rhsloc, size)
         temp = X86_64_XMM_SCRATCH_REG
         self.mc.PCMPEQQ(temp, temp) # set all bits to one
@@ -386,7 +605,14 @@ class VectorAssemblerMixin(object):
         tosize = tosizeloc.value
         if size == tosize:
             return # already the right size
-        if size == 4 and tosize == 8:
+        if size == 4 and tosize == 8 and is_ymm(op):
+            self.mc.VPMOVSXDQ_yx(resloc.value, srcloc.value)
+        elif size == 8 and tosize == 4 and is_ymm(op.getarg(0)):
+            # the low half of each element, in the lower half of resloc:
+            # first within each 128 bits, then the 64 bits 0 and 2 together
+            self.mc.VPSHUFD_yyi(resloc.value, srcloc.value, 0x08)
+            self.mc.VPERMQ_yyi(resloc.value, resloc.value, 0x08)
+        elif size == 4 and tosize == 8:
             scratch = X86_64_SCRATCH_REG.value
             self.mc.forget_scratch_register()
             self.mc.PEXTRD_rxi(scratch, srcloc.value, 1)
@@ -413,7 +639,21 @@ class VectorAssemblerMixin(object):
     def genop_vec_expand_f(self, op, arglocs, resloc):
         srcloc, sizeloc = arglocs
         size = sizeloc.value
-        if isinstance(srcloc, ConstFloatLoc):
+        if is_ymm(op):
+            if isinstance(srcloc, ConstFloatLoc):
+                # only load the first element of the 16 bytes constant
+                if size == 4:
+                    self.mc.MOVSS(resloc, srcloc)
+                else:
+                    self.mc.MOVSD(resloc, srcloc)
+                srcloc = resloc
+            if size == 4:
+                self.mc.VBROADCASTSS_yx(resloc.value, srcloc.value)
+            elif size == 8:
+                self.mc.VBROADCASTSD_yx(resloc.value, srcloc.value)
+            else:
+                raise AssertionError("float of size %d not supported" % (size,))
+        elif isinstance(srcloc, ConstFloatLoc):
             # they are aligned!
             self.mc.MOVAPD(resloc, srcloc)
         elif size == 4:
@@ -434,7 +674,23 @@ class VectorAssemblerMixin(object):
             srcloc = X86_64_SCRATCH_REG
         assert not srcloc.is_xmm
         size = sizeloc.value
-        if size == 1:
+        if is_ymm(op):
+            # insert the element, then broadcast it to the other ones
+            if size == 1:
+                self.mc.PINSRB_xri(resloc.value, srcloc.value, 0)
+                self.mc.VPBROADCASTB_yx(resloc.value, resloc.value)
+            elif size == 2:
+                self.mc.PINSRW_xri(resloc.value, srcloc.value, 0)
+                self.mc.VPBROADCASTW_yx(resloc.value, resloc.value)
+            elif size == 4:
+                self.mc.PINSRD_xri(resloc.value, srcloc.value, 0)
+                self.mc.VPBROADCASTD_yx(resloc.value, resloc.value)
+            elif size == 8:
+                self.mc.PINSRQ_xri(resloc.value, srcloc.value, 0)
+                self.mc.VPBROADCASTQ_yx(resloc.value, resloc.value)
+            else:
+                raise AssertionError("cannot handle size %d (int expand)" % (size,))
+        elif size == 1:
             self.mc.PINSRB_xri(resloc.value, srcloc.value, 0)
             self.mc.PSHUFB(resloc, heap(self.expand_byte_mask_addr))
         elif size == 2:
@@ -459,6 +715,10 @@ class VectorAssemblerMixin(object):
         srcidx = srcidxloc.value
         residx = residxloc.value
         count = countloc.value
+        if self._vec_pack_uses_ymm(op):
+            self._vec_move_elements_ymm(resultloc, sourceloc, residx, srcidx,
+                                        count, size)
+            return
         # for small data type conversion this can be quite costy
         # NOTE there might be some combinations that can be handled
         # more efficiently! e.g.
@@ -517,7 +777,10 @@ class VectorAssemblerMixin(object):
         residx = residxloc.value
         srcidx = srcidxloc.value
         size = sizeloc.value
-        if size == 4:
+        if self._vec_pack_uses_ymm(op):
+            self._vec_move_elements_ymm(resloc, srcloc, residx, srcidx,
+                                        count, size)
+        elif size == 4:
             si = srcidx
             ri = residx
             k = count
@@ -567,21 +830,112 @@ class VectorAssemblerMixin(object):
 
     genop_vec_unpack_f = genop_vec_pack_f
 
+    def _vec_pack_uses_ymm(self, op):
+        # vec_pack(res, src, index, count) or vec_unpack(src, index, count)
+        if op.getopnum() in (rop.VEC_PACK_I, rop.VEC_PACK_F):
+            src = op.getarg(1)
+        else:
+            src = op.getarg(0)
+        return is_ymm(op) or is_ymm(src)
+
+    def _vec_move_elements_ymm(self, resloc, srcloc, residx, srcidx,
+                               count, size):
+        """ Moves the elements one by one through the scratch register.
+            The elements in the upper half of an ymm register are first
+            extracted to the xmm scratch register, and inserted back.
+            'resloc' or 'srcloc' can also hold a single scalar.
+        """
+        scratch = X86_64_SCRATCH_REG.value
+        temp = X86_64_XMM_SCRATCH_REG.value
+        half = 16 // size
+        self.mc.forget_scratch_register()
+        k = 0
+        while k < count:
+            si = srcidx + k
+            ri = residx + k
+            if srcloc.is_xmm:
+                src = srcloc.value
+                if si >= half:
+                    self.mc.VEXTRACTI128_xyi(temp, src, 1)
+                    src = temp
+                    si -= half
+                self._vec_extract(size, scratch, src, si)
+                elem = scratch
+            else:
+                assert count == 1
+                elem = srcloc.value
+            if not resloc.is_xmm:
+                assert count == 1
+                if elem != resloc.value:
+                    self.mc.MOV_rr(resloc.value, elem)
+            elif ri >= half:
+                self.mc.VEXTRACTI128_xyi(temp, resloc.value, 1)
+                self._vec_insert(size, temp, elem, ri - half)
+                self.mc.VINSERTI128_yyxi(resloc.value, resloc.value, temp, 1)
+            else:
+                self._vec_insert(size, resloc.value, elem, ri)
+            k += 1
+
+    def _vec_extract(self, size, reg, xmm, index):
+        if size == 8:
+            self.mc.PEXTRQ_rxi(reg, xmm, index)
+        elif size == 4:
+            self.mc.PEXTRD_rxi(reg, xmm, index)
+        elif size == 2:
+            self.mc.PEXTRW_rxi(reg, xmm, index)
+        elif size == 1:
+            self.mc.PEXTRB_rxi(reg, xmm, index)
+
+    def _vec_insert(self, size, xmm, reg, index):
+        if size == 8:
+            self.mc.PINSRQ_xri(xmm, reg, index)
+        elif size == 4:
+            self.mc.PINSRD_xri(xmm, reg, index)
+        elif size == 2:
+            self.mc.PINSRW_xri(xmm, reg, index)
+        elif size == 1:
+            self.mc.PINSRB_xri(xmm, reg, index)
+
     def genop_vec_cast_float_to_singlefloat(self, op, arglocs, resloc):
+        if is_ymm(op.getarg(0)):
+            self.mc.VCVTPD2PS_xy(resloc.value, arglocs[0].value)
+            return
         self.mc.CVTPD2PS(resloc, arglocs[0])
 
     def genop_vec_cast_float_to_int(self, op, arglocs, resloc):
+        if is_ymm(op.getarg(0)):
+            self.mc.VCVTPD2DQ_xy(resloc.value, arglocs[0].value)
+            return
         self.mc.CVTPD2DQ(resloc, arglocs[0])
 
     def genop_vec_cast_int_to_float(self, op, arglocs, resloc):
+        if is_ymm(op):
+            self.mc.VCVTDQ2PD_yx(resloc.value, arglocs[0].value)
+            return
         self.mc.CVTDQ2PD(resloc, arglocs[0])
 
     def genop_vec_cast_singlefloat_to_float(self, op, arglocs, resloc):
+        if is_ymm(op):
+            self.mc.VCVTPS2PD_yx(resloc.value, arglocs[0].value)
+            return
         self.mc.CVTPS2PD(resloc, arglocs[0])
 
 class VectorRegallocMixin(object):
     _mixin_ = True
 
+    def uses_ymm_registers(self, inputargs, operations):
+        """ True if a vector in 'inputargs' (of a bridge) or 'operations'
+            needs the upper half of an ymm register: the moves between xmm
+            registers and the spills must copy it too
+        """
+        for arg in inputargs:
+            if is_ymm(arg):
+                return True
+        for op in operations:
+            if is_ymm(op):
+                return True
+        return False
+
     def _consider_vec_load(self, op):
         descr = op.getdescr()
         assert isinstance(descr, ArrayDescr)
@@ -220,7 +220,6 @@ class EffectInfo(object):
         return bitstring.bitcheck(self.bitstring_readonly_descrs_interiorfields,
                                   interiorfielddescr.ei_index)
     def check_write_descr_interiorfield(self, interiorfielddescr):
-        # NOTE: this is not used so far
         return bitstring.bitcheck(self.bitstring_write_descrs_interiorfields,
                                   interiorfielddescr.ei_index)
 
@@ -795,7 +795,7 @@ class AbstractResumeGuardDescr(ResumeDescr):
             hash = r_uint(current_object_addr_as_int(self) * 777767777 +
                           intval * 1442968193)
         #
-        increment = jitdriver_sd.warmstate.increment_trace_eagerness
+        increment = jitdriver_sd.warmstate.guard_failure_increment(hash)
         return jitcounter.tick(hash, increment)
 
     def start_compiling(self):
@@ -1109,6 +1109,77 @@ def compile_trace(metainterp, resumekey, runtime_boxes):
     metainterp.retrace_needed(new_trace, info)
     return None
 
+def compile_split_loop(metainterp, greenkey, runtime_args):
+    """Compile the history, which ends in a GUARD_ALWAYS_FAILS, as the
+    procedure for 'greenkey'.  It starts with a LABEL but it has no JUMP:
+    the rest is traced later as a bridge from the GUARD_ALWAYS_FAILS, and
+    that bridge can jump back to the label.  Returns the TargetToken of
+    the label, or None.
+    """
+    from rpython.jit.metainterp.optimizeopt import optimize_trace
+
+    metainterp_sd = metainterp.staticdata
+    jitdriver_sd = metainterp.jitdriver_sd
+    metainterp_sd.jitlog.start_new_trace(metainterp_sd,
+            faildescr=None, entry_bridge=False)
+    jitcell_token = make_jitcell_token(jitdriver_sd)
+    data = SimpleCompileData(metainterp.history.trace,
+                             call_pure_results=metainterp.call_pure_results,
+                             enable_opts=jitdriver_sd.warmstate.enable_opts)
+    try:
+        loop_info, ops = optimize_trace(metainterp_sd, jitdriver_sd,
+                                        data, metainterp.box_names_memo)
+    except InvalidLoop:
+        metainterp_sd.jitlog.trace_aborted()
+        return None
+    loop = create_empty_loop(metainterp)
+    loop.original_jitcell_token = jitcell_token
+    loop.inputargs = loop_info.inputargs
+    if loop_info.quasi_immutable_deps:
+        loop.quasi_immutable_deps = loop_info.quasi_immutable_deps
+    target_token = TargetToken(jitcell_token)
+    target_token.original_jitcell_token = jitcell_token
+    label = ResOperation(rop.LABEL, loop_info.inputargs[:], descr=target_token)
+    loop.operations = [label] + ops
+    if not we_are_translated():
+        loop.check_consistency()
+    jitcell_token.target_tokens = [target_token]
+    send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, "loop",
+                         runtime_args, metainterp.box_names_memo)
+    record_loop_or_bridge(metainterp_sd, loop)
+    return target_token
+
+def compile_split_bridge(metainterp, resumekey):
+    """Compile the history, which ends in a GUARD_ALWAYS_FAILS, as a
+    bridge from 'resumekey'.  Returns True if it worked.
+    """
+    from rpython.jit.metainterp.optimizeopt import optimize_trace
+
+    metainterp_sd = metainterp.staticdata
+    jitdriver_sd = metainterp.jitdriver_sd
+    jd_name = jitdriver_sd.jitdriver.name
+    metainterp_sd.jitlog.start_new_trace(metainterp_sd,
+            faildescr=resumekey, entry_bridge=False, jd_name=jd_name)
+    inputargs = metainterp.history.inputargs[:]
+    data = SimpleCompileData(metainterp.history.trace,
+                             resumekey.get_resumestorage(),
+                             call_pure_results=metainterp.call_pure_results,
+                             enable_opts=jitdriver_sd.warmstate.enable_opts)
+    try:
+        info, newops = optimize_trace(metainterp_sd, jitdriver_sd,
+                                      data, metainterp.box_names_memo)
+    except InvalidLoop:
+        metainterp_sd.jitlog.trace_aborted()
+        return False
+    new_trace = create_empty_loop(metainterp)
+    new_trace.operations = newops
+    if info.quasi_immutable_deps:
+        new_trace.quasi_immutable_deps = info.quasi_immutable_deps
+    new_trace.inputargs = info.inputargs
+    resumekey.compile_and_attach(metainterp, new_trace, inputargs)
+    record_loop_or_bridge(metainterp_sd, new_trace)
+    return True
+
 # ____________________________________________________________
 
 memory_error = MemoryError()
@@ -781,6 +781,9 @@ class NoStats(object):
     def aborted(self):
         pass
 
+    def split(self):
+        pass
+
     def entered(self):
         pass
 
@@ -814,6 +817,7 @@ class Stats(object):
     compiled_count = 0
     enter_count = 0
     aborted_count = 0
+    split_count = 0
 
     def __init__(self, metainterp_sd):
         self.loops = []
@@ -833,6 +837,7 @@ class Stats(object):
         self.compiled_count = 0
         self.enter_count = 0
         self.aborted_count = 0
+        self.split_count = 0
         for dict in self.jitcell_dicts:
             dict.clear()
 
@@ -846,6 +851,9 @@ class Stats(object):
     def aborted(self):
         self.aborted_count += 1
 
+    def split(self):
+        self.split_count += 1
+
     def entered(self):
         self.enter_count += 1
 
@@ -9,9 +9,11 @@ from rpython.jit.metainterp.jitexc import JitException
 from rpython.rlib.jit import Counters
 
 
-JITPROF_LINES = Counters.ncounters + 1 + 1
-# one for TOTAL, 1 for calls, update if needed
-_CPU_LINES = 4       # the last 4 lines are stored on the cpu
+JITPROF_LINES = Counters.ncounters + 1 + 1 + 2
+# one for TOTAL, 1 for calls, 2 for the register allocator's moves
+# and spills (read from cpu.tracker, not counters), update if needed
+_CPU_LINES = 4       # the last 4 counters, TOTAL_COMPILED_LOOPS to
+                     # TOTAL_FREED_BRIDGES, are read from cpu.tracker
 
 class BaseProfiler(object):
     pass
@@ -152,9 +154,11 @@ class Profiler(BaseProfiler):
         self._print_intline("abort: bad loop", cnt[Counters.ABORT_BAD_LOOP])
         self._print_intline("abort: force quasi-immut",
                             cnt[Counters.ABORT_FORCE_QUASIIMMUT])
+        self._print_intline("trace splits", cnt[Counters.TRACE_SPLIT])
         self._print_intline("nvirtuals", cnt[Counters.NVIRTUALS])
         self._print_intline("nvholes", cnt[Counters.NVHOLES])
         self._print_intline("nvreused", cnt[Counters.NVREUSED])
+        self._print_intline("resume shared", cnt[Counters.RESUME_SHARED])
         self._print_intline("vecopt tried", cnt[Counters.OPT_VECTORIZE_TRY])
         self._print_intline("vecopt success", cnt[Counters.OPT_VECTORIZED])
         cpu = self.cpu
@@ -167,6 +171,10 @@ class Profiler(BaseProfiler):
                                 cpu.tracker.total_freed_loops)
             self._print_intline("Freed # of bridges",
                                 cpu.tracker.total_freed_bridges)
+            self._print_intline("regalloc moves",
+                                cpu.tracker.total_regalloc_moves)
+            self._print_intline("regalloc spills",
+                                cpu.tracker.total_regalloc_spills)
 
     def _print_line_time(self, string, i, tim):
         final = "%s:%s\t%d\t%f" % (string, " " * max(0, 13-len(string)), i, tim)
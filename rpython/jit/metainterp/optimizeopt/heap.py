@@ -244,6 +244,9 @@ class OptHeap(Optimization):
         self.cached_dict_reads = {}
         # cache of corresponding {array descrs: dict 'entries' field descr}
         self.corresponding_array_descrs = {}
+        # cached reads from arrays of structs, e.g. the dict entry found
+        # by a lookup: {interiorfield descr: {(array, index): box-or-const}}
+        self.cached_interiorfield_reads = {}
         #
         self._remove_guard_not_invalidated = False
         self._seen_guard_not_invalidated = False
@@ -284,6 +287,30 @@ class OptHeap(Optimization):
                 d.produce_potential_short_preamble_ops(self.optimizer, sb,
                                                        descr, index)
 
+        if self.optimizer.cpu.supports_guard_gc_type:
+            # like the array items, only at a constant index: the short
+            # preamble then checks the type and the length of the array
+            for descr, d in self.cached_interiorfield_reads.items():
+                opnum = OpHelpers.getinteriorfield_for_descr(descr)
+                for key, res in d.items():
+                    if isinstance(res, PreambleOp):
+                        continue
+                    arraybox = self.get_box_replacement(key[0])
+                    indexbox = self.get_box_replacement(key[1])
+                    if not isinstance(indexbox, ConstInt):
+                        continue
+                    if not arraybox.is_constant():
+                        arrayinfo = self.getptrinfo(arraybox)
+                        if (not isinstance(arrayinfo, info.ArrayPtrInfo) or
+                                arrayinfo.is_virtual()):
+                            continue
+                    getop = ResOperation(opnum, [arraybox, indexbox],
+                                         descr=descr)
+                    sb.add_heap_op(self.get_box_replacement(res), getop)
+        # the keys and values are boxes of the preamble: the peeled loop
+        # only gets back what is imported from the short preamble
+        self.cached_interiorfield_reads.clear()
+
     def clean_caches(self):
         items = self.cached_fields.items()
         if not we_are_translated():
@@ -297,6 +324,7 @@ class OptHeap(Optimization):
                     cf.invalidate(None)
         #self.cached_arrayitems.clear()
         self.cached_dict_reads.clear()
+        self.cached_interiorfield_reads.clear()
 
     def field_cache(self, descr):
         try:
@@ -316,6 +344,13 @@ class OptHeap(Optimization):
             cf = submap[index] = ArrayCachedItem(index)
         return cf
 
+    def interiorfield_cache(self, descr):
+        try:
+            d = self.cached_interiorfield_reads[descr]
+        except KeyError:
+            d = self.cached_interiorfield_reads[descr] = args_dict()
+        return d
+
     def emit(self, op):
         self.emitting_operation(op)
         self.emit_postponed_op()
@@ -336,6 +371,24 @@ class OptHeap(Optimization):
                 self.force_lazy_sets_for_guard())
             return
         opnum = op.getopnum()
+        if opnum == rop.SETINTERIORFIELD_GC:
+            # only invalidates the reads of the same interior field, and
+            # the dict lookups done on the same kind of 'entries' array
+            descr = op.getdescr()
+            try:
+                del self.cached_interiorfield_reads[descr]
+            except KeyError:
+                pass
+            try:
+                dictdescr = self.corresponding_array_descrs[
+                    descr.get_arraydescr()]
+                del self.cached_dict_reads[dictdescr]
+            except KeyError:
+                pass
+            # the lazy setfields and setarrayitems must still be done
+            # before it, as for any other operation with side effects
+            self.force_all_lazy_sets()
+            return
         if (opnum == rop.SETFIELD_GC or          # handled specially
             opnum == rop.SETFIELD_RAW or         # no effect on GC struct/array
             opnum == rop.SETARRAYITEM_GC or      # handled specially
@@ -466,6 +519,11 @@ class OptHeap(Optimization):
                 except KeyError:
                     pass # someone did it already
         #
+        for descr in self.cached_interiorfield_reads.keys():
+            if (effectinfo.check_write_descr_interiorfield(descr) or
+                effectinfo.check_write_descr_array(descr.get_arraydescr())):
+                del self.cached_interiorfield_reads[descr]
+        #
         if effectinfo.check_forces_virtual_or_virtualizable():
             vrefinfo = self.optimizer.metainterp_sd.virtualref_info
             self.force_lazy_set(vrefinfo.descr_forced)
@@ -659,6 +717,48 @@ class OptHeap(Optimization):
             # and then emit the operation
             return self.emit(op)
 
+    def optimize_GETINTERIORFIELD_GC_I(self, op):
+        key = [self.optimizer.get_box_replacement(op.getarg(0)),   # array
+               self.optimizer.get_box_replacement(op.getarg(1))]   # index
+        try:
+            res_v = self.cached_interiorfield_reads[op.getdescr()][key]
+        except KeyError:
+            return self.emit(op)
+        if isinstance(res_v, PreambleOp):
+            # read in the preamble: it becomes an argument of the loop
+            res_v = self.optimizer.force_op_from_preamble(res_v)
+            self.interiorfield_cache(op.getdescr())[key] = res_v
+        self.make_equal_to(op, res_v)
+
+    def postprocess_GETINTERIORFIELD_GC_I(self, op):
+        # remember the result of reading the interior field, typically
+        # the value of a dict entry found by a (cached) lookup
+        key = [self.optimizer.get_box_replacement(op.getarg(0)),
+               self.optimizer.get_box_replacement(op.getarg(1))]
+        self._interiorfield_index_in_bounds(op, key[1])
+        self.interiorfield_cache(op.getdescr())[key] = op
+    optimize_GETINTERIORFIELD_GC_R = optimize_GETINTERIORFIELD_GC_I
+    optimize_GETINTERIORFIELD_GC_F = optimize_GETINTERIORFIELD_GC_I
+
+    postprocess_GETINTERIORFIELD_GC_R = postprocess_GETINTERIORFIELD_GC_I
+    postprocess_GETINTERIORFIELD_GC_F = postprocess_GETINTERIORFIELD_GC_I
+
+    def postprocess_SETINTERIORFIELD_GC(self, op):
+        # emitting_operation() already invalidated the other reads of
+        # this interior field; remember the value just written
+        key = [self.optimizer.get_box_replacement(op.getarg(0)),
+               self.optimizer.get_box_replacement(op.getarg(1))]
+        self._interiorfield_index_in_bounds(op, key[1])
+        self.interiorfield_cache(op.getdescr())[key] = (
+            self.optimizer.get_box_replacement(op.getarg(2)))
+
+    def _interiorfield_index_in_bounds(self, op, indexbox):
+        # after the access, the array is known to be longer than a
+        # constant index; the short preamble checks this length
+        if isinstance(indexbox, ConstInt):
+            arrayinfo = self.ensure_ptr_info_arg0(op)
+            arrayinfo.getlenbound(None).make_gt_const(indexbox.getint())
+
     def optimize_QUASIIMMUT_FIELD(self, op):
         # Pattern: QUASIIMMUT_FIELD(s, descr=QuasiImmutDescr)
         #          x = GETFIELD_GC(s, descr='inst_x') # pure
@@ -657,8 +657,6 @@ class ArrayStructInfo(ArrayPtrInfo):
                                               [op, ConstInt(index), subbox],
                                               descr=fielddescr)
                     optforce.emit_extra(setfieldop)
-                    # heapcache does not work for interiorfields
-                    # if it does, we would need a fix here
                 i += 1
 
     def _visitor_walk_recursive(self, instbox, visitor, optimizer):
@@ -500,6 +500,9 @@ class Optimizer(Optimization):
         elif (rop.is_getarrayitem(opnum) or opnum == rop.SETARRAYITEM_GC or
               opnum == rop.ARRAYLEN_GC):
             opinfo = info.ArrayPtrInfo(op.getdescr())
+        elif (rop.is_getinteriorfield(opnum) or
+              opnum == rop.SETINTERIORFIELD_GC):
+            opinfo = info.ArrayPtrInfo(op.getdescr().get_arraydescr())
         elif opnum in (rop.GUARD_CLASS, rop.GUARD_NONNULL_CLASS):
             opinfo = info.InstancePtrInfo()
         elif opnum in (rop.STRLEN,):
@@ -76,6 +76,8 @@ class HeapOp(AbstractShortOp):
             cf = optheap.field_cache(descr)
             opinfo.setfield(preamble_op.getdescr(), g.getarg(0), pop,
                             optheap, cf)
+        elif rop.is_getinteriorfield(g.opnum):
+            optheap.interiorfield_cache(descr)[g.getarglist()] = pop
         else:
             index = g.getarg(1).getint()
             assert index >= 0
@@ -268,6 +268,25 @@ class CostModelBaseTest(SchedulerBaseTest):
         number = self.savings(trace)
         assert number >= 1
 
+    def test_unpack_upper_half_ymm(self):
+        from rpython.jit.backend.llsupport.vector_ext import VectorExt
+        from rpython.jit.metainterp.resoperation import OpHelpers
+        class FakeCPU(object):
+            vector_ext = VectorExt()
+        FakeCPU.vector_ext.enable(32, True)
+        costmodel = GenericCostModel(FakeCPU(), 0)
+        vec = OpHelpers.create_vec('i', 8, True, 4)
+        # the two elements of the lower half
+        costmodel.record_vector_unpack(vec, 0, 2)
+        assert costmodel.savings == -2
+        # one element in each half
+        costmodel.reset_savings()
+        costmodel.record_vector_unpack(vec, 1, 2)
+        assert costmodel.savings == -3
+        # both in the upper half
+        costmodel.reset_savings()
+        costmodel.record_vector_unpack(vec, 2, 2)
+        assert costmodel.savings == -4
 
 class Test(CostModelBaseTest, LLtypeMixin):
     pass
@@ -5458,6 +5458,56 @@ class BaseTestOptimizeBasic(BaseTestBasic):
         """
         self.optimize_loop(ops, expected)
 
+    def test_consecutive_getinteriorfields_cached(self):
+        ops = """
+        [p0, i0]
+        f1 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        f2 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        jump(p0, i0, f1, f2)
+        """
+        expected = """
+        [p0, i0]
+        f1 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        jump(p0, i0, f1, f1)
+        """
+        self.optimize_loop(ops, expected)
+
+    def test_setinteriorfield_forces_lazy_setfield(self):
+        ops = """
+        [p0, p1, i0, i1, f0]
+        setfield_gc(p0, i1, descr=valuedescr)
+        setinteriorfield_gc(p1, i0, f0, descr=complexrealdescr)
+        jump(p0, p1, i0, i1, f0)
+        """
+        self.optimize_loop(ops, ops)
+
+    def test_getinteriorfield_invalidated(self):
+        ops = """
+        [p0, p1, i0, i1, f0]
+        f1 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        setinteriorfield_gc(p1, i0, f0, descr=complexrealdescr)
+        f2 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        f3 = getinteriorfield_gc_f(p1, i0, descr=complexrealdescr)
+        f4 = getinteriorfield_gc_f(p0, i0, descr=compleximagdescr)
+        setinteriorfield_gc(p1, i0, f0, descr=complexrealdescr)
+        f5 = getinteriorfield_gc_f(p0, i0, descr=compleximagdescr)
+        call_n(0, p0, p1, 0, 0, i1, descr=complexarraycopydescr)
+        f6 = getinteriorfield_gc_f(p1, i0, descr=complexrealdescr)
+        jump(f1, f2, f3, f4, f5, f6)
+        """
+        expected = """
+        [p0, p1, i0, i1, f0]
+        f1 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        setinteriorfield_gc(p1, i0, f0, descr=complexrealdescr)
+        f2 = getinteriorfield_gc_f(p0, i0, descr=complexrealdescr)
+        f4 = getinteriorfield_gc_f(p0, i0, descr=compleximagdescr)
+        setinteriorfield_gc(p1, i0, f0, descr=complexrealdescr)
+        call_n(0, p0, p1, 0, 0, i1, descr=complexarraycopydescr)
+        f6 = getinteriorfield_gc_f(p1, i0, descr=complexrealdescr)
+        jump(f1, f2, f0, f4, f4, f6)
+        """
+        self.optimize_loop(ops, expected)
+
     def test_int_signext_already_in_bounds(self):
         ops = """
         [i0]
@@ -7918,6 +7918,53 @@ class OptimizeOptTest(BaseTestWithUnroll):
         """
         self.optimize_loop(ops, expected, expected_short=short)
 
+    def test_loopinvariant_constant_getinteriorfield(self):
+        ops = """
+        [p0]
+        p1 = getfield_gc_r(p0, descr=nextdescr)
+        f2 = getinteriorfield_gc_f(p1, 3, descr=complexrealdescr)
+        f3 = getinteriorfield_gc_f(p1, 3, descr=complexrealdescr)
+        call_n(f2, f3, descr=nonwritedescr)
+        jump(p0)
+        """
+        short = """
+        [p0]
+        guard_nonnull(p0) []
+        guard_is_object(p0) []
+        guard_subclass(p0, ConstClass(node_vtable)) []
+        p1 = getfield_gc_r(p0, descr=nextdescr)
+        guard_nonnull(p1) []
+        guard_gc_type(p1, ConstInt(complexarraydescr_tid)) []
+        i1 = arraylen_gc(p1, descr=complexarraydescr)
+        i2 = int_ge(i1, 4)
+        guard_true(i2) []
+        f2 = getinteriorfield_gc_f(p1, 3, descr=complexrealdescr)
+        jump(p1, f2)
+        """
+        expected = """
+        [p0, p1, f2]
+        call_n(f2, f2, descr=nonwritedescr)
+        i3 = arraylen_gc(p1, descr=complexarraydescr) # Should be killed by backend
+        jump(p0, p1, f2)
+        """
+        self.optimize_loop(ops, expected, expected_short=short)
+
+    def test_getinteriorfield_variable_index_not_in_short_preamble(self):
+        ops = """
+        [p0, i0]
+        p1 = getfield_gc_r(p0, descr=nextdescr)
+        f2 = getinteriorfield_gc_f(p1, i0, descr=complexrealdescr)
+        call_n(f2, descr=nonwritedescr)
+        jump(p0, i0)
+        """
+        expected = """
+        [p0, i0, p1]
+        f2 = getinteriorfield_gc_f(p1, i0, descr=complexrealdescr)
+        call_n(f2, descr=nonwritedescr)
+        jump(p0, i0, p1)
+        """
+        self.optimize_loop(ops, expected)
+
     def test_loopinvariant_constant_strgetitem(self):
         ops = """
         [p0]
@@ -348,6 +348,7 @@ class LLtypeMixin(object):
         )
     )
     complexarraydescr = cpu.arraydescrof(complexarray)
+    complexarraydescr_tid = complexarraydescr.get_type_id()
     complexrealdescr = cpu.interiorfielddescrof(complexarray, "real")
     compleximagdescr = cpu.interiorfielddescrof(complexarray, "imag")
     complexarraycopydescr = cpu.calldescrof(FUNC, FUNC.ARGS, FUNC.RESULT,
@@ -665,6 +665,15 @@ class GenericCostModel(CostModel):
 
     def record_vector_unpack(self, src, index, count):
         self.record_vector_pack(src, index, count)
+        if self.vec_reg_size > 16:
+            # the elements in the upper half of a 32 byte register must
+            # first be extracted into a 16 byte register: one more
+            # instruction for each of them
+            vecinfo = forwarded_vecinfo(src)
+            half = 16 // vecinfo.bytesize
+            upper = index + count - max(index, half)
+            if upper > 0:
+                self.savings -= upper
 
 def isomorphic(l_op, r_op):
     """ Subject of definition, here it is equal operation.
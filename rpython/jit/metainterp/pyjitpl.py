@@ -1267,6 +1267,11 @@ class MIFrame(object):
                                self.metainterp.call_ids[-1],
                                greenboxes)
 
+        if (not self.metainterp.portal_call_depth and
+                self.metainterp.seen_loop_header_for_jdindex < 0):
+            self.metainterp.split_trace_if_too_long(greenboxes + redboxes,
+                                                    orgpc)
+
         if self.metainterp.seen_loop_header_for_jdindex < 0:
             if not any_operation:
                 return
@@ -2032,6 +2037,9 @@ class MetaInterp(object):
 
         self.aborted_tracing_jitdriver = None
         self.aborted_tracing_greenkey = None
+        # greenkey of the first jit_merge_point of the outermost function
+        # in a bridge, see split_trace_if_too_long()
+        self.bridge_start_greenkey = None
 
     def retrace_needed(self, trace, exported_state):
         self.partial_trace = trace
@@ -2401,8 +2409,84 @@ class MetaInterp(object):
                     jd_sd = self.jitdriver_sd
                     greenkey = self.current_merge_points[0][0][:jd_sd.num_green_args]
                     warmrunnerstate.JitCell.trace_next_iteration(greenkey)
+            # the next trace from the same place may be split
+            if warmrunnerstate.trace_split > 0:
+                greenkey = self._get_split_trace_greenkey()
+                if greenkey is not None:
+                    warmrunnerstate.JitCell.allow_split_trace(greenkey)
             raise SwitchToBlackhole(Counters.ABORT_TOO_LONG)
 
+    def _get_split_trace_greenkey(self):
+        """The greenkey whose JC_SPLIT_TRACE flag allows us to split the
+        current trace: the one where we started tracing a loop, or for a
+        bridge the first jit_merge_point of the outermost function."""
+        if isinstance(self.resumekey, compile.ResumeFromInterpDescr):
+            if not self.current_merge_points:
+                return None
+            original_boxes = self.current_merge_points[0][0]
+            return original_boxes[:self.jitdriver_sd.num_green_args]
+        return self.bridge_start_greenkey
+
+    def split_trace_if_too_long(self, live_arg_boxes, orgpc):
+        """Called at a jit_merge_point of the outermost function.  If the
+        trace is longer than 'trace_split' operations, end it here with a
+        GUARD_ALWAYS_FAILS and compile it, instead of going on until we
+        abort at 'trace_limit'.  The rest is traced later as a bridge from
+        that guard, starting again at this jit_merge_point.
+
+        This is only done if the greenkey where the trace started has got
+        the JC_SPLIT_TRACE flag, i.e. if a trace from there was already
+        aborted as too long, or if the trace is the rest of a split one.
+        """
+        num_green_args = self.jitdriver_sd.num_green_args
+        if self.bridge_start_greenkey is None:
+            self.bridge_start_greenkey = live_arg_boxes[:num_green_args]
+        warmrunnerstate = self.jitdriver_sd.warmstate
+        if (warmrunnerstate.trace_split <= 0 or
+                self.history.length() <= warmrunnerstate.trace_split):
+            return
+        if (self.partial_trace or self.virtualref_boxes or
+                self.history.trace_tag_overflow()):
+            return
+        split_greenkey = self._get_split_trace_greenkey()
+        if (split_greenkey is None or
+                not warmrunnerstate.JitCell.can_split_trace(split_greenkey)):
+            return
+        from_interp = isinstance(self.resumekey, compile.ResumeFromInterpDescr)
+        original_boxes = self.current_merge_points[0][0] if from_interp else []
+        greenkey = original_boxes[:num_green_args]
+        if from_interp:
+            ptoken = self.get_procedure_token(greenkey)
+            if ptoken is not None and ptoken.target_tokens is not None:
+                return   # closing the loop will abort instead
+        debug_print('~~~ SPLITTING TRACE after %d operations' %
+                    self.history.length())
+        self.generate_guard(rop.GUARD_ALWAYS_FAILS, resumepc=orgpc)
+        self.history.trace.tracing_done()
+        if from_interp:
+            target_token = compile.compile_split_loop(self, greenkey,
+                                        original_boxes[num_green_args:])
+            if target_token is None:
+                raise SwitchToBlackhole(Counters.ABORT_BAD_LOOP)
+            jitcell_token = target_token.targeting_jitcell_token
+            self.jitdriver_sd.warmstate.attach_procedure_to_interp(
+                greenkey, jitcell_token)
+            self.staticdata.stats.add_jitcell_token(jitcell_token)
+        else:
+            if not compile.compile_split_bridge(self, self.resumekey):
+                raise SwitchToBlackhole(Counters.ABORT_BAD_LOOP)
+        self.staticdata.profiler.count(Counters.TRACE_SPLIT)
+        self.staticdata.stats.split()
+        # the bridge that traces the rest starts at this jit_merge_point,
+        # and may be split again
+        warmrunnerstate.JitCell.allow_split_trace(
+            live_arg_boxes[:num_green_args])
+        # go on in the interpreter from this jit_merge_point; the
+        # GUARD_ALWAYS_FAILS will resume there too
+        self.history.inputargs = None
+        self.history.operations = None
+        self._raise_continue_running_normally(live_arg_boxes)
+
     def _interpret(self):
         # Execute the frames forward until we raise a DoneWithThisFrame,
         # a ExitFrameWithException, or a ContinueRunningNormally exception.
@@ -2601,12 +2685,7 @@ class MetaInterp(object):
         # interpreted mode, but it should come back very quickly to the
         # JIT, find probably the same 'loop_token', and execute it.
         if we_are_translated():
-            num_green_args = self.jitdriver_sd.num_green_args
-            gi, gr, gf = self._unpack_boxes(live_arg_boxes, 0, num_green_args)
-            ri, rr, rf = self._unpack_boxes(live_arg_boxes, num_green_args,
-                                            len(live_arg_boxes))
-            CRN = jitexc.ContinueRunningNormally
-            raise CRN(gi, gr, gf, ri, rr, rf)
+            self._raise_continue_running_normally(live_arg_boxes)
         else:
             # However, in order to keep the existing tests working
             # (which are based on the assumption that 'loop_token' is
@@ -2614,6 +2693,14 @@ class MetaInterp(object):
             self._nontranslated_run_directly(live_arg_boxes, loop_token)
             assert 0, "unreachable"
 
+    def _raise_continue_running_normally(self, live_arg_boxes):
+        num_green_args = self.jitdriver_sd.num_green_args
+        gi, gr, gf = self._unpack_boxes(live_arg_boxes, 0, num_green_args)
+        ri, rr, rf = self._unpack_boxes(live_arg_boxes, num_green_args,
+                                        len(live_arg_boxes))
+        CRN = jitexc.ContinueRunningNormally
+        raise CRN(gi, gr, gf, ri, rr, rf)
+
     def _nontranslated_run_directly(self, live_arg_boxes, loop_token):
         "NOT_RPYTHON"
         args = []
@@ -945,6 +945,7 @@ _oplist = [
     'GUARD_NOT_FORCED/0d/n',      # may be called with an exception currently set
     'GUARD_NOT_FORCED_2/0d/n',    # same as GUARD_NOT_FORCED, but for finish()
     'GUARD_NOT_INVALIDATED/0d/n',
+    'GUARD_ALWAYS_FAILS/0d/n',    # ends a trace that is continued by a bridge
     'GUARD_FUTURE_CONDITION/0d/n',
     # is removable, may be patched by an optimization
     '_GUARD_LAST', # ----- end of guard operations -----
@@ -1296,6 +1297,14 @@ class rop(object):
             return rop.GETFIELD_GC_F
         return rop.GETFIELD_GC_I
 
+    @staticmethod
+    def getinteriorfield_for_descr(descr):
+        if descr.is_pointer_field():
+            return rop.GETINTERIORFIELD_GC_R
+        elif descr.is_float_field():
+            return rop.GETINTERIORFIELD_GC_F
+        return rop.GETINTERIORFIELD_GC_I
+
     @staticmethod
     def getarrayitem_pure_for_descr(descr):
         if descr.is_array_of_pointers():
@@ -1428,6 +1437,11 @@ class rop(object):
                          rop.GETARRAYITEM_GC_PURE_F,
                          rop.GETARRAYITEM_GC_PURE_R)
 
+    @staticmethod
+    def is_getinteriorfield(opnum):
+        return opnum in (rop.GETINTERIORFIELD_GC_I, rop.GETINTERIORFIELD_GC_F,
+                         rop.GETINTERIORFIELD_GC_R)
+
     @staticmethod
     def is_real_call(opnum):
         return (opnum == rop.CALL_I or
@@ -180,10 +180,12 @@ class ResumeDataLoopMemo(object):
         self.refs = self.cpu.ts.new_ref_dict_2()
         self.cached_boxes = {}
         self.cached_virtuals = {}
+        self.numberings = {}
 
         self.nvirtuals = 0
         self.nvholes = 0
         self.nvreused = 0
+        self.nresumeshared = 0
 
     def getconst(self, const):
         if const.type == INT:
@@ -313,10 +315,24 @@ class ResumeDataLoopMemo(object):
         self.cached_boxes.clear()
         self.cached_virtuals.clear()
 
+    def create_numbering(self, numb_state):
+        # guards of the same loop often end up with exactly the same
+        # resume code (they all use self.consts); share a single copy
+        numb = numb_state.create_numbering()
+        key = resumecode.numbering_key(numb)
+        try:
+            numb = self.numberings[key]
+        except KeyError:
+            self.numberings[key] = numb
+        else:
+            self.nresumeshared += 1
+        return numb
+
     def update_counters(self, profiler):
         profiler.count(jitprof.Counters.NVIRTUALS, self.nvirtuals)
         profiler.count(jitprof.Counters.NVHOLES, self.nvholes)
         profiler.count(jitprof.Counters.NVREUSED, self.nvreused)
+        profiler.count(jitprof.Counters.RESUME_SHARED, self.nresumeshared)
 
 _frame_info_placeholder = (None, 0, 0)
 
@@ -465,7 +481,7 @@ class ResumeDataVirtualAdder(VirtualVisitor):
         numb_state.patch(1, len(liveboxes))
 
         self._add_optimizer_sections(numb_state, liveboxes, liveboxes_from_env)
-        storage.rd_numb = numb_state.create_numbering()
+        storage.rd_numb = self.memo.create_numbering(numb_state)
         storage.rd_consts = self.memo.consts
         return liveboxes[:]
 
@@ -72,6 +72,11 @@ def numb_next_n_items(numb, size, index):
         _, index = numb_next_item(numb, index)
     return index
 
+def numbering_key(numb):
+    # the encoded bytes as a string, to find identical numberings
+    return ''.join([chr(rffi.cast(lltype.Signed, numb.code[i]))
+                    for i in range(len(numb.code))])
+
 def unpack_numbering(numb):
     l = []
     i = 0
@@ -252,6 +252,10 @@ class JitMixin:
         if self.enable_opts == ENABLE_ALL_OPTS:
             assert get_stats().aborted_count >= count
 
+    def check_split_count(self, count):
+        """Check the number of times a trace was split."""
+        assert get_stats().split_count == count
+
     def meta_interp(self, *args, **kwds):
         kwds['CPUClass'] = self.CPUClass
         if "backendopt" not in kwds:
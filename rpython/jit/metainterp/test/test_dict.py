@@ -231,8 +231,7 @@ class DictTests:
             return s
 
         self.meta_interp(f, [10])
-        # XXX should be one getinteriorfield_gc.  At least it's one call.
-        self.check_simple_loop(call_i=1, getinteriorfield_gc_i=2,
+        self.check_simple_loop(call_i=1, getinteriorfield_gc_i=1,
                                guard_no_exception=1)
 
     def test_ordered_dict_two_lookups(self):
@@ -252,8 +251,7 @@ class DictTests:
             return s
 
         self.meta_interp(f, [10])
-        # XXX should be one getinteriorfield_gc.  At least it's one call.
-        self.check_simple_loop(call_i=1, getinteriorfield_gc_i=2,
+        self.check_simple_loop(call_i=1, getinteriorfield_gc_i=1,
                                guard_no_exception=1)
 
     def test_dict_insert_invalidates_caches(self):
@@ -396,6 +396,64 @@ class RecursiveTests:
         res = self.meta_interp(loop, [100], trace_limit=TRACE_LIMIT)
         assert res == 80
 
+    def _trace_split_main(self):
+        myjitdriver = JitDriver(greens=['pc', 'code'], reds=['n', 'acc'])
+        def interp(code, n):
+            acc = 0
+            pc = 0
+            while pc < len(code):
+                myjitdriver.jit_merge_point(code=code, pc=pc, n=n, acc=acc)
+                op = code[pc]
+                if op == "a":
+                    acc += n
+                elif op == "x":
+                    acc ^= pc
+                elif op == "j":
+                    n -= 1
+                    if n > 0:
+                        pc = 0
+                        myjitdriver.can_enter_jit(code=code, pc=pc, n=n,
+                                                  acc=acc)
+                        continue
+                pc += 1
+            return acc
+        codes = ["ax" * 20 + "j", "j"]
+        def main(c, n, split):
+            set_param(None, 'threshold', 3)
+            set_param(None, 'trace_eagerness', 2)
+            set_param(None, 'trace_split', split)
+            return interp(codes[c], n)
+        return main
+
+    def test_trace_split(self):
+        main = self._trace_split_main()
+        TRACE_SPLIT = 40
+        expected = main(0, 30, TRACE_SPLIT)
+        res = self.meta_interp(main, [0, 30, TRACE_SPLIT], trace_limit=60)
+        assert res == expected
+        # the first trace is aborted, the retry is split and compiled
+        self.check_aborted_count(1)
+        self.check_split_count(2)
+        self.check_max_trace_length(TRACE_SPLIT + 10)
+        # the bridge from the first GUARD_ALWAYS_FAILS is split again,
+        # and the last bridge closes the loop
+        self.check_resops(guard_always_fails=2)
+        self.check_jitcell_token_count(1)
+
+    def test_trace_split_only_after_abort(self):
+        from rpython.rlib.jit import PARAMETERS
+        main = self._trace_split_main()
+        TRACE_SPLIT = 40
+        expected = main(0, 30, TRACE_SPLIT)
+        # longer than trace_split, but within trace_limit: not split
+        res = self.meta_interp(main, [0, 30, TRACE_SPLIT])
+        assert res == expected
+        self.check_aborted_count(0)
+        self.check_split_count(0)
+        self.check_resops(guard_always_fails=0)
+        self.check_jitcell_token_count(1)
+        assert 0 < PARAMETERS['trace_split'] < PARAMETERS['trace_limit']
+
     def test_max_failure_args(self):
         FAILARGS_LIMIT = 10
         jitdriver = JitDriver(greens = [], reds = ['i', 'n', 'o'])
@@ -1098,6 +1098,22 @@ def test_virtual_adder_memo_const_sharing():
     assert len(memo.consts) == 3    
     assert storage2.rd_consts is memo.consts
 
+def test_virtual_adder_memo_numbering_sharing():
+    metainterp_sd = FakeMetaInterpStaticData()
+    memo = ResumeDataLoopMemo(metainterp_sd)
+    storages = []
+    for b2 in [2**23, 2**23, 2**24]:
+        storage, t = make_storage(ConstInt(sys.maxint), ConstInt(b2),
+                                  ConstInt(-65))
+        i = t.get_iter()
+        modifier = ResumeDataVirtualAdder(FakeOptimizer(i), storage, storage,
+                                          i, memo)
+        modifier.finish()
+        storages.append(storage)
+    assert storages[1].rd_numb == storages[0].rd_numb
+    assert storages[2].rd_numb != storages[0].rd_numb
+    assert memo.nresumeshared == 1
+
 
 class ResumeDataFakeReader(ResumeDataBoxReader):
     """Another subclass of AbstractResumeDataReader meant for tests."""
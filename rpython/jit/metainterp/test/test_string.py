@@ -543,6 +543,26 @@ class StringTests:
         self.check_resops({'jump': 1, 'guard_true': 5, 'int_lt': 2,
                            'int_add': 2, 'int_is_true': 3})
 
+    def test_join_with_separator(self):
+        jitdriver = JitDriver(reds=['n', 'result'], greens=[])
+        _str, _chr = self._str, self._chr
+
+        def f(n):
+            result = 0
+            while n > 0:
+                jitdriver.jit_merge_point(n=n, result=result)
+                x = [_chr(48 + n % 10), _str("xy"), _chr(48 + n % 7)]
+                s = _str(", ").join(x)
+                result += len(s) + ord(s[-1])
+                n -= 1
+            return result
+        res = self.meta_interp(f, [20])
+        assert res == f(20)
+        # the join is unrolled on the virtual list, and the string is
+        # virtual too: no residual call to ll_join, and no allocation
+        self.check_resops(call_r=0, call_i=0, newstr=0, newunicode=0,
+                          copystrcontent=0, copyunicodecontent=0)
+
     def test_virtual_copystringcontent(self):
         jitdriver = JitDriver(reds=['n', 'result'], greens=[])
         _str, _StringBuilder = self._str, self._StringBuilder
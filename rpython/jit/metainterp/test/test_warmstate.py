@@ -212,3 +212,33 @@ def test_make_jitdriver_callbacks_5():
     state.make_jitdriver_callbacks()
     res = state.can_never_inline(5, 42.5)
     assert res is True
+
+def test_guard_failure_increment():
+    from rpython.rlib.rarithmetic import r_uint
+    class FakeWarmRunnerDesc:
+        rtyper = None
+        cpu = None
+        memory_manager = None
+        jitcounter = DeterministicJitCounter()
+    state = WarmEnterState(FakeWarmRunnerDesc(), None)
+    state.set_param_trace_eagerness(200)
+    base = state.increment_trace_eagerness
+    # a guard failing many times in a row counts more and more
+    increments = [state.guard_failure_increment(r_uint(5))
+                  for i in range(24)]
+    assert increments[:8] == [base] * 8
+    assert increments[8:16] == [base * 2] * 8
+    assert increments[16:] == [base * 3] * 8
+    # another guard failing in-between resets the streak
+    assert state.guard_failure_increment(r_uint(6)) == base
+    assert state.guard_failure_increment(r_uint(5)) == base
+    # the streak is bounded
+    for i in range(1000):
+        incr = state.guard_failure_increment(r_uint(5))
+    assert incr == base * 32
+    # ticking with these increments compiles much before 200 failures
+    jitcounter = state.warmrunnerdesc.jitcounter
+    for n in range(1, 200):
+        if jitcounter.tick(r_uint(7), state.guard_failure_increment(r_uint(7))):
+            break
+    assert n < 70
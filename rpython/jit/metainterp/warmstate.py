@@ -138,6 +138,7 @@ JC_TRACING         = 0x01
 JC_DONT_TRACE_HERE = 0x02
 JC_TEMPORARY       = 0x04
 JC_TRACING_OCCURRED= 0x08
+JC_SPLIT_TRACE     = 0x10
 
 class BaseJitCell(object):
     """Subclasses of BaseJitCell are used in tandem with the single
@@ -184,6 +185,10 @@ class BaseJitCell(object):
         this particular function.  (We only set this flag when aborting
         due to a trace too long, so we use the same flag as a hint to
         also mean "please trace from here as soon as possible".)
+
+        JC_SPLIT_TRACE: a trace starting from here was aborted as too
+        long, or a trace was split here.  The next traces starting from
+        here may be split after 'trace_split' operations.
     """
     flags = 0     # JC_xxx flags
     wref_procedure_token = None
@@ -215,9 +220,9 @@ class BaseJitCell(object):
             return False    # don't remove JitCells with a procedure_token
         if self.flags & JC_TRACING:
             return False    # don't remove JitCells that are being traced
-        if self.flags & JC_DONT_TRACE_HERE:
-            # if we have this flag, and we *had* a procedure_token but
-            # we no longer have one, then remove me.  this prevents this
+        if self.flags & (JC_DONT_TRACE_HERE | JC_SPLIT_TRACE):
+            # if we have one of these flags, and we *had* a procedure_token
+            # but we no longer have one, then remove me.  this prevents this
             # JitCell from being immortal.
             return self.has_seen_a_procedure_token()     # i.e. dead weakref
         return True   # Other JitCells can be removed.
@@ -225,12 +230,20 @@ class BaseJitCell(object):
 # ____________________________________________________________
 
 
+# every 2**GUARD_FAILURE_STREAK_SHIFT consecutive failures of the same
+# guard, its failures count once more towards 'trace_eagerness'
+GUARD_FAILURE_STREAK_SHIFT = 3
+GUARD_FAILURE_MAX_STREAK = 255
+
+
 class WarmEnterState(object):
 
     def __init__(self, warmrunnerdesc, jitdriver_sd):
         "NOT_RPYTHON"
         self.warmrunnerdesc = warmrunnerdesc
         self.jitdriver_sd = jitdriver_sd
+        self.last_guard_failure = r_uint(0)
+        self.guard_failure_streak = 0
         if warmrunnerdesc is not None:       # for tests
             self.cpu = warmrunnerdesc.cpu
         try:
@@ -256,9 +269,29 @@ class WarmEnterState(object):
     def set_param_trace_eagerness(self, value):
         self.increment_trace_eagerness = self._compute_threshold(value)
 
+    def guard_failure_increment(self, hash):
+        """Return the amount by which the failure of the guard with the
+        given jitcounter 'hash' should be counted.  A guard that keeps
+        failing with no other guard of this jitdriver failing in-between
+        is typically taken at every iteration of its loop: the longer the
+        streak, the more each failure counts, so that such guards get
+        their bridge well before 'trace_eagerness' failures.
+        """
+        if hash == self.last_guard_failure:
+            if self.guard_failure_streak < GUARD_FAILURE_MAX_STREAK:
+                self.guard_failure_streak += 1
+        else:
+            self.last_guard_failure = hash
+            self.guard_failure_streak = 0
+        factor = 1 + (self.guard_failure_streak >> GUARD_FAILURE_STREAK_SHIFT)
+        return self.increment_trace_eagerness * factor
+
     def set_param_trace_limit(self, value):
         self.trace_limit = value
 
+    def set_param_trace_split(self, value):
+        self.trace_split = value
+
     def set_param_decay(self, decay):
         self.warmrunnerdesc.jitcounter.set_decay(decay)
 
@@ -480,6 +513,13 @@ class WarmEnterState(object):
                         if tick:
                             bound_reached(hash, cell, *args)
                         return
+                if (cell.flags & JC_SPLIT_TRACE and
+                        not cell.has_seen_a_procedure_token()):
+                    # an aborted compilation that we will retry, splitting
+                    # the trace.  Count normally, keeping the cell
+                    if jitcounter.tick(hash, increment_threshold):
+                        bound_reached(hash, cell, *args)
+                    return
                 # it was an aborted compilation, or maybe a weakref that
                 # has been freed
                 jitcounter.cleanup_chain(hash)
@@ -630,6 +670,16 @@ class WarmEnterState(object):
             def dont_trace_here(*greenargs):
                 cell = JitCell._ensure_jit_cell_at_key(*greenargs)
                 cell.flags |= JC_DONT_TRACE_HERE
+
+            @staticmethod
+            def allow_split_trace(greenkey):
+                cell = JitCell.ensure_jit_cell_at_key(greenkey)
+                cell.flags |= JC_SPLIT_TRACE
+
+            @staticmethod
+            def can_split_trace(greenkey):
+                cell = JitCell.get_jit_cell_at_key(greenkey)
+                return cell is not None and (cell.flags & JC_SPLIT_TRACE) != 0
         #
         self.JitCell = JitCell
         return JitCell
@@ -24,15 +24,19 @@ REGEXES = [
     (('abort.vable_escape',), '^abort: vable escape:\s+(\d+)$'),
     (('abort.bad_loop',), '^abort: bad loop:\s+(\d+)$'),
     (('abort.force_quasiimmut',), '^abort: force quasi-immut:\s+(\d+)$'),
+    (('trace_splits',), '^trace splits:\s+(\d+)$'),
     (('nvirtuals',), '^nvirtuals:\s+(\d+)$'),
     (('nvholes',), '^nvholes:\s+(\d+)$'),
     (('nvreused',), '^nvreused:\s+(\d+)$'),
+    (('resume_shared',), '^resume shared:\s+(\d+)$'),
     (('vecopt_tried',), '^vecopt tried:\s+(\d+)$'),
     (('vecopt_success',), '^vecopt success:\s+(\d+)$'),
     (('total_compiled_loops',),   '^Total # of loops:\s+(\d+)$'),
     (('total_compiled_bridges',), '^Total # of bridges:\s+(\d+)$'),
     (('total_freed_loops',),      '^Freed # of loops:\s+(\d+)$'),
     (('total_freed_bridges',),    '^Freed # of bridges:\s+(\d+)$'),
+    (('regalloc_moves',),         '^regalloc moves:\s+(\d+)$'),
+    (('regalloc_spills',),        '^regalloc spills:\s+(\d+)$'),
     ]
 
 class Ops(object):
@@ -57,9 +61,11 @@ class OutputInfo(object):
     opt_ops = 0
     opt_guards = 0
     forcings = 0
+    trace_splits = 0
     nvirtuals = 0
     nvholes = 0
     nvreused = 0
+    resume_shared = 0
     vecopt_tried = 0
     vecopt_success = 0
 
@@ -59,15 +59,19 @@ abort: compiling:       11
 abort: vable escape:    12
 abort: bad loop:        135
 abort: force quasi-immut: 3
+trace splits:           7
 nvirtuals:              13
 nvholes:                14
 nvreused:               15
+resume shared:          16
 vecopt tried:           12
 vecopt success:         4
 Total # of loops:       100
 Total # of bridges:     300
 Freed # of loops:       99
 Freed # of bridges:     299
+regalloc moves:         1234
+regalloc spills:        56
 '''
 
 def test_parse():
@@ -88,8 +92,12 @@ def test_parse():
     assert info.abort.vable_escape == 12
     assert info.abort.bad_loop == 135
     assert info.abort.force_quasiimmut == 3
+    assert info.trace_splits == 7
     assert info.nvirtuals == 13
     assert info.nvholes == 14
     assert info.nvreused == 15
+    assert info.resume_shared == 16
     assert info.vecopt_tried == 12
     assert info.vecopt_success == 4
+    assert info.regalloc_moves == 1234
+    assert info.regalloc_spills == 56
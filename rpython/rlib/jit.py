@@ -547,6 +547,7 @@ PARAMETER_DOCS = {
     'trace_eagerness': 'number of times a guard has to fail before we start compiling a bridge',
     'decay': 'amount to regularly decay counters by (0=none, 1000=max)',
     'trace_limit': 'number of recorded operations before we abort tracing with ABORT_TOO_LONG',
+    'trace_split': 'after a trace was aborted with ABORT_TOO_LONG, number of recorded operations after which the next trace from the same place is ended at a merge point of the outermost function, and continued in a new trace; should be below trace_limit (0 = never)',
     'inlining': 'inline python functions or not (1/0)',
     'loop_longevity': 'a parameter controlling how long loops will be kept before being freed, an estimate',
     'retrace_limit': 'how many times we can try retracing before giving up',
@@ -568,6 +569,7 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'trace_eagerness': 200,
               'decay': 40,
               'trace_limit': 6000,
+              'trace_split': 4000,
               'inlining': 1,
               'loop_longevity': 1000,
               'retrace_limit': 0,
@@ -1324,9 +1326,11 @@ class Counters(object):
     ABORT_BAD_LOOP
     ABORT_ESCAPE
     ABORT_FORCE_QUASIIMMUT
+    TRACE_SPLIT
     NVIRTUALS
     NVHOLES
     NVREUSED
+    RESUME_SHARED
     TOTAL_COMPILED_LOOPS
     TOTAL_COMPILED_BRIDGES
     TOTAL_FREED_LOOPS
@@ -112,6 +112,10 @@ def box_isint(llbox):
 def stats_set_debug(warmrunnerdesc, flag):
     return warmrunnerdesc.metainterp_sd.cpu.set_debug(flag)
 
+@register_helper(annmodel.SomeBool())
+def stats_set_guard_counters(warmrunnerdesc, flag):
+    return warmrunnerdesc.metainterp_sd.cpu.set_guard_counters(flag)
+
 @register_helper(annmodel.SomeInteger())
 def stats_get_counter_value(warmrunnerdesc, no):
     return warmrunnerdesc.metainterp_sd.profiler.get_counter(no)
@@ -82,6 +82,27 @@ else:
 
 KARATSUBA_SQUARE_CUTOFF = 2 * KARATSUBA_CUTOFF
 
+# For long division, use the O(N**2) school algorithm unless both the
+# divisor and the quotient have more than DIV_LIMIT digits.  In that case
+# use the recursive algorithm of Burnikel and Ziegler, which turns the
+# division into Karatsuba multiplications, making it O(N**1.585) too.
+# The recursion bottoms out in the school algorithm once the divisor has
+# no more than DIV_LIMIT digits.  The limits here and below were measured
+# on a translated rbigint; the school algorithm has a small constant, so
+# the crossover is well above KARATSUBA_CUTOFF.
+
+if SHIFT > 31:
+    DIV_LIMIT = 300
+else:
+    DIV_LIMIT = 600
+
+# For string-to-long conversion in bases that are not a power of two,
+# split strings of more than STR_TO_LONG_LIMIT characters in two halves
+# and combine them with a single (Karatsuba) multiplication.  Shorter
+# strings are converted digit by digit, without building a list first.
+
+STR_TO_LONG_LIMIT = 500
+
 # For exponentiation, use the binary left-to-right algorithm
 # unless the exponent contains more than FIVEARY_CUTOFF digits.
 # In that case, do 5 bits at a time.  The potential drawback is that
@@ -2046,6 +2067,8 @@ def _divrem(a, b):
     if size_b == 1:
         z, urem = _divrem1(a, b.digit(0))
         rem = rbigint([_store_digit(urem)], int(urem != 0), 1)
+    elif size_b > DIV_LIMIT and size_a - size_b > DIV_LIMIT:
+        z, rem = _divrem_fast(a.abs(), b.abs())
     else:
         z, rem = _x_divrem(a, b)
     # Set the signs.
@@ -2058,6 +2081,108 @@ def _divrem(a, b):
         rem.sign = - rem.sign
     return z, rem
 
+def _digits_slice(x, start, stop):
+    """ Return the digits x[start:stop] of |x| as a new non-negative
+        bigint, i.e. (|x| >> (start*SHIFT)) % BASE**(stop-start). """
+    size = x.numdigits()
+    if stop > size:
+        stop = size
+    if start >= stop:
+        return NULLRBIGINT
+    assert start >= 0
+    z = rbigint(x._digits[start:stop], 1, stop - start)
+    z._normalize()
+    return z
+
+def _digits_concat(hi, lo, n):
+    """ Return hi * BASE**n + lo, for non-negative hi and lo < BASE**n.
+        No arithmetic is needed, the digits are simply juxtaposed. """
+    if hi.sign == 0:
+        return lo
+    size_lo = lo.numdigits()
+    assert 0 < size_lo <= n
+    size_hi = hi.numdigits()
+    digits = (lo._digits[:size_lo] + [NULLDIGIT] * (n - size_lo) +
+              hi._digits[:size_hi])
+    return rbigint(digits, 1, n + size_hi)
+
+def _divrem_pos(a, b):
+    """ Unsigned division with remainder by the school algorithm, for
+        any non-negative a and positive b. """
+    if a.lt(b):
+        return NULLRBIGINT, a
+    if b.numdigits() == 1:
+        z, urem = _divrem1(a, b.digit(0))
+        return z, rbigint([_store_digit(urem)], int(urem != 0), 1)
+    return _x_divrem(a, b)
+
+def _div2n1n(a, b, n):
+    """ Divide a by b, where b has exactly n digits and its top digit
+        has its highest bit set, and a < b * BASE**n.  This is the
+        recursive part of the Burnikel-Ziegler algorithm: the quotient
+        has at most n digits and is computed as two halves by
+        _div3n2n(). """
+    if n <= DIV_LIMIT:
+        return _divrem_pos(a, b)
+    pad = n & 1
+    if pad:
+        a = a.lshift(SHIFT)
+        b = b.lshift(SHIFT)
+        n += 1
+    half_n = n >> 1
+    b1 = _digits_slice(b, half_n, n)
+    b2 = _digits_slice(b, 0, half_n)
+    q1, r = _div3n2n(_digits_slice(a, n, a.numdigits()),
+                     _digits_slice(a, half_n, n), b, b1, b2, half_n)
+    q2, r = _div3n2n(r, _digits_slice(a, 0, half_n), b, b1, b2, half_n)
+    if pad:
+        r = _digits_slice(r, 1, r.numdigits())
+    return _digits_concat(q1, q2, half_n), r
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    """ Helper for _div2n1n(): divide a12 * BASE**n + a3 by b, where
+        b = b1 * BASE**n + b2.  The quotient has at most n digits. """
+    if _digits_slice(a12, n, a12.numdigits()).eq(b1):
+        q = rbigint([_store_digit(MASK)] * n, 1, n)
+        r = a12.sub(b1.lshift(n * SHIFT)).add(b1)
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = _digits_concat(r, a3, n).sub(q.mul(b2))
+    # b is normalized, so this loop runs at most twice
+    while r.sign < 0:
+        q = q.int_sub(1)
+        r = r.add(b)
+    return q, r
+
+def _divrem_fast(a, b):
+    """ Unsigned division with remainder for large a and b, in
+        O(N**1.585) instead of the O(N**2) of _x_divrem().  The dividend is
+        processed in chunks of as many digits as the divisor has, like
+        the school algorithm does with single digits. """
+    n = b.numdigits()
+    # normalize: shift b left so that its top digit is >= BASE/2,
+    # and a by the same amount
+    d = SHIFT - bits_in_digit(b.digit(n - 1))
+    a = a.lshift(d)
+    b = b.lshift(d)
+    assert b.numdigits() == n
+    nchunks = (a.numdigits() + n - 1) // n
+    size_z = nchunks * n
+    z = rbigint([NULLDIGIT] * size_z, 1, size_z)
+    r = NULLRBIGINT
+    i = nchunks - 1
+    while i >= 0:
+        start = i * n
+        chunk = _digits_slice(a, start, start + n)
+        q, r = _div2n1n(_digits_concat(r, chunk, n), b, n)
+        j = 0
+        while j < q.numdigits():
+            z._digits[start + j] = q._digits[j]
+            j += 1
+        i -= 1
+    z._normalize()
+    return z, r.rshift(d)
+
 # ______________ conversions to double _______________
 
 def _AsScaledDouble(v):
@@ -2763,6 +2888,14 @@ def _decimalstr_to_bigint(s):
     elif s[p] == '+':
         p += 1
 
+    if lim - p > STR_TO_LONG_LIMIT:
+        ord0 = ord('0')
+        digits = [ord(s[i]) - ord0 for i in range(p, lim)]
+        a = _digits_to_bigint(digits, 10)
+        if sign and a.sign == 1:
+            a.sign = -1
+        return a
+
     a = rbigint()
     tens = 1
     dig = 0
@@ -2784,6 +2917,16 @@ def parse_digit_string(parser):
     base = parser.base
     if (base & (base - 1)) == 0:
         return parse_string_from_binary_base(parser)
+    if parser.n - parser.i > STR_TO_LONG_LIMIT:
+        digits = []
+        while True:
+            digit = parser.next_digit()
+            if digit < 0:
+                break
+            digits.append(digit)
+        a = _digits_to_bigint(digits, base)
+        a.sign *= parser.sign
+        return a
     a = rbigint()
     digitmax = BASE_MAX[base]
     tens, dig = 1, 0
@@ -2801,6 +2944,58 @@ def parse_digit_string(parser):
     a.sign *= parser.sign
     return a
 
+def _digits_to_bigint(digits, base):
+    """ Turn a list of digits in 'base' (not a power of two) into a
+        non-negative bigint.  Long lists are split recursively at a
+        boundary of base**(mindigits*2**i), whose values are shared with
+        _format(), so that the cost is dominated by Karatsuba
+        multiplications of balanced size. """
+    size = len(digits)
+    if size <= STR_TO_LONG_LIMIT:
+        return _digits_to_bigint_linear(digits, 0, size, base)
+    pts = _parts_cache.get_cached_parts(base)
+    mindigits = _parts_cache.get_mindigits(base)
+    i = 0
+    partsize = mindigits
+    while partsize * 2 < size:
+        i += 1
+        partsize *= 2
+        if i == len(pts):
+            pts.append(pts[-1].mul(pts[-1]))
+    return _digits_to_bigint_recursive(digits, 0, size, base, pts, i,
+                                       partsize)
+
+def _digits_to_bigint_linear(digits, start, stop, base):
+    # the school algorithm, quadratic in (stop - start)
+    a = rbigint()
+    digitmax = BASE_MAX[base]
+    tens, dig = 1, 0
+    while start < stop:
+        dig = dig * base + digits[start]
+        tens *= base
+        start += 1
+        if tens == digitmax or start == stop:
+            a = _muladd1(a, tens, dig)
+            tens, dig = 1, 0
+    return a
+
+def _digits_to_bigint_recursive(digits, start, stop, base, pts, i, partsize):
+    # 'partsize' is mindigits*2**i, the number of digits of base that
+    # pts[i] represents; it is at least half of (stop - start)
+    if stop - start <= STR_TO_LONG_LIMIT:
+        return _digits_to_bigint_linear(digits, start, stop, base)
+    while i >= 0 and partsize >= stop - start:
+        i -= 1
+        partsize >>= 1
+    if i < 0:
+        return _digits_to_bigint_linear(digits, start, stop, base)
+    mid = stop - partsize
+    hi = _digits_to_bigint_recursive(digits, start, mid, base, pts, i - 1,
+                                     partsize >> 1)
+    lo = _digits_to_bigint_recursive(digits, mid, stop, base, pts, i - 1,
+                                     partsize >> 1)
+    return hi.mul(pts[i]).add(lo)
+
 def parse_string_from_binary_base(parser):
     # The point to this routine is that it takes time linear in the number of
     # string characters.
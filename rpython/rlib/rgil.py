@@ -38,6 +38,25 @@ gil_fetch_fastgil = llexternal('RPyFetchFastGil', [], llmemory.Address,
                                _nowrapper=True, sandboxsafe=True,
                                compilation_info=eci)
 
+_gil_set_switch_interval = llexternal('RPyGilSetSwitchInterval',
+                                      [lltype.Signed], lltype.Void,
+                                      _nowrapper=True, sandboxsafe=True,
+                                      compilation_info=eci)
+
+_gil_get_switch_interval = llexternal('RPyGilGetSwitchInterval',
+                                      [], lltype.Signed,
+                                      _nowrapper=True, sandboxsafe=True,
+                                      compilation_info=eci)
+
+_gil_set_ticker   = llexternal('RPyGilSetTicker', [rffi.LONGP], lltype.Void,
+                               _nowrapper=True, sandboxsafe=True,
+                               compilation_info=eci)
+
+_gil_wait_stats   = llexternal('RPyGilWaitStats', [lltype.Signed],
+                               rffi.LONGLONG,
+                               _nowrapper=True, sandboxsafe=True,
+                               compilation_info=eci)
+
 # ____________________________________________________________
 
 
@@ -144,3 +163,29 @@ yield_thread._dont_inline_ = True
 # yield_thread() needs a different hint: _gctransformer_hint_close_stack_.
 # The *_external_call() functions are themselves called only from the rffi
 # module from a helper function that also has this hint.
+
+
+def set_switch_interval(microseconds):
+    """Set the time after which a thread waiting for the GIL asks the
+    thread holding it to yield.  The request is made by setting to -1
+    the ticker given to set_ticker()."""
+    _gil_set_switch_interval(microseconds)
+
+def get_switch_interval():
+    return _gil_get_switch_interval()
+
+def set_ticker(ticker):
+    """Register the address of the tick counter, as a LONGP.  The
+    program must check it regularly and call yield_thread() when it
+    becomes negative."""
+    _gil_set_ticker(ticker)
+
+WAIT_STATS = ['thread_wait_time', 'thread_waits',
+              'total_wait_time', 'total_waits', 'switch_requests']
+
+def get_wait_stats():
+    """Return a tuple of r_longlongs in the order given by WAIT_STATS.
+    The times are in microseconds; the 'thread_*' entries are about the
+    current thread only."""
+    return (_gil_wait_stats(0), _gil_wait_stats(1), _gil_wait_stats(2),
+            _gil_wait_stats(3), _gil_wait_stats(4))
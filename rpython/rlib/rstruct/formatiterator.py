@@ -79,6 +79,29 @@ class FormatIterator(object):
                 self.operate(fmtdesc, repetitions)
         self.finished()
 
+    @jit.look_inside_iff(lambda self, plan: jit.isconstant(plan))
+    def interpret_plan(self, plan):
+        """Like interpret(), for a format that was compiled into a
+        FormatPlan by compile_format(): only the steps are left to do,
+        the format string is not parsed again."""
+        self.bigendian = plan.bigendian
+        if plan.standard:
+            table = unroll_standard_fmtdescs
+        else:
+            table = unroll_native_fmtdescs
+        for i in range(len(plan.fmtchars)):
+            c = plan.fmtchars[i]
+            repetitions = plan.repetitions[i]
+            for fmtdesc in table:
+                if c == fmtdesc.fmtchar:
+                    if fmtdesc.alignment > 1:
+                        self.align(fmtdesc.mask)
+                    self.operate(fmtdesc, repetitions)
+                    break
+            else:
+                raise AssertionError("bad char in compiled struct format")
+        self.finished()
+
     def finished(self):
         pass
 
@@ -101,6 +124,43 @@ class CalcSizeFormatIterator(FormatIterator):
             raise StructError("total struct size too long")
 
 
+class FormatPlan(object):
+    """A struct format compiled once by compile_format(): the byte
+    order and table, and the list of (fmtchar, repetitions) steps."""
+    _immutable_fields_ = ['standard', 'bigendian', 'fmtchars',
+                          'repetitions[*]', 'size']
+
+    def __init__(self, standard, bigendian, fmtchars, repetitions, size):
+        self.standard = standard
+        self.bigendian = bigendian
+        self.fmtchars = fmtchars
+        self.repetitions = repetitions
+        self.size = size
+
+
+class CompileFormatIterator(CalcSizeFormatIterator):
+    def __init__(self):
+        self.fmtchars = []
+        self.repetitions = []
+
+    def operate(self, fmtdesc, repetitions):
+        CalcSizeFormatIterator.operate(self, fmtdesc, repetitions)
+        self.fmtchars.append(fmtdesc.fmtchar)
+        self.repetitions.append(repetitions)
+
+
+def compile_format(fmt):
+    """Parse 'fmt' once and return a FormatPlan for it, to be run by
+    FormatIterator.interpret_plan().  Raises StructError like
+    interpret()."""
+    fmtiter = CompileFormatIterator()
+    fmtiter.interpret(fmt)
+    standard = len(fmt) > 0 and fmt[0] in '=<>!'
+    return FormatPlan(standard, fmtiter.bigendian,
+                      ''.join(fmtiter.fmtchars), fmtiter.repetitions[:],
+                      fmtiter.totalsize)
+
+
 class FmtDesc(object):
     def __init__(self, fmtchar, attrs):
         self.fmtchar = fmtchar
@@ -4,8 +4,12 @@ from rpython.rlib.rstring import StringBuilder, UnicodeBuilder
 from rpython.rlib.rarithmetic import r_uint, intmask, widen
 from rpython.rlib.unicodedata import unicodedb
 from rpython.tool.sourcetools import func_with_new_name
-from rpython.rtyper.lltypesystem import lltype, rffi
+from rpython.rtyper.lltypesystem import lltype, llmemory, rffi
+from rpython.rtyper.lltypesystem.lloperation import llop
+from rpython.rtyper.lltypesystem.rstr import STR, UNICODE
+from rpython.rtyper.annlowlevel import llstr, llunicode
 from rpython.rlib import jit, nonconst
+from rpython.rlib.rawstorage import misaligned_is_fine
 
 
 if rffi.sizeof(lltype.UniChar) == 4:
@@ -108,6 +112,92 @@ def default_unicode_error_encode(errors, encoding, msg, u,
         return u'', None, endingpos
     raise UnicodeEncodeError(encoding, u, startingpos, endingpos, msg)
 
+# ____________________________________________________________
+# ASCII runs, checked one machine word at a time
+
+_WORD = rffi.sizeof(lltype.Unsigned)
+_UNICHAR_SIZE = rffi.sizeof(lltype.UniChar)
+_CHARS_PER_WORD = _WORD // _UNICHAR_SIZE
+
+def _word_mask(itemsize, limit):
+    # the bits that are set in a word iff one of its items is >= limit
+    item_mask = (1 << (8 * itemsize)) - limit
+    mask = 0
+    for i in range(_WORD // itemsize):
+        mask |= item_mask << (8 * itemsize * i)
+    return r_uint(mask)
+
+_STR_MASK_128 = _word_mask(1, 128)
+_UNICODE_MASK_128 = _word_mask(_UNICHAR_SIZE, 128)
+_UNICODE_MASK_256 = _word_mask(_UNICHAR_SIZE, 256)
+_STR_BASE_OFS = (llmemory.offsetof(STR, 'chars') +
+                 llmemory.itemoffsetof(STR.chars, 0))
+_UNICODE_BASE_OFS = (llmemory.offsetof(UNICODE, 'chars') +
+                     llmemory.itemoffsetof(UNICODE.chars, 0))
+
+def _find_non_ascii(s, start, end):
+    """Return the index of the first byte >= 0x80 in s[start:end], or
+    'end' if there is none.  Reads a whole word at a time when that is
+    possible."""
+    pos = start
+    if we_are_translated() and misaligned_is_fine:
+        gcref = lltype.cast_opaque_ptr(llmemory.GCREF, llstr(s))
+        while pos + _WORD <= end:
+            word = llop.gc_load_indexed(lltype.Unsigned, gcref, pos,
+                                        llmemory.sizeof(lltype.Char),
+                                        _STR_BASE_OFS)
+            if word & _STR_MASK_128:
+                break
+            pos += _WORD
+    while pos < end and ord(s[pos]) < 0x80:
+        pos += 1
+    return pos
+
+def _find_non_ucs1(u, start, end, limit):
+    """Return the index of the first character >= limit (128 or 256) in
+    u[start:end], or 'end' if there is none.  Like _find_non_ascii()."""
+    pos = start
+    if we_are_translated() and misaligned_is_fine:
+        if limit == 128:
+            mask = _UNICODE_MASK_128
+        else:
+            mask = _UNICODE_MASK_256
+        gcref = lltype.cast_opaque_ptr(llmemory.GCREF, llunicode(u))
+        while pos + _CHARS_PER_WORD <= end:
+            word = llop.gc_load_indexed(lltype.Unsigned, gcref, pos,
+                                        llmemory.sizeof(lltype.UniChar),
+                                        _UNICODE_BASE_OFS)
+            if word & mask:
+                break
+            pos += _CHARS_PER_WORD
+    while pos < end and ord(u[pos]) < limit:
+        pos += 1
+    return pos
+
+def _decode_ucs1(s, size):
+    # s[:size] is known to be latin-1 or ASCII: a single widening copy
+    assert size >= 0
+    if size < len(s):
+        s = s[:size]
+    return s.decode('latin-1')
+
+def _encode_ucs1(u, size):
+    # u[:size] is known to be latin-1 or ASCII: a single narrowing copy
+    assert size >= 0
+    if size < len(u):
+        u = u[:size]
+    return u.encode('latin-1')
+
+def _append_ascii_run(result, s, start, end):
+    # widen the bytes s[start:end], known to be ASCII, into 'result'
+    for i in range(start, end):
+        result.append(unichr(ord(s[i])))
+
+def _append_ucs1_run(result, u, start, end):
+    # narrow the characters u[start:end], known to be < 256, into 'result'
+    for i in range(start, end):
+        result.append(chr(ord(u[i])))
+
 # ____________________________________________________________
 # utf-8
 
@@ -160,15 +250,19 @@ def str_decode_utf_8_impl(s, size, errors, final, errorhandler,
     if size == 0:
         return u'', 0
 
+    pos = _find_non_ascii(s, 0, size)
+    if pos == size:
+        # fast path for pure ASCII
+        return _decode_ucs1(s, size), size
     result = UnicodeBuilder(size)
-    pos = 0
+    _append_ascii_run(result, s, 0, pos)
     while pos < size:
         ordch1 = ord(s[pos])
         # fast path for ASCII
-        # XXX maybe use a while loop here
         if ordch1 < 0x80:
-            result.append(unichr(ordch1))
-            pos += 1
+            end = _find_non_ascii(s, pos + 1, size)
+            _append_ascii_run(result, s, pos, end)
+            pos = end
             continue
 
         n = ord(_utf8_code_length[ordch1 - 0x80])
@@ -346,14 +440,21 @@ def unicode_encode_utf_8(s, size, errors, errorhandler=None,
 def unicode_encode_utf_8_impl(s, size, errors, errorhandler,
                               allow_surrogates=False):
     assert(size >= 0)
+    pos = _find_non_ucs1(s, 0, size, 128)
+    if pos == size:
+        # fast path for pure ASCII
+        return _encode_ucs1(s, size)
     result = StringBuilder(size)
-    pos = 0
+    _append_ucs1_run(result, s, 0, pos)
     while pos < size:
         ch = ord(s[pos])
         pos += 1
         if ch < 0x80:
             # Encode ASCII
+            end = _find_non_ucs1(s, pos, size, 128)
             result.append(chr(ch))
+            _append_ucs1_run(result, s, pos, end)
+            pos = end
         elif ch < 0x0800:
             # Encode Latin-1
             result.append(chr((0xc0 | (ch >> 6))))
@@ -1221,12 +1322,7 @@ def unicode_encode_utf_7(s, size, errors, errorhandler=None):
 def str_decode_latin_1(s, size, errors, final=False,
                        errorhandler=None):
     # latin1 is equivalent to the first 256 ordinals in Unicode.
-    pos = 0
-    result = UnicodeBuilder(size)
-    while pos < size:
-        result.append(unichr(ord(s[pos])))
-        pos += 1
-    return result.build(), pos
+    return _decode_ucs1(s, size), size
 
 
 def str_decode_ascii(s, size, errors, final=False,
@@ -1234,13 +1330,17 @@ def str_decode_ascii(s, size, errors, final=False,
     if errorhandler is None:
         errorhandler = default_unicode_error_decode
     # ASCII is equivalent to the first 128 ordinals in Unicode.
+    pos = _find_non_ascii(s, 0, size)
+    if pos == size:
+        return _decode_ucs1(s, size), size
     result = UnicodeBuilder(size)
-    pos = 0
+    _append_ascii_run(result, s, 0, pos)
     while pos < size:
         c = s[pos]
         if ord(c) < 128:
-            result.append(unichr(ord(c)))
-            pos += 1
+            end = _find_non_ascii(s, pos + 1, size)
+            _append_ascii_run(result, s, pos, end)
+            pos = end
         else:
             r, pos = errorhandler(errors, "ascii", "ordinal not in range(128)",
                                   s,  pos, pos + 1)
@@ -1250,12 +1350,10 @@ def str_decode_ascii(s, size, errors, final=False,
 # An elidable version, for a subset of the cases
 @jit.elidable
 def fast_str_decode_ascii(s):
-    result = UnicodeBuilder(len(s))
-    for c in s:
-        if ord(c) >= 128:
-            raise ValueError
-        result.append(unichr(ord(c)))
-    return result.build()
+    size = len(s)
+    if _find_non_ascii(s, 0, size) < size:
+        raise ValueError
+    return _decode_ucs1(s, size)
 
 
 def unicode_encode_ucs1_helper(p, size, errors,
@@ -1271,14 +1369,18 @@ def unicode_encode_ucs1_helper(p, size, errors,
 
     if size == 0:
         return ''
+    pos = _find_non_ucs1(p, 0, size, limit)
+    if pos == size:
+        return _encode_ucs1(p, size)
     result = StringBuilder(size)
-    pos = 0
+    _append_ucs1_run(result, p, 0, pos)
     while pos < size:
         ch = p[pos]
 
         if ord(ch) < limit:
-            result.append(chr(ord(ch)))
-            pos += 1
+            end = _find_non_ucs1(p, pos + 1, size, limit)
+            _append_ucs1_run(result, p, pos, end)
+            pos = end
         else:
             # startpos for collecting unencodable chars
             collstart = pos
@@ -1385,6 +1487,112 @@ def unicode_encode_charmap(s, size, errors, errorhandler=None,
         pos += 1
     return result.build()
 
+class EncodingMap(object):
+    """ The reverse of a charmap decoding table of 256 characters, for
+    the charmap encoder: a two-level table from code points to byte
+    values.  The first level maps code >> 8 to a block of 256 entries in
+    the second level; block 0 is empty, shared by all the unused ranges.
+    """
+    _immutable_fields_ = ['level1[*]', 'level2[*]']
+
+    def __init__(self, decoding_table):
+        assert len(decoding_table) == 256
+        maxcode = 0
+        for ch in decoding_table:
+            code = ord(ch)
+            if code != 0xfffe and code > maxcode:
+                maxcode = code
+        level1 = [0] * ((maxcode >> 8) + 1)
+        nblocks = 1
+        for ch in decoding_table:
+            code = ord(ch)
+            if code != 0xfffe and level1[code >> 8] == 0:
+                level1[code >> 8] = nblocks
+                nblocks += 1
+        level2 = [-1] * (nblocks << 8)
+        for i in range(256):
+            code = ord(decoding_table[i])
+            if code != 0xfffe:     # ERROR_CHAR: undefined in the table
+                level2[(level1[code >> 8] << 8) | (code & 0xff)] = i
+        self.level1 = level1
+        self.level2 = level2
+
+    def get(self, code):
+        "Return the byte value for the code point, or -1 if unmapped."
+        index = code >> 8
+        if index >= len(self.level1):
+            return -1
+        return self.level2[(self.level1[index] << 8) | (code & 0xff)]
+
+    def get_size(self):
+        "Return the number of table entries."
+        return len(self.level1) + len(self.level2)
+
+def str_decode_charmap_table(s, size, errors, final=False,
+                             errorhandler=None, table=u''):
+    """ Like str_decode_charmap() with a decoding table given as a unicode
+    string, as in the encodings package: byte i decodes to table[i]. """
+    if errorhandler is None:
+        errorhandler = default_unicode_error_decode
+    if size == 0:
+        return u'', 0
+
+    pos = 0
+    tablesize = len(table)
+    result = UnicodeBuilder(size)
+    while pos < size:
+        index = ord(s[pos])
+        if index < tablesize:
+            ch = table[index]
+            if ch != ERROR_CHAR:
+                result.append(ch)
+                pos += 1
+                continue
+        r, pos = errorhandler(errors, "charmap",
+                              "character maps to <undefined>",
+                              s,  pos, pos + 1)
+        result.append(r)
+    return result.build(), pos
+
+def unicode_encode_charmap_table(s, size, errors, errorhandler=None,
+                                 encoding_map=None):
+    """ Like unicode_encode_charmap() with an EncodingMap. """
+    assert encoding_map is not None
+    if errorhandler is None:
+        errorhandler = default_unicode_error_encode
+
+    if size == 0:
+        return ''
+    result = StringBuilder(size)
+    pos = 0
+    while pos < size:
+        c = encoding_map.get(ord(s[pos]))
+        if c < 0:
+            # collect all unencodable chars. Important for narrow builds.
+            collend = pos + 1
+            while collend < size and encoding_map.get(ord(s[collend])) < 0:
+                collend += 1
+            ru, rs, pos = errorhandler(errors, "charmap",
+                                       "character maps to <undefined>",
+                                       s, pos, collend)
+            if rs is not None:
+                # py3k only
+                result.append(rs)
+                continue
+            for ch2 in ru:
+                c2 = encoding_map.get(ord(ch2))
+                if c2 < 0:
+                    errorhandler(
+                        "strict", "charmap",
+                        "character maps to <undefined>",
+                        s,  pos, pos + 1)
+                    continue
+                result.append(chr(c2))
+            continue
+        result.append(chr(c))
+        pos += 1
+    return result.build()
+
 # ____________________________________________________________
 # Unicode escape
 
@@ -34,10 +34,10 @@ an outout-buffering stream.
 # where r_longlong values end up: as argument to seek() and truncate() and
 # return value of tell(), but not as argument to read().
 
-import os, sys, errno
+import os, sys, errno, stat
 from rpython.rlib.objectmodel import specialize, we_are_translated, not_rpython
 from rpython.rlib.rarithmetic import r_longlong, intmask
-from rpython.rlib import rposix, nonconst, _rsocket_rffi as _c
+from rpython.rlib import rposix, nonconst, rmmap, _rsocket_rffi as _c
 from rpython.rlib.rstring import StringBuilder
 
 from os import O_RDONLY, O_WRONLY, O_RDWR, O_CREAT, O_TRUNC, O_APPEND
@@ -79,6 +79,11 @@ def replace_char_with_str(string, c, s):
 def open_file_as_stream(path, mode="r", buffering=-1, signal_checker=None):
     os_flags, universal, reading, writing, basemode, binary = decode_mode(mode)
     stream = open_path_helper(path, os_flags, basemode == "a", signal_checker)
+    if 'm' in mode and not writing:
+        # like glibc's fopen(), the 'm' flag asks for a memory-mapped file
+        stream = try_to_mmap(stream)
+        if isinstance(stream, MMapInputFile):
+            buffering = 0     # the whole file is already "buffered"
     return construct_stream_tower(stream, buffering, universal, reading,
                                   writing, binary)
 
@@ -138,6 +143,8 @@ def decode_mode(mode):
             universal = True
         elif c == 'b':
             binary = True
+        elif c == 'm':
+            pass      # mmap, handled by open_file_as_stream()
         else:
             break
 
@@ -292,7 +299,8 @@ class Stream(object):
     def close1(self, closefileno):
         pass
 
-    def peek(self):
+    def peek(self, size=-1):
+        # 'size' is a hint: the caller will not read more than that
         return (0, '')
 
     def count_buffered_bytes(self):
@@ -389,6 +397,156 @@ class DiskFile(Stream):
     def try_to_find_file_descriptor(self):
         return self.fd
 
+_MMAP_INPUT = sys.platform != "win32"
+
+def try_to_mmap(stream):
+    """Return an MMapInputFile reading from the same file as the
+    DiskFile 'stream', or 'stream' itself if the file cannot be mapped
+    (e.g. pipes, sockets, empty files, or on Windows).
+    """
+    if not _MMAP_INPUT:
+        return stream
+    fd = stream.try_to_find_file_descriptor()
+    try:
+        st = os.fstat(fd)
+    except OSError:
+        return stream
+    if not stat.S_ISREG(st[stat.ST_MODE]) or st[stat.ST_SIZE] == 0:
+        return stream
+    try:
+        return MMapInputFile(fd)
+    except (OSError, rmmap.RMMapError):
+        return stream
+
+
+class MMapInputFile(Stream):
+    """Read-only basis stream using a memory map of the whole file.
+
+    There is no read() system call and no separate buffer: read() and
+    readline() copy their result directly out of the mapping.  If the
+    file grows, the new data is mapped again when we reach the end.
+    The position of the file descriptor itself is kept at the end of
+    the mapped data, so that code reading directly from the file
+    descriptor after count_buffered_bytes() sees the data that follows.
+
+    The size of the file is checked again when we reach the end of the
+    data and before seeking relative to the end, and we never read past
+    it.  Like with any memory map, a file that is truncated by another
+    process while we are reading in the middle of it can still crash
+    the process with SIGBUS.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.pos = 0
+        self.mm = rmmap.mmap(fd, 0, access=rmmap.ACCESS_READ)
+        self.size = self.mm.size    # never larger than the current file
+        os.lseek(fd, self.size, 0)
+
+    def _update_size(self):
+        # the file may have been truncated or extended since it was
+        # mapped; pages past the end of a truncated file must not be read
+        try:
+            filesize = self.mm.file_size()
+        except OSError:
+            return
+        if filesize > self.mm.size:
+            self.mm.close()
+            self.mm = rmmap.mmap(self.fd, 0, access=rmmap.ACCESS_READ)
+            filesize = self.mm.size
+        elif filesize == self.size:
+            return
+        self.size = filesize
+        os.lseek(self.fd, filesize, 0)
+
+    def _available(self):
+        n = self.size - self.pos
+        if n <= 0:
+            self._update_size()
+            n = self.size - self.pos
+        return n
+
+    def tell(self):
+        return r_longlong(self.pos)
+
+    def seek(self, offset, whence):
+        if whence == 0:
+            newpos = offset
+        elif whence == 1:
+            newpos = self.pos + offset
+        elif whence == 2:
+            self._update_size()
+            newpos = self.size + offset
+        else:
+            raise StreamError("seek(): whence must be 0, 1 or 2")
+        if newpos < 0:
+            raise OSError(errno.EINVAL, "Invalid argument")
+        self.pos = offset2int(newpos)
+
+    def read(self, n):
+        assert isinstance(n, int)
+        available = self._available()
+        if n > available:
+            n = available
+        if n <= 0:
+            return ""
+        data = self.mm.getslice(self.pos, n)
+        self.pos += n
+        return data
+
+    def readall(self):
+        result = []
+        while True:
+            data = self.read(self._available())
+            if not data:
+                break
+            result.append(data)
+        return ''.join(result)
+
+    def readline(self):
+        result = []
+        while True:
+            available = self._available()
+            if available <= 0:
+                break
+            start = self.pos
+            stop = start + available
+            end = start
+            data = self.mm.data
+            while end < stop:
+                if data[end] == '\n':
+                    end += 1
+                    break
+                end += 1
+            line = self.mm.getslice(start, end - start)
+            self.pos = end
+            result.append(line)
+            if line.endswith('\n'):
+                break
+        return ''.join(result)
+
+    def peek(self, size=-1):
+        # don't copy the whole file, only what the caller may read
+        n = self.size - self.pos
+        if size < 0:
+            size = 8192
+        if n > size:
+            n = size
+        if n <= 0:
+            return (0, '')
+        return (0, self.mm.getslice(self.pos, n))
+
+    def count_buffered_bytes(self):
+        return max(0, self.size - self.pos)
+
+    def close1(self, closefileno):
+        self.mm.close()
+        if closefileno:
+            os.close(self.fd)
+
+    def try_to_find_file_descriptor(self):
+        return self.fd
+
 # next class is not RPython
 
 class MMapFile(Stream):
@@ -750,7 +908,7 @@ class BufferingInputStream(Stream):
             chunks.append(self.buf)
         return "".join(chunks)
 
-    def peek(self):
+    def peek(self, size=-1):
         return (self.pos, self.buf)
 
     write      = PassThrough("write",     flush_buffers=True)
@@ -1102,7 +1260,7 @@ class TextInputFilter(Stream):
             else:
                 self.buf = ""
 
-    def peek(self):
+    def peek(self, size=-1):
         return (0, self.buf)
 
     write      = PassThrough("write",     flush_buffers=True)
@@ -816,6 +816,58 @@ class TestInternalFunctions(object):
                 assert rem.tolong() == _rem
         py.test.raises(ZeroDivisionError, rbigint.fromlong(x).divmod, rbigint.fromlong(0))
 
+    def test__divrem_fast(self, monkeypatch):
+        monkeypatch.setattr(lobj, "DIV_LIMIT", 3)
+        for size_a, size_b in [(8, 4), (9, 4), (20, 7), (21, 20), (40, 13),
+                               (33, 16), (17, 1), (60, 29)]:
+            for i in range(5):
+                x = long(randint(1, 1 << (SHIFT * size_a)))
+                y = long(randint(1, 1 << (SHIFT * size_b)))
+                if i == 0:
+                    # the divisor's top digit is already normalized
+                    y |= 1 << (SHIFT * size_b - 1)
+                elif i == 1:
+                    # exercise the q = BASE**n - 1 case of _div3n2n()
+                    x = (y << (SHIFT * (size_a - size_b))) - 1
+                f1 = rbigint.fromlong(x)
+                f2 = rbigint.fromlong(y)
+                div, rem = lobj._divrem_fast(f1, f2)
+                _div, _rem = divmod(x, y)
+                assert div.tolong() == _div
+                assert rem.tolong() == _rem
+                if f2.numdigits() > 1 and not f1.lt(f2):
+                    div2, rem2 = lobj._x_divrem(f1, f2)
+                    assert div.eq(div2)
+                    assert rem.eq(rem2)
+
+    def test_divmod_fast(self, monkeypatch):
+        monkeypatch.setattr(lobj, "DIV_LIMIT", 3)
+        x = 3 ** 1000 + 12345
+        y = 7 ** 300 - 1
+        for sx, sy in (1, 1), (1, -1), (-1, -1), (-1, 1):
+            f1 = rbigint.fromlong(sx * x)
+            f2 = rbigint.fromlong(sy * y)
+            div, rem = f1.divmod(f2)
+            _div, _rem = divmod(sx * x, sy * y)
+            assert div.tolong() == _div
+            assert rem.tolong() == _rem
+        assert f1.str() == str(-x)
+
+    def test_fromstr_recursive(self, monkeypatch):
+        monkeypatch.setattr(lobj, "STR_TO_LONG_LIMIT", 10)
+        for s in ['1' * 11, '9' * 100, '1' + '0' * 300, '0' * 50 + '12',
+                  '31415926535897932384626433832795' * 9]:
+            assert rbigint.fromdecimalstr(s).tolong() == long(s)
+            assert rbigint.fromdecimalstr('-' + s).tolong() == -long(s)
+            assert rbigint.fromstr(s, 10).tolong() == long(s)
+            assert rbigint.fromstr('-' + s, 10).tolong() == -long(s)
+            assert rbigint.fromstr(s, 36).tolong() == long(s, 36)
+        s = '6543210' * 40
+        assert rbigint.fromstr(s, 7).tolong() == long(s, 7)
+        s = 'zyx0' * 80
+        assert rbigint.fromstr(s, 36).tolong() == long(s, 36)
+        assert rbigint.fromstr('0' * 80).sign == 0
+
     # testing Karatsuba stuff
     def test__v_iadd(self):
         f1 = bigint([lobj.MASK] * 10, 1)
@@ -891,6 +943,7 @@ class TestInternalFunctions(object):
                 self.base = base
                 self.sign = sign
                 self.i = 0
+                self.n = len(digits)
                 self._digits = digits
             def next_digit(self):
                 i = self.i
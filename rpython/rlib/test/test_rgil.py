@@ -37,6 +37,21 @@ class BaseTestGIL(StandaloneTests):
         data = cbuilder.cmdexec('')
         assert data == "Test\n1\n2\n"
 
+    def test_switch_interval_and_stats(self):
+        def main(argv):
+            print rgil.get_switch_interval()
+            rgil.set_switch_interval(100)
+            print rgil.get_switch_interval()
+            rgil.set_switch_interval(0)
+            print rgil.get_switch_interval()
+            stats = rgil.get_wait_stats()
+            print len(stats), int(stats[1] == stats[3] == 0)
+            return 0
+
+        t, cbuilder = self.compile(main)
+        data = cbuilder.cmdexec('')
+        assert data == "5000\n100\n1\n5 1\n"
+
 
 class TestGILAsmGcc(BaseTestGIL):
     gc = 'minimark'
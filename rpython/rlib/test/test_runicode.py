@@ -137,6 +137,31 @@ class UnicodeTests(object):
                                             mapping=mapping)
         assert r == 'aa aa'
 
+    def test_charmap_table(self):
+        table = u''.join([unichr(i) for i in range(200)] +
+                         [unichr(0x2000 + i) for i in range(55)] +
+                         [u'\ufffe'])
+        encoding_map = runicode.EncodingMap(table)
+        assert encoding_map.get(ord('a')) == ord('a')
+        assert encoding_map.get(0x2000) == 200
+        assert encoding_map.get(0x2036) == 254
+        assert encoding_map.get(0x2037) == -1
+        assert encoding_map.get(0xfffe) == -1
+        assert encoding_map.get(0x10ffff) == -1
+        assert encoding_map.get_size() == (0x20 + 1) + 3 * 256
+        s = u'ab\u2001\xc7'
+        r = runicode.unicode_encode_charmap_table(
+            s, len(s), 'strict', encoding_map=encoding_map)
+        assert r == 'ab\xc9\xc7'
+        u, consumed = runicode.str_decode_charmap_table(
+            r, len(r), 'strict', True, table=table)
+        assert (u, consumed) == (s, len(r))
+        py.test.raises(UnicodeDecodeError, runicode.str_decode_charmap_table,
+                       '\xff', 1, 'strict', True, table=table)
+        py.test.raises(UnicodeEncodeError,
+                       runicode.unicode_encode_charmap_table,
+                       u'\u2037', 1, 'strict', encoding_map=encoding_map)
+
 
 class TestDecoding(UnicodeTests):
     # XXX test bom recognition in utf-16
@@ -920,6 +945,37 @@ class TestTranslation(object):
         res = interpret(f, [2])
         assert res
 
+    def test_find_non_ascii(self):
+        from rpython.rtyper.test.test_llinterp import interpret
+        def f(n, m):
+            s = 'a' * n + '\xe9' + 'b' * m
+            u = u'a' * n + u'\xe9' + u'\u1234' + u'b' * m
+            size = n + 1 + m
+            return (runicode._find_non_ascii(s, 0, size) * 1000000 +
+                    runicode._find_non_ascii(s, n + 1, size) * 10000 +
+                    runicode._find_non_ucs1(u, 0, size, 128) * 100 +
+                    runicode._find_non_ucs1(u, 0, size, 256))
+        for n, m in [(0, 0), (3, 0), (7, 9), (8, 8), (9, 17), (16, 1)]:
+            res = interpret(f, [n, m])
+            expected = (n * 1000000 + (n + 1 + m) * 10000 + n * 100 +
+                        n + 1)
+            assert res == expected
+
+    def test_ascii_runs(self):
+        from rpython.rtyper.test.test_llinterp import interpret
+        def f(n):
+            s = ('abcdefghijk' * n + '\xc3\xa9') * 3
+            u, consumed = runicode.str_decode_utf_8(s, len(s), 'strict')
+            s2 = runicode.unicode_encode_utf_8(u, len(u), 'strict')
+            s3 = runicode.unicode_encode_latin_1(u, len(u), 'strict')
+            u4, _ = runicode.str_decode_ascii(s3, len(s3), 'replace')
+            s5 = runicode.unicode_encode_ascii(u4, len(u4), 'replace')
+            return (s2 == s and consumed == len(s) and
+                    s3 == ('abcdefghijk' * n + '\xe9') * 3 and
+                    s5 == ('abcdefghijk' * n + '?') * 3)
+        assert interpret(f, [1])
+        assert interpret(f, [3])
+
     def test_surrogates(self):
         if runicode.MAXUNICODE < 65536:
             py.test.skip("Narrow unicode build")
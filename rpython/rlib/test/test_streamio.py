@@ -730,6 +730,96 @@ class TestMMapFile(BaseTestBufferingInputStreamTests):
         assert file.tell() == len("BooHoo\nBarf\na\nb\nc\n")
 
 
+class TestMMapInputFile(TestMMapFile):
+
+    def makeStream(self, tell=None, seek=None, bufsize=-1, mode="r"):
+        self.teardown_method(None) # for tests calling makeStream() several time
+        self.tfn = str(udir.join('streamio%03d' % TestMMapFile.Counter))
+        TestMMapFile.Counter += 1
+        f = open(self.tfn, "wb")
+        f.writelines(self.packets)
+        f.close()
+        self.fd = os.open(self.tfn, os.O_RDONLY)
+        return streamio.MMapInputFile(self.fd)
+
+    def test_write(self):
+        pass    # read-only
+
+    def test_file_grows(self):
+        file = self.makeStream()
+        assert file.readall() == "".join(self.packets)
+        assert file.read(5) == ""
+        f = open(self.tfn, "ab")
+        f.write("more\nlines")
+        f.close()
+        assert file.readline() == "more\n"
+        assert file.read(100) == "lines"
+        assert file.count_buffered_bytes() == 0
+        file.close()
+
+    def test_file_truncated(self):
+        file = self.makeStream()
+        assert file.read(3) == "".join(self.packets)[:3]
+        f = open(self.tfn, "r+b")
+        f.truncate(5)
+        f.close()
+        file.seek(0, 2)
+        assert file.tell() == 5
+        assert file.read(10) == ""
+        file.seek(1, 0)
+        assert file.readall() == "".join(self.packets)[1:5]
+        assert file.count_buffered_bytes() == 0
+        file.close()
+
+    def test_peek_size(self):
+        file = self.makeStream()
+        data = "".join(self.packets)
+        assert file.peek(3) == (0, data[:3])
+        assert file.peek() == (0, data)
+        file.seek(-2, 2)
+        assert file.peek(100) == (0, data[-2:])
+        file.close()
+
+    def test_open_file_as_stream(self):
+        self.makeStream().close()
+        stream = streamio.open_file_as_stream(self.tfn, "rbm")
+        assert isinstance(stream, streamio.MMapInputFile)
+        assert stream.readall() == "".join(self.packets)
+        stream.close()
+        stream = streamio.open_file_as_stream(self.tfn, "rb")
+        assert isinstance(stream, streamio.BufferingInputStream)
+        stream.close()
+        stream = streamio.open_file_as_stream(self.tfn, "r+bm")
+        assert isinstance(stream.base, streamio.BufferingOutputStream)
+        stream.close()
+
+    def test_open_file_as_stream_empty(self):
+        fn = str(udir.join('streamio_empty'))
+        open(fn, "wb").close()
+        stream = streamio.open_file_as_stream(fn, "rbm")
+        assert not isinstance(stream, streamio.MMapInputFile)
+        assert stream.readall() == ""
+        stream.close()
+
+    def test_readline_translated(self):
+        from rpython.rtyper.test.test_llinterp import interpret
+        fn = self.tfn = str(udir.join('streamio_mmap_translated'))
+        f = open(fn, "wb")
+        f.write("abc\ndefg\nhi")
+        f.close()
+        def f():
+            stream = streamio.open_file_as_stream(fn, "rm")
+            lines = []
+            while True:
+                line = stream.readline()
+                if not line:
+                    break
+                lines.append(line)
+            stream.close()
+            return len(lines) * 100 + len(lines[1])
+        assert interpret(f, []) == 305
+
+
 class BaseTestBufferingInputOutputStreamTests(BaseRtypingTest):
 
     def test_write(self):
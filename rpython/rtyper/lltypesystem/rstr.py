@@ -520,6 +520,8 @@ class LLHelpers(AbstractLLHelpers):
         return result
 
     @staticmethod
+    @jit.look_inside_iff(lambda s, length, items: jit.loop_unrolling_heuristic(
+        items, length))
     def ll_join(s, length, items):
         s_chars = s.chars
         s_len = len(s_chars)
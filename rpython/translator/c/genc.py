@@ -1,4 +1,7 @@
 import contextlib
+import heapq
+import marshal
+import time
 import py
 import sys, os
 from rpython.rlib import exports
@@ -62,6 +65,7 @@ class CBuilder(object):
     _compiled = False
     modulename = None
     split = False
+    source_timings = ()
 
     def __init__(self, translator, entrypoint, config, gcpolicy=None,
             secondary_entrypoints=()):
@@ -192,9 +196,10 @@ class CBuilder(object):
                     defines['USE___THREAD'] = 1
             if self.config.translation.shared:
                 defines['PYPY_MAIN_FUNCTION'] = "pypy_main_startup"
-        self.eci, cfile, extra, headers_to_precompile = \
+        self.eci, cfile, extra, headers_to_precompile, self.source_timings = \
                 gen_source(db, modulename, targetdir,
-                           self.eci, defines=defines, split=self.split)
+                           self.eci, defines=defines, split=self.split,
+                           jobs=self.config.translation.jobs)
         self.c_source_filename = py.path.local(cfile)
         self.extrafiles = self.eventually_copy(extra)
         self.gen_makefile(targetdir, exe_name=exe_name,
@@ -219,6 +224,7 @@ class CStandaloneBuilder(CBuilder):
     executable_name = None
     shared_library_name = None
     _entrypoint_wrapper = None
+    _makefile = None
     make_entrypoint_wrapper = True    # for tests
 
 
@@ -340,8 +346,13 @@ class CStandaloneBuilder(CBuilder):
             extra_opts += ["lldebug"]
         elif self.config.translation.lldebug0:
             extra_opts += ["lldebug0"]
+        objcache = self.get_object_cache(extra_opts)
+        if objcache is not None:
+            objcache.restore()
         self.translator.platform.execute_makefile(self.targetdir,
                                                   extra_opts)
+        if objcache is not None:
+            objcache.store()
         if shared:
             self.shared_library_name = self.executable_name.new(
                 purebasename='lib' + self.executable_name.purebasename,
@@ -349,10 +360,33 @@ class CStandaloneBuilder(CBuilder):
         self._compiled = True
         return self.executable_name
 
+    def get_object_cache(self, extra_opts):
+        # the .gcmap files of asmgcc are not cached, and msvc's
+        # makefile does not rebuild from timestamps in the same way
+        if (not self.config.translation.object_cache or
+                self.config.translation.gcrootfinder == 'asmgcc' or
+                self.translator.platform.name == 'msvc' or
+                self._makefile is None):
+            return None
+        from rpython.config.translationoption import CACHE_DIR
+        from rpython.translator.c.objcache import ObjectCache, compiler_version
+        mk = self._makefile
+        flags = [(name, mk.lines[mk.defs[name]].value)
+                 for name in ('CC', 'CFLAGS', 'CFLAGSEXTRA', 'LDFLAGS',
+                              'INCLUDEDIRS', 'DEBUGFLAGS')
+                 if name in mk.defs]
+        flags.append(extra_opts)
+        flags.append(self.translator.platform.key())
+        return ObjectCache(os.path.join(CACHE_DIR, 'object_cache'),
+                           self.targetdir, self._makefile_cfiles,
+                           self.eci.include_dirs, flags,
+                           compiler_version(self.translator.platform))
+
     def gen_makefile(self, targetdir, exe_name=None, headers_to_precompile=[]):
         module_files = self.eventually_copy(self.eci.separate_module_files)
         self.eci.separate_module_files = []
         cfiles = [self.c_source_filename] + self.extrafiles + list(module_files)
+        self._makefile_cfiles = cfiles
         if exe_name is not None:
             exe_name = targetdir.join(exe_name)
         mk = self.translator.platform.gen_makefile(
@@ -554,6 +588,7 @@ class CStandaloneBuilder(CBuilder):
         else:
             mk.rule('debug_target', '$(DEFAULT_TARGET)', '#')
         mk.write()
+        self._makefile = mk
         #self.translator.platform,
         #                           ,
         #                           self.eci, profbased=self.getprofbased()
@@ -569,12 +604,14 @@ MARKER = '/*/*/' # provide an easy way to split after generating
 class SourceGenerator:
     one_source_file = True
 
-    def __init__(self, database):
+    def __init__(self, database, jobs=1):
         self.database = database
+        self.jobs = jobs
         self.extrafiles = []
         self.headers_to_precompile = []
         self.path = None
         self.namespace = NameManager()
+        self.timings = []
 
     def set_strategy(self, path, split=True):
         all_nodes = list(self.database.globalcontainers())
@@ -645,8 +682,7 @@ class SourceGenerator:
                 return "data_" + name
         return basecname
 
-    def splitnodesimpl(self, basecname, nodes, nextra, nbetween,
-                       split_criteria=SPLIT_CRITERIA):
+    def groupnodes(self, basecname, nodes):
         # Gather nodes by some criteria:
         nodes_by_base_cfile = {}
         for node in nodes:
@@ -655,28 +691,105 @@ class SourceGenerator:
                 nodes_by_base_cfile[c_filename].append(node)
             else:
                 nodes_by_base_cfile[c_filename] = [node]
+        return nodes_by_base_cfile
+
+    def splitnodesimpl(self, basecname, nodes, nextra, nbetween,
+                       split_criteria=SPLIT_CRITERIA):
+        nodes_by_base_cfile = self.groupnodes(basecname, nodes)
 
         # produce a sequence of nodes, grouped into files
         # which have no more than SPLIT_CRITERIA lines
         for basecname in sorted(nodes_by_base_cfile):
             iternodes = iter(nodes_by_base_cfile[basecname])
             done = [False]
-            def subiter():
-                used = nextra
-                for node in iternodes:
-                    impl = '\n'.join(list(node.implementation())).split('\n')
-                    if not impl:
-                        continue
-                    cost = len(impl) + nbetween
-                    yield node, impl
-                    del impl
-                    if used + cost > split_criteria:
-                        # split if criteria met, unless we would produce nothing.
-                        raise StopIteration
-                    used += cost
-                done[0] = True
             while not done[0]:
-                yield self.uniquecname(basecname), subiter()
+                yield self.uniquecname(basecname), _subiter(
+                    iternodes, done, nextra, nbetween, split_criteria)
+
+    def can_fork_workers(self):
+        return (self.jobs > 1 and hasattr(os, 'fork') and
+                not self.one_source_file and
+                not isinstance(self.path, NullPyPathLocal) and
+                not self.database.translator.config.translation.instrument)
+
+    def parallel_splitnodesimpl(self, basecname, nodes, nextra, nbetween,
+                                split_criteria=SPLIT_CRITERIA):
+        """Like splitnodesimpl(), but the implementation of the nodes is
+        computed by 'self.jobs' forked processes.  Each process writes
+        the bodies of the files for a share of the base C file names.
+        Yields (name, bodyfile) in the same order as splitnodesimpl().
+        The only difference with a serial run is the numbering of the
+        local variables, because the processes all continue from the
+        same state of the global NameManager.
+        """
+        nodes_by_base_cfile = self.groupnodes(basecname, nodes)
+
+        # give the biggest groups first to the least loaded worker
+        shares = [(0, i, []) for i in range(self.jobs)]
+        groups = sorted(nodes_by_base_cfile,
+                        key=lambda name: (-len(nodes_by_base_cfile[name]),
+                                          name))
+        for name in groups:
+            load, i, names = heapq.heappop(shares)
+            names.append(name)
+            load += len(nodes_by_base_cfile[name])
+            heapq.heappush(shares, (load, i, names))
+
+        tmpdir = self.path.ensure('parallel_%s' % basecname[:-2], dir=1)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pids = []
+        for load, i, names in shares:
+            pid = os.fork()
+            if pid == 0:
+                exitcode = 1
+                try:
+                    result = []
+                    count = 0
+                    for name in names:
+                        bodyfiles = []
+                        iternodes = iter(nodes_by_base_cfile[name])
+                        done = [False]
+                        while not done[0]:
+                            bodyfile = tmpdir.join('%d_%d.part' % (i, count))
+                            count += 1
+                            with bodyfile.open('w') as fc:
+                                for node, impl in _subiter(iternodes, done,
+                                                           nextra, nbetween,
+                                                           split_criteria):
+                                    print >> fc, '\n'.join(impl)
+                                    print >> fc, MARKER
+                            bodyfiles.append(str(bodyfile))
+                        result.append((name, bodyfiles))
+                    tmpdir.join('%d.result' % i).write(marshal.dumps(result),
+                                                       'wb')
+                    exitcode = 0
+                except:
+                    import traceback
+                    traceback.print_exc()
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(exitcode)
+            pids.append(pid)
+        failed = False
+        for pid in pids:
+            _, status = os.waitpid(pid, 0)
+            if status != 0:
+                failed = True
+        if failed:
+            raise Exception("generating the C sources failed in a "
+                            "worker process, see above")
+
+        bodyfiles_by_base_cfile = {}
+        for load, i, names in shares:
+            result = marshal.loads(tmpdir.join('%d.result' % i).read('rb'))
+            for name, bodyfiles in result:
+                bodyfiles_by_base_cfile[name] = bodyfiles
+        for name in sorted(bodyfiles_by_base_cfile):
+            for bodyfile in bodyfiles_by_base_cfile[name]:
+                yield self.uniquecname(name), bodyfile
+        tmpdir.remove()
 
     @contextlib.contextmanager
     def write_on_included_file(self, f, name):
@@ -696,6 +809,7 @@ class SourceGenerator:
             fi.close()
 
     def gen_readable_parts_of_source(self, f):
+        self._last_timing = time.time()
         split_criteria_big = SPLIT_CRITERIA
         if py.std.sys.platform != "win32":
             if self.database.gcpolicy.need_no_typeptr():
@@ -712,6 +826,7 @@ class SourceGenerator:
             gen_forwarddecl(fi, self.database)
         with self.write_on_included_file(f, 'preimpl.h') as fi:
             gen_preimpl(fi, self.database)
+        self.record_timing('declarations')
 
         #
         # Implementation of functions and global structures and arrays
@@ -747,11 +862,19 @@ class SourceGenerator:
                     print >> fc, MARKER
                 print >> fc, '/***********************************************************/'
 
+        self.record_timing('nonfuncnodes')
+
         nextralines = 12
-        for name, nodeiter in self.splitnodesimpl('implement.c',
-                                                   self.funcnodes,
-                                                   nextralines, 1,
-                                                   split_criteria_big):
+        if self.can_fork_workers():
+            splitnodesimpl = self.parallel_splitnodesimpl
+            timing_name = 'funcnodes (%d jobs)' % self.jobs
+        else:
+            splitnodesimpl = self.splitnodesimpl
+            timing_name = 'funcnodes'
+        for name, nodeiter in splitnodesimpl('implement.c',
+                                             self.funcnodes,
+                                             nextralines, 1,
+                                             split_criteria_big):
             with self.write_on_maybe_separate_source(f, name) as fc:
                 if fc is not f:
                     print >> fc, '/***********************************************************/'
@@ -765,11 +888,38 @@ class SourceGenerator:
                     print >> fc, '#include "src/g_include.h"'
                     print >> fc
                 print >> fc, MARKER
-                for node, impl in nodeiter:
-                    print >> fc, '\n'.join(impl)
-                    print >> fc, MARKER
+                if isinstance(nodeiter, str):
+                    # the body was written by parallel_splitnodesimpl()
+                    with open(nodeiter, 'r') as fbody:
+                        fc.write(fbody.read())
+                else:
+                    for node, impl in nodeiter:
+                        print >> fc, '\n'.join(impl)
+                        print >> fc, MARKER
                 print >> fc, '/***********************************************************/'
         print >> f
+        self.record_timing(timing_name)
+
+    def record_timing(self, name):
+        now = time.time()
+        self.timings.append((name, now - self._last_timing))
+        self._last_timing = now
+
+
+def _subiter(iternodes, done, nextra, nbetween, split_criteria):
+    used = nextra
+    for node in iternodes:
+        impl = '\n'.join(list(node.implementation())).split('\n')
+        if not impl:
+            continue
+        cost = len(impl) + nbetween
+        yield node, impl
+        del impl
+        if used + cost > split_criteria:
+            # split if criteria met, unless we would produce nothing.
+            return
+        used += cost
+    done[0] = True
 
 
 def gen_structdef(f, database):
@@ -889,7 +1039,7 @@ def add_extra_files(eci):
 
 
 def gen_source(database, modulename, targetdir,
-               eci, defines={}, split=False):
+               eci, defines={}, split=False, jobs=1):
     if isinstance(targetdir, str):
         targetdir = py.path.local(targetdir)
 
@@ -918,7 +1068,7 @@ def gen_source(database, modulename, targetdir,
     # 1) All declarations
     # 2) Implementation of functions and global structures and arrays
     #
-    sg = SourceGenerator(database)
+    sg = SourceGenerator(database, jobs)
     sg.set_strategy(targetdir, split)
     sg.gen_readable_parts_of_source(f)
     headers_to_precompile = sg.headers_to_precompile[:]
@@ -935,4 +1085,5 @@ def gen_source(database, modulename, targetdir,
 
     eci = add_extra_files(eci)
     eci = eci.convert_sources_to_files()
-    return eci, filename, sg.getextrafiles(), headers_to_precompile
+    return (eci, filename, sg.getextrafiles(), headers_to_precompile,
+            sg.timings)
@@ -0,0 +1,142 @@
+"""
+A cache of the object files compiled from the generated C sources,
+shared between translations (--object-cache).
+
+Every translation writes its C sources in a fresh directory, so 'make'
+normally recompiles all of them.  With the cache, the object file of a
+C file that was already compiled by a previous translation is copied
+into the new directory before 'make' runs; as it is newer than the C
+file, 'make' does not rebuild it.
+
+The key of an object file is computed from the content of the C file,
+the content of the generated headers that it includes (directly or
+through other headers), the content of every .h, .c or .def file of the
+include directories (some sources include other .c files, like
+src/thread.c), the compiler flags and the version of the compiler.
+
+The generated headers are not the same at every translation even if the
+program did not change (forwarddecl.h lists the declarations in an order
+that depends on the addresses of the objects), so the C files that do
+not include them, like the copies of src/*.c, must not depend on them.
+"""
+
+import os
+import re
+import py
+from hashlib import md5
+from rpython.translator.c.support import log
+from rpython.tool.gcc_cache import try_atomic_write
+
+# the extensions of the files found in '#include' lines
+INCLUDED_FILES = ('*.h', '*.c', '*.def')
+
+r_include = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.MULTILINE)
+
+
+def compiler_version(platform):
+    """Return the output of 'cc --version', or '' if it fails."""
+    cc = platform.cc.split()
+    try:
+        res = platform.execute(cc[0], cc[1:] + ['--version'])
+    except OSError:
+        return ''
+    if res.returncode != 0:
+        return ''
+    return res.out
+
+
+class ObjectCache(object):
+
+    def __init__(self, cachedir, targetdir, cfiles, include_dirs, flags,
+                 cc_version):
+        self.cachedir = py.path.local(cachedir).ensure(dir=1)
+        self.targetdir = targetdir
+        self.include_dirs = []
+        for include_dir in include_dirs:
+            include_dir = py.path.local(include_dir)
+            if include_dir.check(dir=1) and include_dir != targetdir:
+                self.include_dirs.append(include_dir)
+        self._includes = {}
+        common = md5(repr(flags))
+        common.update(cc_version)
+        for path, header in self._find_included_files():
+            common.update(path)
+            common.update(header.read('rb'))
+        self.keys = []
+        for cfile in cfiles:
+            cfile = py.path.local(cfile)
+            if cfile.dirpath() != targetdir or cfile.ext != '.c':
+                continue
+            key = common.copy()
+            key.update(cfile.basename)
+            key.update(cfile.read('rb'))
+            # the generated headers are identified by their name only,
+            # as the target directory changes at every translation
+            for header in self._generated_headers(cfile):
+                key.update(header.basename)
+                key.update(header.read('rb'))
+            self.keys.append((cfile.new(ext='.o'), key.hexdigest() + '.o'))
+
+    def _find_included_files(self):
+        for include_dir in self.include_dirs:
+            found = []
+            for pattern in INCLUDED_FILES:
+                found.extend(include_dir.visit(pattern))
+            for included in sorted(found):
+                if included.check(file=1):
+                    yield str(included), included
+
+    def _resolve_includes(self, path):
+        """Return the files of the target and include directories named
+        by the '#include' lines of 'path' (all of them, whatever the
+        #if around them)."""
+        try:
+            return self._includes[path]
+        except KeyError:
+            pass
+        result = []
+        directories = [path.dirpath(), self.targetdir] + self.include_dirs
+        for name in r_include.findall(path.read('rb')):
+            for directory in directories:
+                included = directory.join(name)
+                if included.check(file=1):
+                    result.append(included)
+                    break
+        self._includes[path] = result
+        return result
+
+    def _generated_headers(self, cfile):
+        """Return the files of the target directory that 'cfile' includes,
+        directly or not, sorted by name."""
+        seen = {cfile: None}
+        pending = [cfile]
+        while pending:
+            for included in self._resolve_includes(pending.pop()):
+                if included not in seen:
+                    seen[included] = None
+                    pending.append(included)
+        del seen[cfile]
+        return sorted([path for path in seen
+                       if path.dirpath() == self.targetdir],
+                      key=lambda path: path.basename)
+
+    def restore(self):
+        """Copy the cached object files into the target directory.
+        Returns the number of files found in the cache."""
+        found = 0
+        for ofile, name in self.keys:
+            cached = self.cachedir.join(name)
+            if cached.check(file=1):
+                cached.copy(ofile)
+                os.utime(str(ofile), None)   # newer than the .c file
+                found += 1
+        log.objcache('reusing %d of %d object files' % (found,
+                                                         len(self.keys)))
+        return found
+
+    def store(self):
+        """Store the object files compiled by 'make' into the cache."""
+        for ofile, name in self.keys:
+            cached = self.cachedir.join(name)
+            if ofile.check(file=1) and not cached.check():
+                try_atomic_write(cached, ofile.read('rb'))
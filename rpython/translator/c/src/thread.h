@@ -31,6 +31,10 @@ typedef enum RPyLockStatus {
 RPY_EXTERN void RPyGilAllocate(void);
 RPY_EXTERN long RPyGilYieldThread(void);
 RPY_EXTERN void RPyGilAcquireSlowPath(long);
+RPY_EXTERN void RPyGilSetSwitchInterval(long);
+RPY_EXTERN long RPyGilGetSwitchInterval(void);
+RPY_EXTERN void RPyGilSetTicker(long *);
+RPY_EXTERN long long RPyGilWaitStats(long);
 #define RPyGilAcquire _RPyGilAcquire
 #define RPyGilRelease _RPyGilRelease
 #define RPyFetchFastGil _RPyFetchFastGil
@@ -34,6 +34,14 @@
      explicitly yield the GIL to thread 2: it does so by releasing
      'mutex_gil' (which is otherwise not released) but keeping the
      value of 'rpy_fastgil' to 1.
+
+   - The stealer thread measures how long it has been waiting.  If it
+     exceeds the switch interval (5 ms by default), it keeps setting
+     the ticker registered with RPyGilSetTicker() to -1.  The thread
+     with the GIL sees this at the next bytecode or JIT loop header,
+     and calls RPyGilYieldThread().  This is what makes a CPU-bound
+     thread hand off the GIL in time even if it runs JIT-compiled
+     loops without doing any external call.
 */
 
 
@@ -48,6 +56,41 @@ static volatile int rpy_early_poll_n = 0;
 static mutex1_t mutex_gil_stealer;
 static mutex2_t mutex_gil;
 
+/* switch interval and statistics, see RPyGilSetSwitchInterval() and
+   RPyGilWaitStats().  All times are in microseconds. */
+static long rpy_gil_switch_interval = 5000;
+static long *volatile rpy_gil_ticker = NULL;
+static long long rpy_gil_total_wait_time = 0;
+static long long rpy_gil_total_waits = 0;
+static long long rpy_gil_switch_requests = 0;
+
+#ifdef _MSC_VER
+#  define RPY_GIL_TLS  __declspec(thread)
+#else
+#  define RPY_GIL_TLS  __thread
+#endif
+static RPY_GIL_TLS long long rpy_gil_thread_wait_time = 0;
+static RPY_GIL_TLS long long rpy_gil_thread_waits = 0;
+
+static long long rpy_gil_now(void)
+{
+    /* a monotonic clock, in microseconds */
+#ifdef _WIN32
+    LARGE_INTEGER freq, counter;
+    QueryPerformanceFrequency(&freq);
+    QueryPerformanceCounter(&counter);
+    return (long long)(counter.QuadPart * 1000000.0 / freq.QuadPart);
+#elif defined(CLOCK_MONOTONIC)
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000LL + ts.tv_nsec / 1000;
+#else
+    struct timeval tv;
+    RPY_GETTIMEOFDAY(&tv);
+    return tv.tv_sec * 1000000LL + tv.tv_usec;
+#endif
+}
+
 
 static void rpy_init_mutexes(void)
 {
@@ -106,6 +149,8 @@ void RPyGilAcquireSlowPath(long old_fastgil)
         /* Otherwise, another thread is busy with the GIL. */
         int n;
         long old_waiting_threads;
+        long long start_time, wait_time;
+        int switch_requested = 0;
 
         if (rpy_waiting_threads < 0) {
             /* <arigo> I tried to have RPyGilAllocate() called from
@@ -126,6 +171,7 @@ void RPyGilAcquireSlowPath(long old_fastgil)
            for the GIL.  The number of such threads is found in
            rpy_waiting_threads. */
         old_waiting_threads = atomic_increment(&rpy_waiting_threads);
+        start_time = rpy_gil_now();
 
         /* Early polling: before entering the waiting queue, we check
            a certain number of times if the GIL becomes free.  The
@@ -204,11 +250,30 @@ void RPyGilAcquireSlowPath(long old_fastgil)
                 old_fastgil = 0;
                 break;
             }
+            /* We have been waiting for longer than the switch interval:
+               ask the thread with the GIL to yield it.  This is done
+               again at every iteration, because that thread may
+               overwrite the ticker concurrently while decrementing it.
+            */
+            if (rpy_gil_ticker != NULL &&
+                    rpy_gil_now() - start_time >= rpy_gil_switch_interval) {
+                *rpy_gil_ticker = -1;
+                switch_requested = 1;
+            }
             /* Loop back. */
         }
         atomic_decrement(&rpy_waiting_threads);
         mutex2_loop_stop(&mutex_gil);
         mutex1_unlock(&mutex_gil_stealer);
+
+        /* We hold the GIL now, so we can update the global statistics
+           without atomic operations. */
+        wait_time = rpy_gil_now() - start_time;
+        rpy_gil_thread_wait_time += wait_time;
+        rpy_gil_thread_waits++;
+        rpy_gil_total_wait_time += wait_time;
+        rpy_gil_total_waits++;
+        rpy_gil_switch_requests += switch_requested;
     }
     check_and_save_old_fastgil(old_fastgil);
 }
@@ -236,6 +301,41 @@ long RPyGilYieldThread(void)
     return 1;
 }
 
+void RPyGilSetSwitchInterval(long microseconds)
+{
+    if (microseconds < 1)
+        microseconds = 1;
+    rpy_gil_switch_interval = microseconds;
+}
+
+long RPyGilGetSwitchInterval(void)
+{
+    return rpy_gil_switch_interval;
+}
+
+void RPyGilSetTicker(long *ticker)
+{
+    /* 'ticker' is the counter that the interpreter decrements at every
+       bytecode and JIT loop header; setting it to -1 forces it to run
+       its periodic actions, which include RPyGilYieldThread(). */
+    rpy_gil_ticker = ticker;
+}
+
+long long RPyGilWaitStats(long which)
+{
+    /* 0, 1: wait time and number of waits of the current thread;
+       2, 3: the same for all threads;
+       4: number of waits that asked the GIL holder to switch */
+    switch (which) {
+    case 0: return rpy_gil_thread_wait_time;
+    case 1: return rpy_gil_thread_waits;
+    case 2: return rpy_gil_total_wait_time;
+    case 3: return rpy_gil_total_waits;
+    case 4: return rpy_gil_switch_requests;
+    default: return -1;
+    }
+}
+
 /********** for tests only **********/
 
 /* These functions are usually defined as a macros RPyXyz() in thread.h
@@ -131,6 +131,156 @@ class TestStandalone(StandaloneTests):
                         'rpython_translator_c_test.c'):
             assert cbuilder.targetdir.join(expfile) in gen_c_files
 
+    def test_parallel_source_generation(self, monkeypatch):
+        if not hasattr(os, 'fork'):
+            py.test.skip("needs fork()")
+        from rpython.translator.c import genc
+        # make many small files, to check that they are split the same way
+        monkeypatch.setattr(genc, 'SPLIT_CRITERIA', 100)
+        def entry_point(argv):
+            os.write(1, "hello world\n")
+            for s in argv[1:]:
+                os.write(1, "   '" + str(s) + "'\n")
+            return 0
+
+        t = TranslationContext()
+        t.buildannotator().build_types(entry_point, [s_list_of_strings])
+        t.buildrtyper().specialize()
+        t.config.translation.jobs = 3
+        cbuilder = CStandaloneBuilder(t, entry_point, t.config)
+        cbuilder.generate_source()
+        names = [name for name, duration in cbuilder.source_timings]
+        assert 'funcnodes (3 jobs)' in names
+        assert not cbuilder.targetdir.join('parallel_implement').check()
+        cbuilder.compile()
+        data = cbuilder.cmdexec('hi there')
+        assert data == "hello world\n   'hi'\n   'there'\n"
+        #
+        # the functions come in the same order as in a serial run; only
+        # the numbering of the local variables can differ
+        sg = genc.SourceGenerator(cbuilder.db, jobs=3)
+        sg.set_strategy(udir.ensure('test_parallel_source', dir=1))
+        parallel = []
+        for name, bodyfile in sg.parallel_splitnodesimpl(
+                'implement.c', sg.funcnodes, 12, 1, 100):
+            parallel.append((name, open(bodyfile).read()))
+        sg = genc.SourceGenerator(cbuilder.db)
+        sg.set_strategy(udir.ensure('test_serial_source', dir=1))
+        serial = []
+        for name, nodeiter in sg.splitnodesimpl(
+                'implement.c', sg.funcnodes, 12, 1, 100):
+            serial.append((name, ''.join(['\n'.join(impl) + '\n' +
+                                          genc.MARKER + '\n'
+                                          for node, impl in nodeiter])))
+        assert len(serial) > 5
+        def functions(files):
+            text = ''.join([text for name, text in files])
+            return re.findall(r'^\S.* (pypy_g_\w+)\(.*\) {$', text, re.M)
+        assert len(functions(serial)) > 20
+        assert functions(parallel) == functions(serial)
+
+    def test_object_cache(self, monkeypatch):
+        from rpython.config import translationoption
+        from rpython.translator.c.objcache import ObjectCache
+        cachedir = udir.join('test_object_cache')
+        monkeypatch.setattr(translationoption, 'CACHE_DIR', str(cachedir))
+        restored = []
+        def restore(self):
+            restored.append(ObjectCache_restore(self))
+        ObjectCache_restore = ObjectCache.restore
+        monkeypatch.setattr(ObjectCache, 'restore', restore)
+        def entry_point(argv):
+            os.write(1, "hello world\n")
+            return 0
+
+        t = TranslationContext()
+        t.buildannotator().build_types(entry_point, [s_list_of_strings])
+        t.buildrtyper().specialize()
+        t.config.translation.object_cache = True
+        cbuilder = CStandaloneBuilder(t, entry_point, t.config)
+        cbuilder.generate_source()
+        cbuilder.compile()
+        assert cbuilder.cmdexec('') == "hello world\n"
+        assert restored == [0]
+        ofiles = cbuilder.targetdir.listdir('*.o')
+        assert len(cachedir.join('object_cache').listdir('*.o')) == len(ofiles)
+        # build the same sources again from scratch: all the object
+        # files come from the cache
+        for ofile in ofiles:
+            ofile.remove()
+        cbuilder.executable_name.remove()
+        cbuilder._compiled = False
+        cbuilder.compile()
+        assert cbuilder.cmdexec('') == "hello world\n"
+        assert restored == [0, len(ofiles)]
+        # a change in a C file only invalidates that file
+        c_file = cbuilder.targetdir.join('entrypoint.c')
+        c_file.write(c_file.read() + '\n/* changed */\n')
+        for ofile in ofiles:
+            ofile.remove()
+        cbuilder.executable_name.remove()
+        cbuilder._compiled = False
+        cbuilder.compile()
+        assert restored == [0, len(ofiles), len(ofiles) - 1]
+        # a change in a generated header only invalidates the C files
+        # that include it: not the copies of src/*.c like debug_print.c
+        header = cbuilder.targetdir.join('forwarddecl.h')
+        header.write(header.read() + '\n/* changed */\n')
+        including = [cfile for cfile in cbuilder.targetdir.listdir('*.c')
+                     if '#include "forwarddecl.h"' in cfile.read()]
+        assert 0 < len(including) < len(ofiles)
+        assert cbuilder.targetdir.join('debug_print.c') not in including
+        for ofile in ofiles:
+            ofile.remove()
+        cbuilder.executable_name.remove()
+        cbuilder._compiled = False
+        cbuilder.compile()
+        # (some more include it through a header of src/)
+        assert 0 < restored[-1] <= len(ofiles) - len(including)
+        assert cbuilder.cmdexec('') == "hello world\n"
+
+    def test_object_cache_included_c_file(self, monkeypatch):
+        from rpython.config import translationoption
+        from rpython.translator.c.objcache import ObjectCache
+        from rpython.rtyper.lltypesystem import rffi
+        cachedir = udir.join('test_object_cache_included_c_file')
+        monkeypatch.setattr(translationoption, 'CACHE_DIR', str(cachedir))
+        restored = []
+        def restore(self):
+            restored.append(ObjectCache_restore(self))
+        ObjectCache_restore = ObjectCache.restore
+        monkeypatch.setattr(ObjectCache, 'restore', restore)
+        incdir = cachedir.ensure('include', dir=1)
+        impl = incdir.join('objcache_impl.c')
+        impl.write('static inline int objcache_value(void) { return 42; }\n')
+        eci = ExternalCompilationInfo(includes=['objcache_impl.c'],
+                                      include_dirs=[str(incdir)])
+        objcache_value = rffi.llexternal('objcache_value', [], rffi.INT,
+                                         compilation_info=eci,
+                                         _nowrapper=True)
+        def entry_point(argv):
+            os.write(1, "%d\n" % rffi.cast(lltype.Signed, objcache_value()))
+            return 0
+
+        t = TranslationContext()
+        t.buildannotator().build_types(entry_point, [s_list_of_strings])
+        t.buildrtyper().specialize()
+        t.config.translation.object_cache = True
+        cbuilder = CStandaloneBuilder(t, entry_point, t.config)
+        cbuilder.generate_source()
+        cbuilder.compile()
+        assert cbuilder.cmdexec('') == "42\n"
+        assert restored == [0]
+        # editing the included .c file must recompile the objects
+        impl.write('static inline int objcache_value(void) { return 43; }\n')
+        for ofile in cbuilder.targetdir.listdir('*.o'):
+            ofile.remove()
+        cbuilder.executable_name.remove()
+        cbuilder._compiled = False
+        cbuilder.compile()
+        assert restored == [0, 0]
+        assert cbuilder.cmdexec('') == "43\n"
+
     def test_print(self):
         def entry_point(argv):
             print "hello simpler world"
@@ -450,6 +450,8 @@ class TranslationDriver(SimpleTaskEngine):
             exe_name = None
         c_source_filename = cbuilder.generate_source(database, defines,
                                                      exe_name=exe_name)
+        for name, duration in cbuilder.source_timings:
+            self.timer.add_subevent(name, duration)
         self.log.info("written: %s" % (c_source_filename,))
         if self.config.translation.dump_static_data_info:
             from rpython.translator.tool.staticsizereport import dump_static_data_info
@@ -11,6 +11,7 @@ log = AnsiLogger("Timer")
 class Timer(object):
     def __init__(self, timer=time.time):
         self.events = []
+        self.subevents = {}
         self.next_even = None
         self.timer = timer
         self.t0 = None
@@ -29,6 +30,14 @@ class Timer(object):
         self.next_event = None
         self.tk = now
 
+    def add_subevent(self, subevent, duration):
+        """ Record the duration of a part of the current event; it is
+        printed below the event by pprint()
+        """
+        assert self.next_event is not None
+        self.subevents.setdefault(self.next_event, []).append(
+            (subevent, duration))
+
     def ttime(self):
         try:
             return self.tk - self.t0
@@ -47,6 +56,13 @@ class Timer(object):
             second = "%.1f s" % (time,)
             additional_spaces = " " * (len(total) - len(first) - len(second))
             log.bold("%s%s%s" % (first, additional_spaces, second))
+            for subevent, subtime in self.subevents.get(event, []):
+                subevent = "  " + subevent
+                spacing = " "*max(30 - len(subevent), 1)
+                first = "%s%s --- " % (subevent, spacing)
+                second = "%.1f s" % (subtime,)
+                additional_spaces = " " * (len(total) - len(first) - len(second))
+                log("%s%s%s" % (first, additional_spaces, second))
         log.bold("=" * len(total))
         log.bold(total)
 
@@ -13,9 +13,12 @@ from rpython.config.config import (to_optparse, OptionDescription, BoolOption,
 from rpython.config.translationoption import (get_combined_translation_config,
     set_opt_level, OPT_LEVELS, DEFAULT_OPT_LEVEL, set_platform, CACHE_DIR)
 
-# clean up early rpython/_cache
+# clean up early rpython/_cache, but keep the object files that
+# --object-cache reuses from one translation to the next
 try:
-    py.path.local(CACHE_DIR).remove()
+    for _path in py.path.local(CACHE_DIR).listdir():
+        if _path.basename != 'object_cache':
+            _path.remove()
 except Exception:
     pass
 
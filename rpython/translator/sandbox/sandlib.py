@@ -128,6 +128,7 @@ class SandboxedProc(object):
         self.popenlock = None
         self.currenttimeout = None
         self.currentlyidlefrom = None
+        self.syscall_stats = {}    # {fnname: [count, total_seconds]}
 
         if self.debug:
             self.log = create_log()
@@ -240,8 +241,12 @@ class SandboxedProc(object):
             if self.log and not self.is_spam(fnname, *args):
                 self.log.call('%s(%s)' % (fnname,
                                      ', '.join([shortrepr(x) for x in args])))
+            t0 = time.time()
             try:
-                answer, resulttype = self.handle_message(fnname, *args)
+                try:
+                    answer, resulttype = self.handle_message(fnname, *args)
+                finally:
+                    self.record_syscall(fnname, time.time() - t0)
             except Exception as e:
                 tb = sys.exc_info()[2]
                 write_exception(child_stdin, e, tb)
@@ -266,6 +271,26 @@ class SandboxedProc(object):
         returncode = self.wait()
         return returncode
 
+    def record_syscall(self, fnname, seconds):
+        try:
+            entry = self.syscall_stats[fnname]
+        except KeyError:
+            entry = self.syscall_stats[fnname] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def format_syscall_stats(self):
+        """Return a report of the external calls done so far by the
+        subprocess: the number of calls and the total time spent in the
+        controller handling them, for each function name."""
+        lines = []
+        items = self.syscall_stats.items()
+        items.sort(key=lambda item: -item[1][1])
+        for fnname, (count, seconds) in items:
+            lines.append('%-30s %8d calls %10.3f ms' % (fnname, count,
+                                                         seconds * 1000.0))
+        return '\n'.join(lines)
+
     def is_spam(self, fnname, *args):
         # To hide the spamming amounts of reads and writes to stdin and stdout
         # in interactive sessions
@@ -283,6 +308,43 @@ class SandboxedProc(object):
         return handler(*args), resulttype
 
 
+class SandboxedProcPool(object):
+    """A pool of sandboxed subprocesses that are started in advance.
+    'factory' is called without arguments to make a new SandboxedProc.
+    A freshly started subprocess stops on its first external call and
+    waits for the controller, so it can be configured (e.g. its
+    virtual_root) after it is taken from the pool with acquire().
+    This hides the time it takes to start the executable.
+    """
+
+    def __init__(self, factory, size=4):
+        self.factory = factory
+        self.size = size
+        self.ready = []
+        self.fill()
+
+    def fill(self):
+        while len(self.ready) < self.size:
+            self.ready.append(self.factory())
+
+    def acquire(self):
+        """Return a started SandboxedProc, and start a new one to
+        replace it in the pool."""
+        if self.ready:
+            proc = self.ready.pop(0)
+        else:
+            proc = self.factory()
+        self.fill()
+        return proc
+
+    def close(self):
+        """Kill the subprocesses that were not used."""
+        while self.ready:
+            proc = self.ready.pop()
+            proc.kill()
+            proc.wait()
+
+
 class SimpleIOSandboxedProc(SandboxedProc):
     """Control a sandboxed subprocess which is only allowed to read from
     its stdin and write to its stdout and stderr.
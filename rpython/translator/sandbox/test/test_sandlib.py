@@ -6,6 +6,7 @@ from rpython.translator.sandbox.sandlib import SandboxedProc
 from rpython.translator.sandbox.sandlib import SimpleIOSandboxedProc
 from rpython.translator.sandbox.sandlib import VirtualizedSandboxedProc
 from rpython.translator.sandbox.sandlib import VirtualizedSocketProc
+from rpython.translator.sandbox.sandlib import SandboxedProcPool
 from rpython.translator.sandbox.test.test_sandbox import compile
 from rpython.translator.sandbox.vfs import Dir, File, RealDir, RealFile
 
@@ -62,6 +63,40 @@ def test_lib():
         ])
     proc.handle_forever()
     assert proc.seen == len(proc.expected)
+    stats = proc.syscall_stats
+    assert sorted(stats) == ['ll_os.ll_os_close', 'll_os.ll_os_open',
+                             'll_os.ll_os_read', 'll_os.ll_os_write']
+    assert stats['ll_os.ll_os_write'][0] == 4
+    assert stats['ll_os.ll_os_open'][0] == 1
+    report = proc.format_syscall_stats()
+    assert len(report.splitlines()) == 4
+    assert 'll_os.ll_os_write' in report
+
+def test_pool():
+    def entry_point(argv):
+        fd = os.open("/tmp/foobar", os.O_RDONLY, 0777)
+        os.close(fd)
+        return 0
+    exe = compile(entry_point)
+    expected = [
+        ("open", ("/tmp/foobar", os.O_RDONLY, 0777), 77),
+        ("close", (77,), None),
+        ]
+    started = []
+    def factory():
+        proc = MockSandboxedProc([exe], expected=expected)
+        started.append(proc)
+        return proc
+    pool = SandboxedProcPool(factory, size=2)
+    assert len(started) == 2
+    for i in range(3):
+        proc = pool.acquire()
+        assert proc is started[i]
+        assert len(started) == i + 3
+        proc.handle_forever()
+        assert proc.seen == len(expected)
+    pool.close()
+    assert pool.ready == []
 
 def test_foobar():
     py.test.skip("to be updated")
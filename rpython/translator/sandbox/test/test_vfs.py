@@ -97,6 +97,47 @@ def test_realdir_realfile():
                 py.test.raises(OSError, v_test_vfs.join, '.hidden')
                 py.test.raises(OSError, v_test_vfs.join, '.subdir2')
 
+def test_realdir_cache_files():
+    v_udir = RealDir(str(udir), cache_files=True)
+    v_test_vfs = v_udir.join('test_vfs')
+    f = v_test_vfs.join('file1')
+    assert isinstance(f, CachedRealFile)
+    assert f.getsize() == len('somedata1')
+    assert f.open().read() == 'somedata1'
+    # served from the cache, shared with other nodes for the same file
+    path = str(udir.join('test_vfs', 'file1'))
+    assert v_udir.cache_files.entries[path][2] == 'somedata1'
+    assert v_udir.join('test_vfs').join('file1').open().read() == 'somedata1'
+    assert isinstance(v_test_vfs.join('subdir1'), RealDir)
+    assert v_test_vfs.join('subdir1').cache_files is v_udir.cache_files
+    # another RealDir has its own cache
+    assert RealDir(str(udir), cache_files=True).cache_files.entries == {}
+
+def test_realdir_cache_files_changed():
+    d = udir.ensure('test_realdir_cache_files_changed', dir=1)
+    d.join('file').write('old')
+    os.utime(str(d.join('file')), (1000, 1000))
+    v_dir = RealDir(str(d), cache_files=True)
+    assert v_dir.join('file').open().read() == 'old'
+    d.join('file').write('new')
+    os.utime(str(d.join('file')), (2000, 2000))
+    assert v_dir.join('file').open().read() == 'new'
+    assert v_dir.cache_files.entries.values() == [(2000, 3, 'new')]
+
+def test_file_cache_lru():
+    d = udir.ensure('test_file_cache_lru', dir=1)
+    for name in 'abc':
+        d.join(name).write(name * 3)
+    cache = FileCache(maxfiles=2)
+    v_dir = RealDir(str(d), cache_files=cache)
+    v_dir.join('a').open()
+    v_dir.join('b').open()
+    v_dir.join('a').open()
+    v_dir.join('c').open()     # drops 'b', the least recently used
+    assert [os.path.basename(path) for path in cache.entries] == ['a', 'c']
+    assert v_dir.join('b').open().read() == 'bbb'
+    assert len(cache.entries) == 2
+
 def test_realdir_exclude():
     xdir = udir.ensure('test_realdir_exclude', dir=1)
     xdir.ensure('test_realdir_exclude.yes')
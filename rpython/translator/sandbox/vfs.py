@@ -1,5 +1,6 @@
 import os
 import stat, errno
+from collections import OrderedDict
 
 UID = 1000
 GID = 1000
@@ -76,12 +77,20 @@ class RealDir(Dir):
     # not allowed to access them at all.  Finally, exclude is a list of
     # file endings that we filter out (note that we also filter out files
     # with the same ending but a different case, to be safe).
+    # If cache_files=True, the content of the files is kept in a FileCache
+    # owned by this RealDir and shared with its subdirectories (see
+    # CachedRealFile).  A FileCache instance can also be given, to share
+    # it between several RealDirs, e.g. those of all the sandboxed
+    # processes of a controller.
     def __init__(self, path, show_dotfiles=False, follow_links=False,
-                 exclude=[]):
+                 exclude=[], cache_files=False):
         self.path = path
         self.show_dotfiles = show_dotfiles
         self.follow_links  = follow_links
         self.exclude       = [excl.lower() for excl in exclude]
+        if cache_files is True:
+            cache_files = FileCache()
+        self.cache_files   = cache_files or None
     def __repr__(self):
         return '<RealDir %s>' % (self.path,)
     def keys(self):
@@ -105,8 +114,11 @@ class RealDir(Dir):
         if stat.S_ISDIR(st.st_mode):
             return RealDir(path, show_dotfiles = self.show_dotfiles,
                                  follow_links  = self.follow_links,
-                                 exclude       = self.exclude)
+                                 exclude       = self.exclude,
+                                 cache_files   = self.cache_files)
         elif stat.S_ISREG(st.st_mode):
+            if self.cache_files is not None:
+                return CachedRealFile(path, st, self.cache_files)
             return RealFile(path)
         else:
             # don't allow access to symlinks and other special files
@@ -135,3 +147,51 @@ class RealFile(File):
             return open(self.path, "rb")
         except IOError as e:
             raise OSError(e.errno, "open failed")
+
+class FileCache(object):
+    """The content of the most recently read files, with the mtime and size
+    they had.  At most 'maxfiles' files are kept, dropping the least
+    recently used one first."""
+    def __init__(self, maxfiles=256):
+        self.maxfiles = maxfiles
+        self.entries = OrderedDict()    # {path: (st_mtime, st_size, data)}
+    def get(self, path, st):
+        try:
+            mtime, size, data = self.entries.pop(path)
+        except KeyError:
+            return None
+        if (mtime, size) != (st.st_mtime, st.st_size):
+            return None      # the file changed: drop the old content
+        self.entries[path] = (mtime, size, data)
+        return data
+    def set(self, path, st, data):
+        self.entries.pop(path, None)
+        while len(self.entries) >= self.maxfiles:
+            self.entries.popitem(last=False)
+        self.entries[path] = (st.st_mtime, st.st_size, data)
+
+class CachedRealFile(RealFile):
+    """A RealFile whose content is read only once, and then served from
+    a FileCache.  The content is read again if the file's mtime or size
+    changes.  Only meant for read-only trees like the stdlib."""
+    def __init__(self, path, st, cache, mode=0):
+        RealFile.__init__(self, path, mode)
+        self.st = st
+        self.cache = cache
+    def __repr__(self):
+        return '<CachedRealFile %s>' % (self.path,)
+    def getsize(self):
+        return self.st.st_size
+    def getdata(self):
+        data = self.cache.get(self.path, self.st)
+        if data is None:
+            f = RealFile.open(self)
+            try:
+                data = f.read()
+            finally:
+                f.close()
+            self.cache.set(self.path, self.st, data)
+        return data
+    def open(self):
+        import cStringIO
+        return cStringIO.StringIO(self.getdata())